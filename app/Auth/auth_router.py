@@ -3,34 +3,90 @@
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from app.db.session import get_db
-from app.Auth.auth_service import create_access_token, verify_password
+from app.Auth.auth_schema import LogoutRequest, RefreshRequest, TokenResponse
+from app.Auth.auth_service import (
+    issue_tokens,
+    logout,
+    oauth2_scheme,
+    refresh_tokens,
+    rehash_if_needed,
+    verify_password_async,
+)
 from app.User.user_repository import get_user_by_username
 
 router = APIRouter()
 
 
-@router.post("/login")
-def login(
+@router.post("/login", response_model=TokenResponse)
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)
 ):
     """
-    Authenticate a user and generate a JWT access token.
+    Authenticate a user and generate a JWT access token and refresh token.
+
+    The password check runs in the bcrypt process pool; while it is pending the
+    request holds neither a threadpool thread nor the event loop. The database
+    work runs in the threadpool like any sync route. Hashes made with a lower
+    cost than the current one are replaced transparently.
 
     Args:
         form_data (OAuth2PasswordRequestForm): The form data containing username and password.
         db (Session): SQLAlchemy database session dependency.
 
     Returns:
-        dict: A dictionary containing the access token and its type.
+        TokenResponse: The access token, the refresh token and the token type.
 
     Raises:
-        HTTPException: If authentication fails due to invalid credentials.
+        HTTPException: 401 if authentication fails due to invalid credentials,
+        503 if the password pool is saturated.
     """
-    user = get_user_by_username(db, form_data.username)
-    if not user or not verify_password(form_data.password, user.password):
+    user = await run_in_threadpool(get_user_by_username, db, form_data.username)
+    if not user or not await verify_password_async(form_data.password, user.password):
         raise HTTPException(status_code=401, detail="Invalid credentials")
+    await rehash_if_needed(user, form_data.password, db)
+
+    return await run_in_threadpool(issue_tokens, user)
+
+
+@router.post("/refresh", response_model=TokenResponse)
+def refresh(request: RefreshRequest, db: Session = Depends(get_db)):
+    """
+    Trade a refresh token for a new token pair without checking the password.
+
+    Args:
+        request (RefreshRequest): The refresh token, which is revoked on use.
+        db (Session): SQLAlchemy database session dependency.
+
+    Returns:
+        TokenResponse: A new access token and refresh token.
+
+    Raises:
+        HTTPException: 401 if the refresh token is invalid, expired or revoked.
+    """
+    return refresh_tokens(request.refresh_token, db)
+
+
+@router.post("/logout")
+def logout_route(
+    request: LogoutRequest = None,
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+):
+    """
+    Revoke the bearer access token and, if given, its refresh token.
+
+    Args:
+        request (LogoutRequest): Optional refresh token to revoke as well.
+        token (str): The bearer access token.
+        db (Session): SQLAlchemy database session dependency.
+
+    Returns:
+        dict: A confirmation message.
 
-    token_data = {"sub": user.username}
-    access_token = create_access_token(token_data)
-    return {"access_token": access_token, "token_type": "bearer"}
+    Raises:
+        HTTPException: 401 if a token is invalid or already revoked.
+    """
+    logout(token, request.refresh_token if request else None, db)
+    return {"message": "Logged out successfully"}
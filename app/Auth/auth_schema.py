@@ -0,0 +1,33 @@
+"""Pydantic schemas for the authenticated principal and issued tokens."""
+
+# pylint: disable=too-few-public-methods
+
+from typing import Optional
+from pydantic import BaseModel
+from app.User.user_schema import UserResponse
+
+
+class Principal(UserResponse):
+    """Authenticated user, its roles and the token version its tokens must carry."""
+
+    token_version: int = 0
+
+
+class TokenResponse(BaseModel):
+    """Access token and the refresh token that renews it."""
+
+    access_token: str
+    refresh_token: str
+    token_type: str = "bearer"
+
+
+class RefreshRequest(BaseModel):
+    """Refresh token to trade for a new token pair."""
+
+    refresh_token: str
+
+
+class LogoutRequest(BaseModel):
+    """Refresh token to revoke along with the access token, if any."""
+
+    refresh_token: Optional[str] = None
@@ -2,66 +2,384 @@
 FastAPI Authentication Service
 This module provides functions for user authentication, including password hashing,
 JWT token creation, and user retrieval. It also includes a dependency for checking user roles.
+
+The authenticated user is cached per worker in ``principal_cache``, keyed by the
+token subject, so most requests skip the user and role queries. The user and
+role services invalidate entries when a user or role changes; the TTL bounds how
+long other workers may keep serving a stale entry.
+
+Tokens carry the user's role names (``roles``) and token version (``ver``).
+``require_admin`` authorises from the role claim alone, without loading the
+user. Bumping ``User.token_version`` revokes older tokens: ``get_current_user``
+compares ``ver`` with the principal, and ``revoke_token_version`` puts the
+user's old version in the revocation list, which every access token is
+checked against, so admin checks see it too.
+
+Verified claims are memoised in ``token_cache``, keyed by the SHA-256 digest of
+the token, until the token expires, so a token reused for its whole lifetime
+is only verified once per worker. ``forget_token`` drops a revoked token.
+
+Access tokens are short lived; ``/refresh`` trades a refresh token for a new
+pair without a bcrypt login, rotating the refresh token. Every token carries a
+``jti``; logout and rotation revoke IDs through ``revocation_list``, which
+answers nearly every check from a per-worker Bloom filter without a query.
 """
 
+import hashlib
+import time
+import uuid
 from datetime import datetime, timedelta
+from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.db.session import get_db
-from app.User.user_repository import get_user_by_username
-from app.User.user_model import User
+from starlette.concurrency import run_in_threadpool
+from app.db.database import get_settings
+from app.db.session import get_async_db, get_db
+from app.Auth.auth_schema import Principal
+from app.Auth.password_pool import PasswordPoolSaturated, password_pool
+from app.Auth.token_revocation import revocation_list
+from app.User.user_repository import get_user_by_username, update_password_hash
+from app.utils.ttl_cache import TTLCache
 
 
 SECRET_KEY = "super-secret-key"
 ALGORITHM = "HS256"
-ACCESS_TOKEN_EXPIRE_MINUTES = 30
+ACCESS_TOKEN_EXPIRE_MINUTES = 15
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/login")
 
+# username -> Principal snapshot of the authenticated user and its roles
+principal_cache = TTLCache(maxsize=1024, ttl=30)
+
+# sha256(token) -> verified claims, kept no longer than the token's exp
+token_cache = TTLCache(maxsize=4096, ttl=ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+
+
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail="Too many authentication requests, please retry",
+        headers={"Retry-After": "1"},
+    )
+
 
 def get_password_hash(password: str) -> str:
-    """Hash a password using bcrypt."""
-    return pwd_context.hash(password)
+    """Hash a password using bcrypt in the password pool."""
+    try:
+        return password_pool.hash(password)
+    except PasswordPoolSaturated as exc:
+        raise _busy() from exc
+
+
+def get_password_hashes(passwords: list) -> list:
+    """
+    Hash many passwords across the password pool, in input order.
+
+    Waits for capacity when the pool is saturated instead of answering 503.
+    """
+    return password_pool.hash_many(passwords)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against a hashed password."""
-    return pwd_context.verify(plain_password, hashed_password)
+    """Verify a password against a hashed password in the password pool."""
+    try:
+        return password_pool.verify(plain_password, hashed_password)
+    except PasswordPoolSaturated as exc:
+        raise _busy() from exc
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """Verify a password in the password pool without holding a thread."""
+    try:
+        return await password_pool.verify_async(plain_password, hashed_password)
+    except PasswordPoolSaturated as exc:
+        raise _busy() from exc
+
+
+async def rehash_if_needed(user, plain_password: str, db: Session):
+    """
+    Replace a hash made with a lower bcrypt cost after a successful login.
+
+    The rehash is skipped (and retried on a later login) when the password pool
+    is saturated, so it never fails the login itself.
+    """
+    if not password_pool.needs_update(user.password):
+        return
+    try:
+        hashed = await password_pool.hash_async(plain_password)
+    except PasswordPoolSaturated:
+        return
+    await run_in_threadpool(update_password_hash, db, user, hashed)
 
 
 def create_access_token(data: dict, expires_delta: timedelta = None):
-    """Create a JWT access token with an expiration time."""
+    """Create a JWT access token with an expiration time and a unique ``jti``."""
     to_encode = data.copy()
     expire = datetime.utcnow() + (
         expires_delta or timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     )
     to_encode.update({"exp": expire})
+    to_encode.setdefault("jti", uuid.uuid4().hex)
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
-):
-    """Retrieve the current user from the JWT token."""
+def create_refresh_token(data: dict, expires_delta: timedelta = None):
+    """Create a refresh token, only accepted by ``refresh_tokens``."""
+    expires_delta = expires_delta or timedelta(
+        days=get_settings().refresh_token_expire_days
+    )
+    return create_access_token({**data, "type": "refresh"}, expires_delta)
+
+
+def issue_tokens(user) -> dict:
+    """
+    Create an access token and a refresh token for a user.
+
+    Args:
+        user (User): The authenticated user.
+
+    Returns:
+        dict: ``access_token``, ``refresh_token`` and ``token_type``.
+    """
+    data = token_data_for(user)
+    return {
+        "access_token": create_access_token(data),
+        "refresh_token": create_refresh_token(
+            {"sub": data["sub"], "ver": data["ver"]}
+        ),
+        "token_type": "bearer",
+    }
+
+
+def token_data_for(user) -> dict:
+    """
+    Build the claims of an access token for a user.
+
+    Args:
+        user (User): The authenticated user.
+
+    Returns:
+        dict: ``sub`` and ``ver``, plus ``roles`` when role claims are enabled.
+    """
+    data = {"sub": user.username, "ver": user.token_version or 0}
+    if get_settings().jwt_role_claims:
+        data["roles"] = [role.name for role in user.roles]
+    return data
+
+
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def decode_token(token: str) -> dict:
+    """
+    Verify the signature and expiry of a token and return its claims.
+
+    The claims are shared with the token cache and must not be modified.
+    """
+    key = _token_key(token)
+    payload = token_cache.get(key)
+    if payload is not None:
+        return payload
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        username = payload.get("sub")
-        if username is None:
+    except JWTError as exc:
+        raise HTTPException(status_code=401, detail="Invalid token") from exc
+    if payload.get("sub") is None:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    if "exp" in payload:
+        token_cache.set(key, payload, ttl=payload["exp"] - time.time())
+    return payload
+
+
+def forget_token(token: str):
+    """Revocation hook: the next use of the token is verified from scratch."""
+    token_cache.pop(_token_key(token))
+
+
+def _version_key(username: str, version: int) -> str:
+    """Revocation ID standing for every token of a user carrying ``version``."""
+    return hashlib.sha256(f"{username}\0{version}".encode()).hexdigest()[:32]
+
+
+def _check_not_revoked(payload: dict, db: Session):
+    jti = payload.get("jti")
+    if jti is not None and revocation_list.is_revoked(jti, db):
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+    if revocation_list.is_revoked(_version_key(payload["sub"], payload.get("ver", 0)), db):
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+
+
+def verify_access_token(token: str, db: Session) -> dict:
+    """
+    Return the claims of an access token that is valid and not revoked.
+
+    Raises:
+        HTTPException: 401 if the token is invalid, expired, a refresh token
+        or revoked.
+    """
+    payload = decode_token(token)
+    if payload.get("type", "access") != "access":
+        raise HTTPException(status_code=401, detail="Invalid token")
+    _check_not_revoked(payload, db)
+    return payload
+
+
+def revoke_token(token: str, db: Session):
+    """
+    Revoke a token until it expires, in every worker.
+
+    Raises:
+        HTTPException: 401 if the token is invalid or expired.
+    """
+    payload = decode_token(token)
+    if payload.get("jti") is not None:
+        revocation_list.revoke(
+            payload["jti"], datetime.utcfromtimestamp(payload["exp"]), db
+        )
+    forget_token(token)
+
+
+def revoke_token_version(username: str, version: int, db: Session):
+    """
+    Revoke every access token of a user carrying token ``version``.
+
+    Call it with the version the user had before it was bumped. The entry
+    only has to outlive the access tokens; refresh tokens are checked against
+    the stored version.
+    """
+    revocation_list.revoke(
+        _version_key(username, version),
+        datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES),
+        db,
+    )
+
+
+def logout(access_token: str, refresh_token: Optional[str], db: Session):
+    """
+    Revoke an access token and, if given, the refresh token of the same user.
+
+    Raises:
+        HTTPException: 401 if a token is invalid, revoked or belongs to
+        another user.
+    """
+    payload = verify_access_token(access_token, db)
+    if refresh_token is not None:
+        refresh_payload = decode_token(refresh_token)
+        if (
+            refresh_payload.get("type") != "refresh"
+            or refresh_payload["sub"] != payload["sub"]
+        ):
             raise HTTPException(status_code=401, detail="Invalid token")
+        revoke_token(refresh_token, db)
+    revoke_token(access_token, db)
+
+
+def refresh_tokens(refresh_token: str, db: Session) -> dict:
+    """
+    Trade a refresh token for a new access token and refresh token.
+
+    The refresh token is single use: its ``jti`` is claimed by inserting it
+    into the revoked token table before the new pair is issued, so of two
+    concurrent or replayed refreshes, on any worker, only one succeeds. The
+    claim goes to the database rather than the per-worker filter, which may
+    not have synced another worker's revocation yet. The user is read from the
+    database so the new access token carries its current roles.
+
+    Raises:
+        HTTPException: 401 if the refresh token is invalid, expired, already
+        used, or issued before the user's token version was bumped.
+    """
+    payload = decode_token(refresh_token)
+    if payload.get("type") != "refresh" or "jti" not in payload:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    user = get_user_by_username(db, payload["sub"])
+    if user is None:
+        raise HTTPException(status_code=401, detail="Invalid token")
+    if payload.get("ver", 0) != (user.token_version or 0):
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+    expires_at = datetime.utcfromtimestamp(payload["exp"])
+    if not revocation_list.claim(payload["jti"], expires_at, db):
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+    forget_token(refresh_token)
+    return issue_tokens(user)
+
+
+def load_principal(payload: dict, db: Session) -> Principal:
+    """
+    Return the principal named by verified claims, from the cache when possible.
+
+    Raises:
+        HTTPException: 404 if the user no longer exists, 401 if the token was
+        issued before the user's token version was bumped.
+    """
+    username = payload["sub"]
+    principal = principal_cache.get(username)
+    if principal is None:
         user = get_user_by_username(db, username)
         if user is None:
             raise HTTPException(status_code=404, detail="User not found")
-        return user
-    except JWTError as exc:
-        raise HTTPException(status_code=401, detail="Invalid token") from exc
+        principal = Principal.model_validate(user)
+        principal_cache.set(username, principal)
+    if payload.get("ver", 0) != principal.token_version:
+        raise HTTPException(status_code=401, detail="Token has been revoked")
+    return principal
+
+
+def invalidate_principal(username: str):
+    """Drop the cached principal of a user after it changed."""
+    principal_cache.pop(username)
+
+
+def invalidate_all_principals():
+    """Drop every cached principal, e.g. after a role was renamed or deleted."""
+    principal_cache.clear()
+
+
+def get_current_user(
+    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+) -> Principal:
+    """Retrieve the current user from the JWT token."""
+    return load_principal(verify_access_token(token, db), db)
+
+
+def require_admin(
+    token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)
+) -> dict:
+    """
+    Ensure the current user has admin privileges and return the token claims.
+
+    Tokens with a ``roles`` claim are authorised from the token alone: no user
+    or role is loaded. A user whose roles or credentials change has its old
+    token version revoked through the revocation list (see
+    ``revoke_token_version``), which reaches other workers within their sync
+    interval; the short lifetime of access tokens bounds the rest. Tokens
+    issued without role claims fall back to the roles stored for the user.
+    """
+    return _authorise_admin(token, db)
+
+
+async def require_admin_async(
+    token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)
+) -> dict:
+    """
+    Async variant of ``require_admin`` for the routers mounted in async mode.
+
+    The same checks run on the sync view of the route's AsyncSession, so the
+    revocation list and principal cache are shared with the sync routes and no
+    sync engine connection or worker thread is used.
+    """
+    return await db.run_sync(lambda session: _authorise_admin(token, session))
 
 
-def require_admin(current_user: User = Depends(get_current_user)):
-    """Ensure the current user has admin privileges."""
-    if not any(role.name == "ADMIN" for role in current_user.roles):
+def _authorise_admin(token: str, db: Session) -> dict:
+    payload = verify_access_token(token, db)
+    roles = payload.get("roles")
+    if roles is None:
+        roles = [role.name for role in load_principal(payload, db).roles]
+    if "ADMIN" not in roles:
         raise HTTPException(status_code=403, detail="Admin privileges required")
-    return current_user
+    return payload
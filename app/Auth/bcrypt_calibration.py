@@ -0,0 +1,148 @@
+"""
+Calibrate the bcrypt cost factor to a target verification time.
+
+Each extra round doubles the work, so one measurement at ``MIN_ROUNDS`` is
+enough to predict every higher cost. The command reports the time and the
+hashes per second per core of each cost, and the cost matching the target:
+
+    python -m app.Auth.bcrypt_calibration --target-ms 250
+
+Calibration takes a few hundred milliseconds and may pick different costs on
+a busy host, so it runs once per deploy rather than in every worker: with
+``--write`` the command stores the cost in a file (``BCRYPT_ROUNDS_FILE``),
+which the workers read at startup through ``load_or_calibrate``.
+"""
+
+import argparse
+import math
+import os
+import tempfile
+import time
+from typing import Optional
+
+from passlib.hash import bcrypt
+
+# Calibration never picks a cost below this floor, however slow the host is.
+MIN_ROUNDS = 10
+MAX_ROUNDS = 16
+
+
+def measure_hash_ms(rounds: int = MIN_ROUNDS, samples: int = 3) -> float:
+    """
+    Time one bcrypt hash at the given cost on this core.
+
+    Args:
+        rounds (int): bcrypt cost factor.
+        samples (int): Number of hashes to time; the fastest one is returned.
+
+    Returns:
+        float: Milliseconds per hash (verification costs the same).
+    """
+    hasher = bcrypt.using(rounds=rounds)
+    timings = []
+    for _ in range(samples):
+        started = time.perf_counter()
+        hasher.hash("calibration-password")
+        timings.append((time.perf_counter() - started) * 1000)
+    return min(timings)
+
+
+def rounds_for_target(base_ms: float, target_ms: float) -> int:
+    """
+    Pick the highest cost whose predicted time stays within the target.
+
+    Args:
+        base_ms (float): Measured time of one hash at ``MIN_ROUNDS``.
+        target_ms (float): Desired time of one verification.
+
+    Returns:
+        int: A cost between MIN_ROUNDS and MAX_ROUNDS.
+    """
+    if base_ms <= 0 or target_ms <= base_ms:
+        return MIN_ROUNDS
+    extra = int(math.floor(math.log2(target_ms / base_ms)))
+    return max(MIN_ROUNDS, min(MAX_ROUNDS, MIN_ROUNDS + extra))
+
+
+def calibrate_rounds(target_ms: float) -> int:
+    """Measure this host and return the cost matching ``target_ms``."""
+    return rounds_for_target(measure_hash_ms(MIN_ROUNDS, samples=2), target_ms)
+
+
+def read_rounds(path: str) -> Optional[int]:
+    """Return the cost stored in ``path``, or None if there is none."""
+    try:
+        with open(path, encoding="ascii") as stored:
+            return int(stored.read().strip())
+    except (FileNotFoundError, ValueError):
+        return None
+
+
+def write_rounds(path: str, rounds: int, replace: bool = True):
+    """
+    Store a cost in ``path`` atomically.
+
+    Args:
+        path (str): File to write.
+        rounds (int): bcrypt cost factor.
+        replace (bool): Overwrite an existing file; otherwise keep it.
+    """
+    descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path) or ".")
+    try:
+        with os.fdopen(descriptor, "w", encoding="ascii") as pending:
+            pending.write(f"{rounds}\n")
+        if replace:
+            os.replace(temporary, path)
+        else:
+            try:
+                os.link(temporary, path)
+            except FileExistsError:
+                pass
+    finally:
+        if os.path.exists(temporary):
+            os.unlink(temporary)
+
+
+def load_or_calibrate(path: Optional[str], target_ms: float) -> int:
+    """
+    Return the cost stored in ``path``, calibrating and storing it if missing.
+
+    Workers starting together without the file each calibrate, but only the
+    first to store its result wins and every one of them adopts the stored
+    cost, so all workers hash with the same cost. Without a path, every call
+    calibrates.
+    """
+    if path is None:
+        return calibrate_rounds(target_ms)
+    stored = read_rounds(path)
+    if stored is not None:
+        return stored
+    write_rounds(path, calibrate_rounds(target_ms), replace=False)
+    return read_rounds(path)
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Calibrate the bcrypt cost factor.")
+    parser.add_argument(
+        "--target-ms", type=float, default=float(os.getenv("BCRYPT_TARGET_MS", "250"))
+    )
+    parser.add_argument("--samples", type=int, default=3)
+    parser.add_argument("--write", metavar="PATH", help="store the chosen cost here")
+    args = parser.parse_args(argv)
+
+    base_ms = measure_hash_ms(MIN_ROUNDS, args.samples)
+    chosen = rounds_for_target(base_ms, args.target_ms)
+    print(f"cores: {os.cpu_count()}")
+    print("rounds  ms/hash  hashes/s/core")
+    for rounds in range(MIN_ROUNDS, MAX_ROUNDS + 1):
+        predicted = base_ms * 2 ** (rounds - MIN_ROUNDS)
+        marker = "  <- target" if rounds == chosen else ""
+        print(f"{rounds:6d}  {predicted:7.1f}  {1000 / predicted:13.2f}{marker}")
+    print(f"BCRYPT_ROUNDS={chosen} for a {args.target_ms:.0f} ms target")
+    if args.write:
+        write_rounds(args.write, chosen)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+"""
+Bounded process pool running bcrypt away from the request threadpool.
+
+Hashing or verifying a password costs hundreds of milliseconds of CPU. Running
+it in a few dedicated processes keeps a burst of logins from occupying the
+threads (and the GIL) every other route needs. At most ``max_pending``
+operations may be queued or running; further calls fail fast with
+``PasswordPoolSaturated`` so callers can answer 503 instead of piling up.
+
+The bcrypt cost is set with ``set_rounds`` (calibrated once per deploy, see
+``app.Auth.bcrypt_calibration``); hashes made with a lower cost report
+``needs_update`` so they can be replaced on the next successful login.
+
+This module only imports passlib so the spawned worker processes stay light.
+"""
+
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+
+from passlib.context import CryptContext
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+
+class PasswordPoolSaturated(RuntimeError):
+    """Raised when too many password operations are already pending."""
+
+
+def configure_context(rounds: int):
+    """Hash with ``rounds`` and flag hashes of a lower cost as needing an update."""
+    pwd_context.update(bcrypt__default_rounds=rounds, bcrypt__min_rounds=rounds)
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(plain_password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(plain_password, hashed_password)
+
+
+class PasswordPool:
+    """
+    Process pool for bcrypt with a cap on queued work.
+
+    With ``workers`` set to 0 the operations run inline in the calling thread
+    (the async variants in the default executor), as before the pool existed.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: int = 16):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.rounds = None
+        self._executor = None
+        self._lock = threading.Lock()
+        self._released = threading.Condition(self._lock)
+        self.pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def configure(self, workers: int, max_pending: int):
+        """Resize the pool; running operations finish on the previous processes."""
+        if (workers, max_pending) == (self.workers, self.max_pending):
+            return
+        self.shutdown(wait=False)
+        with self._lock:
+            self.workers = workers
+            self.max_pending = max_pending
+
+    def set_rounds(self, rounds: int):
+        """Use a new bcrypt cost here and in the worker processes."""
+        if rounds == self.rounds:
+            return
+        configure_context(rounds)
+        self.shutdown(wait=False)
+        with self._lock:
+            self.rounds = rounds
+
+    def needs_update(self, hashed_password: str) -> bool:
+        """Whether a stored hash was made with a lower cost than the current one."""
+        return pwd_context.needs_update(hashed_password)
+
+    def _executor_for_submit(self):
+        if self._executor is None:
+            # spawn: forking a multi-threaded server process is unsafe
+            self._executor = ProcessPoolExecutor(
+                self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=configure_context if self.rounds else None,
+                initargs=(self.rounds,) if self.rounds else (),
+            )
+        return self._executor
+
+    def _submit(self, function, *args, wait: bool = False) -> Future:
+        with self._lock:
+            if wait:
+                self._released.wait_for(lambda: self.pending < self.max_pending)
+            elif self.pending >= self.max_pending:
+                self.rejected += 1
+                raise PasswordPoolSaturated(
+                    f"{self.pending} password operations already pending"
+                )
+            self.pending += 1
+            try:
+                if self.workers > 0:
+                    future = self._executor_for_submit().submit(function, *args)
+                else:
+                    future = Future()
+            except BaseException:
+                self.pending -= 1
+                raise
+        future.add_done_callback(self._release)
+        if self.workers <= 0:
+            try:
+                future.set_result(function(*args))
+            except Exception as error:  # pylint: disable=broad-except
+                future.set_exception(error)
+        return future
+
+    def _release(self, _future):
+        with self._lock:
+            self.pending -= 1
+            self.completed += 1
+            self._released.notify_all()
+
+    def hash(self, password: str) -> str:
+        """Hash a password, blocking the calling thread until it is done."""
+        return self._submit(_hash, password).result()
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password, blocking the calling thread until it is done."""
+        return self._submit(_verify, plain_password, hashed_password).result()
+
+    def hash_many(self, passwords: list) -> list:
+        """
+        Hash many passwords across the worker processes, in input order.
+
+        At most half of ``max_pending`` hashes are queued at a time so logins
+        can still be served while a bulk import runs. When other callers fill
+        the pool, this waits for capacity rather than raising
+        ``PasswordPoolSaturated``, so a long import never fails halfway.
+        """
+        window = max(1, self.max_pending // 2)
+        hashes = []
+        for start in range(0, len(passwords), window):
+            futures = [
+                self._submit(_hash, password, wait=True)
+                for password in passwords[start:start + window]
+            ]
+            hashes.extend(future.result() for future in futures)
+        return hashes
+
+    async def hash_async(self, password: str) -> str:
+        """Hash a password without blocking the event loop or a thread."""
+        return await self._run_async(_hash, password)
+
+    async def verify_async(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password without blocking the event loop or a thread."""
+        return await self._run_async(_verify, plain_password, hashed_password)
+
+    async def _run_async(self, function, *args):
+        if self.workers <= 0:
+            # inline mode must still keep bcrypt off the event loop
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                None, lambda: self._submit(function, *args).result()
+            )
+        return await asyncio.wrap_future(self._submit(function, *args))
+
+    def stats(self) -> dict:
+        """Return the size, queue depth and counters of the pool."""
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "rounds": self.rounds,
+                "pending": self.pending,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker processes; they are started again on next use."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+password_pool = PasswordPool()
@@ -0,0 +1,19 @@
+"""SQLAlchemy model for revoked token IDs."""
+
+# pylint: disable=too-few-public-methods
+
+from datetime import datetime
+from sqlalchemy import Column, DateTime, Integer, String
+from app.db.database import Base
+
+
+class RevokedToken(Base):
+    """A token ID (``jti``) that must no longer be accepted."""
+
+    __tablename__ = "revoked_token"
+
+    id = Column(Integer, primary_key=True)  # increasing: workers sync by id
+    jti = Column(String(36), nullable=False, unique=True)
+    expires_at = Column(DateTime, nullable=False, index=True)
+    # indexed for the trailing window re-read by every sync
+    revoked_at = Column(DateTime, default=datetime.utcnow, index=True)
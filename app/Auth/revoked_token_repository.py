@@ -0,0 +1,70 @@
+"""Repository functions for the revoked token table."""
+
+from datetime import datetime
+from sqlalchemy import delete, or_, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.Auth.revoked_token_model import RevokedToken
+
+
+def add_revoked_token(db: Session, jti: str, expires_at: datetime):
+    """Stores a revoked token ID; revoking it twice is a no-op."""
+    db.add(RevokedToken(jti=jti, expires_at=expires_at))
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+
+
+def claim_revoked_token(db: Session, jti: str, expires_at: datetime) -> bool:
+    """
+    Stores a token ID as a one-time claim.
+
+    The unique ``jti`` column makes the insert the arbiter: of any number of
+    concurrent claims, across workers, exactly one commits.
+
+    Returns:
+        bool: True if this call stored the ID, False if it was already stored.
+    """
+    db.add(RevokedToken(jti=jti, expires_at=expires_at))
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        return False
+    return True
+
+
+def read_revoked_after(db: Session, after_id: int, since: datetime = None) -> list:
+    """
+    Returns the ``(id, jti)`` of unexpired revocations newer than ``after_id``.
+
+    Ids are assigned at insert but become visible at commit, so a row with a
+    lower id may appear after a higher one was read. Rows revoked at or after
+    ``since`` are returned as well, whatever their id, to catch those.
+    """
+    newer = RevokedToken.id > after_id
+    if since is not None:
+        newer = or_(newer, RevokedToken.revoked_at >= since)
+    return db.execute(
+        select(RevokedToken.id, RevokedToken.jti)
+        .where(newer, RevokedToken.expires_at > datetime.utcnow())
+        .order_by(RevokedToken.id)
+    ).all()
+
+
+def is_token_revoked(db: Session, jti: str) -> bool:
+    """Checks the table for one token ID."""
+    return (
+        db.execute(select(RevokedToken.id).where(RevokedToken.jti == jti)).first()
+        is not None
+    )
+
+
+def delete_expired_revocations(db: Session) -> int:
+    """Deletes revocations of tokens that have expired anyway."""
+    result = db.execute(
+        delete(RevokedToken).where(RevokedToken.expires_at <= datetime.utcnow())
+    )
+    db.commit()
+    return result.rowcount
@@ -0,0 +1,148 @@
+"""
+Per-worker view of the revoked token table, checked through a Bloom filter.
+
+Every revoked ``jti`` is added to a Bloom filter. A token whose ID is not in
+the filter is certainly not revoked, which is the answer for nearly every
+request and needs no query. Only filter hits (revoked tokens and rare false
+positives) are confirmed against the table.
+
+Revocations made by other workers are picked up by an incremental sync that
+reads the rows with an id above the last one seen, at most once every
+``sync_interval`` seconds. Ids become visible in commit order, not id order,
+so each sync also re-reads the rows revoked during the last ``SYNC_OVERLAP``
+before the previous sync; adding an ID twice is harmless. When the filter
+holds more IDs than it was sized for it is rebuilt from the unexpired rows,
+after purging expired ones.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy.orm import Session
+
+from app.Auth.revoked_token_repository import (
+    add_revoked_token,
+    claim_revoked_token,
+    delete_expired_revocations,
+    is_token_revoked,
+    read_revoked_after,
+)
+from app.utils.bloom import BloomFilter
+
+# Longest time a revocation may take between its insert and its commit.
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+class RevocationList:
+    """Bloom filter of revoked token IDs kept in sync with the database."""
+
+    def __init__(
+        self, capacity: int = 100_000, error_rate: float = 0.001, sync_interval: float = 5
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self._lock = threading.Lock()
+        self._filter = BloomFilter(capacity, error_rate)
+        self._last_id = 0
+        self._window_start = None
+        self._synced_at = None
+        self.checks = 0
+        self.confirmations = 0
+        self.syncs = 0
+
+    def configure(self, capacity: int, sync_interval: float):
+        """Apply new settings; the filter is rebuilt on the next check."""
+        self.capacity = capacity
+        self.sync_interval = sync_interval
+        self.reset()
+
+    def reset(self):
+        """Forget every revocation seen so far; the next check resyncs."""
+        with self._lock:
+            self._filter = BloomFilter(self.capacity, self.error_rate)
+            self._last_id = 0
+            self._window_start = None
+            self._synced_at = None
+            self.checks = 0
+            self.confirmations = 0
+            self.syncs = 0
+
+    def sync(self, db: Session, force: bool = False):
+        """Add the revocations stored since the last sync to the filter."""
+        now = time.monotonic()
+        if (
+            not force
+            and self._synced_at is not None
+            and now - self._synced_at < self.sync_interval
+        ):
+            return
+        if self._filter.saturated:
+            delete_expired_revocations(db)
+            with self._lock:
+                self._filter = BloomFilter(self.capacity, self.error_rate)
+                self._last_id = 0
+                self._window_start = None
+        window_start = datetime.utcnow() - SYNC_OVERLAP
+        rows = read_revoked_after(db, self._last_id, self._window_start)
+        with self._lock:
+            for row_id, jti in rows:
+                # rows of the trailing window are read again on every sync
+                if jti not in self._filter:
+                    self._filter.add(jti)
+                self._last_id = max(self._last_id, row_id)
+            self._window_start = window_start
+            self._synced_at = now
+            self.syncs += 1
+
+    def is_revoked(self, jti: str, db: Session) -> bool:
+        """
+        Check one token ID, querying the table only on a filter hit.
+
+        Args:
+            jti (str): The token ID.
+            db (Session): Session used for syncs and confirmations.
+
+        Returns:
+            bool: Whether the token has been revoked.
+        """
+        self.sync(db)
+        self.checks += 1
+        if jti not in self._filter:
+            return False
+        self.confirmations += 1
+        return is_token_revoked(db, jti)
+
+    def revoke(self, jti: str, expires_at: datetime, db: Session):
+        """Store a revocation and apply it to this worker immediately."""
+        add_revoked_token(db, jti, expires_at)
+        self._filter.add(jti)
+
+    def claim(self, jti: str, expires_at: datetime, db: Session) -> bool:
+        """
+        Revoke a token ID only if no worker has revoked it yet.
+
+        The filter is not consulted: another worker's revocation may not have
+        been synced into it, so the database insert decides.
+        """
+        if not claim_revoked_token(db, jti, expires_at):
+            return False
+        self._filter.add(jti)
+        return True
+
+    def stats(self) -> dict:
+        """Return the size of the filter and how often it avoided a query."""
+        return {
+            "revoked": self._filter.count,
+            "capacity": self.capacity,
+            "filter_bits": self._filter.size,
+            "hash_functions": self._filter.hashes,
+            "checks": self.checks,
+            "confirmations": self.confirmations,
+            "syncs": self.syncs,
+            "last_id": self._last_id,
+        }
+
+
+revocation_list = RevocationList()
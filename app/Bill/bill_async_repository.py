@@ -0,0 +1,130 @@
+"""Async repository module for Bill read operations."""
+
+# pylint: disable=no-name-in-module, not-callable
+
+from fastapi import HTTPException
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.Bill.bill_model import Bill
+from app.Order.order_model import Order
+from app.User.user_model import User
+from app.Role.role_model import Role
+
+
+# Retrieves all bills from the database
+async def get_all_bills(db: AsyncSession):
+    """Retrieve all bill records from the database."""
+    result = await db.execute(select(Bill))
+    return result.scalars().all()
+
+
+# Retrieves a specific bill by its ID
+async def get_bill_by_id(bill_id: int, db: AsyncSession):
+    """Retrieve a specific bill record by its ID."""
+    result = await db.execute(select(Bill).where(Bill.id == bill_id))
+    bill = result.scalars().first()
+
+    if not bill:
+        raise HTTPException(status_code=404, detail="Bill not found")
+    return bill
+
+
+# Retrieves the bills of users with role 'CUSTOMER' issued within a date range
+async def count_customer_bills_in_range(start, end, db: AsyncSession):
+    """
+    Retrieves the bills for users with the role 'CUSTOMER'
+    between the given start and end dates.
+    """
+    result = await db.execute(
+        select(Bill)
+        .join(Bill.order)
+        .join(Order.user)
+        .join(User.roles)
+        .where(
+            Bill.issueDate >= start,
+            Bill.issueDate <= end,
+            Role.name == "CUSTOMER",
+        )
+    )
+    return result.scalars().all()
+
+
+async def get_best_customer_of_month(start, end, db: AsyncSession) -> str:
+    """
+    Retrieves the best customer of the month based on the number of bills issued.
+    """
+    result = await db.execute(
+        select(User.name)
+        .join(User.roles)
+        .join(User.orders)
+        .join(Order.bill)
+        .where(
+            Bill.issueDate >= start,
+            Bill.issueDate <= end,
+            Role.name == "CUSTOMER",
+        )
+        .group_by(User.id)
+        .order_by(func.count(Bill.id).desc())
+        .limit(1)
+    )
+    return result.scalar()
+
+
+async def get_all_bills_for_company(db: AsyncSession):
+    """
+    Retrieves all bills for users with the EMPLOYEE or ADMIN roles.
+    """
+    result = await db.execute(
+        select(Bill)
+        .join(Bill.order)
+        .join(Order.user)
+        .join(User.roles)
+        .where(Role.name.in_(["EMPLOYEE", "ADMIN"]))
+    )
+    return result.scalars().all()
+
+
+async def get_all_bills_for_customers(db: AsyncSession):
+    """
+    Retrieves all bills for users with the 'CUSTOMER' role.
+
+    Args:
+        db (AsyncSession): The async database session dependency.
+
+    Returns:
+        List: A list of bills associated with customers.
+    """
+    result = await db.execute(
+        select(Bill)
+        .join(Bill.order)
+        .join(Order.user)
+        .join(User.roles)
+        .where(Role.name == "CUSTOMER")
+    )
+    return result.scalars().all()
+
+
+async def get_monthly_sales_total(start, end, db: AsyncSession) -> float:
+    """
+    Calculates the total amount of sales for customer bills within a date range.
+
+    Args:
+        start (datetime): The start date of the period.
+        end (datetime): The end date of the period.
+        db (AsyncSession): The async database session dependency.
+
+    Returns:
+        float: The total sales amount for the specified period.
+    """
+    result = await db.execute(
+        select(func.sum(Bill.totalprice))
+        .join(Bill.order)
+        .join(Order.user)
+        .join(User.roles)
+        .where(
+            Bill.issueDate >= start,
+            Bill.issueDate <= end,
+            func.lower(Role.name) == "CUSTOMER",
+        )
+    )
+    return result.scalar() or 0.0
@@ -0,0 +1,79 @@
+"""Async router module for Bill read endpoints, mounted when DB_MODE is "async"."""
+
+from typing import List
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_async_db
+from app.Bill.bill_schema import BillResponse
+from app.Bill.bill_async_service import (
+    count_customer_bills_current_month_serv,
+    get_all_bills_for_company_serv,
+    get_all_bills_for_customers_serv,
+    get_best_customer_of_month_serv,
+    get_monthly_sales_total_serv,
+    read_bill_serv,
+    read_bills_serv,
+)
+
+router = APIRouter()
+
+
+# Endpoint to retrieve a specific bill by its ID
+@router.get("/{bill_id}", response_model=BillResponse)
+async def get_bill_route(bill_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Retrieve a bill by its ID.
+
+    Args:
+        bill_id (int): The unique identifier of the bill to retrieve.
+        db (AsyncSession, optional): The async database session dependency.
+
+    Returns:
+        The bill data retrieved by the `read_bill_serv` service function.
+    """
+    return await read_bill_serv(bill_id, db)
+
+
+# Endpoint to retrieve all bills
+@router.get("/", response_model=List[BillResponse])
+async def read_bills_route(db: AsyncSession = Depends(get_async_db)):
+    """
+    Handles the HTTP GET request to retrieve all bills.
+
+    Args:
+        db (AsyncSession): Async database session dependency.
+
+    Returns:
+        List[Bill]: A list of bills retrieved from the database.
+    """
+    return await read_bills_serv(db)
+
+
+@router.get("/customer/countThisMonth")
+async def get_customer_bills_count_route(db: AsyncSession = Depends(get_async_db)):
+    """Retrieve the customer bills issued during the current month."""
+    return await count_customer_bills_current_month_serv(db)
+
+
+@router.get("/customer/bestCustomer")
+async def get_best_customer_route(db: AsyncSession = Depends(get_async_db)):
+    """Retrieve the name of the customer with the most bills this month."""
+    return await get_best_customer_of_month_serv(db)
+
+
+@router.get("/company/getAllOfCompany", response_model=List[BillResponse])
+async def get_all_bills_of_company_route(db: AsyncSession = Depends(get_async_db)):
+    """Retrieve all bills of employees and administrators."""
+    return await get_all_bills_for_company_serv(db)
+
+
+@router.get("/customer/getAllOfCustomers", response_model=List[BillResponse])
+async def get_all_customer_bills_route(db: AsyncSession = Depends(get_async_db)):
+    """Retrieve all bills associated with customers."""
+    return await get_all_bills_for_customers_serv(db)
+
+
+@router.get("/company/monthlySalesTotal")
+async def get_monthly_sales_total_route(db: AsyncSession = Depends(get_async_db)):
+    """Retrieves the total amount of customer sales for the current month."""
+    return await get_monthly_sales_total_serv(db)
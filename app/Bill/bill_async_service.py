@@ -0,0 +1,85 @@
+"""Async service module for Bill read operations."""
+
+# pylint: disable=no-name-in-module
+
+from datetime import datetime
+from calendar import monthrange
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+from app.Bill.bill_async_repository import (
+    count_customer_bills_in_range,
+    get_all_bills,
+    get_all_bills_for_company,
+    get_all_bills_for_customers,
+    get_best_customer_of_month,
+    get_bill_by_id,
+    get_monthly_sales_total,
+)
+
+
+async def read_bills_serv(db: AsyncSession):
+    """Retrieve all bills from the database."""
+    bills = await get_all_bills(db)
+    if not bills:
+        raise HTTPException(status_code=404, detail="No bills found")
+    return bills
+
+
+async def read_bill_serv(bill_id: int, db: AsyncSession):
+    """Retrieve a single bill by ID, or raise 404 if not found."""
+    return await get_bill_by_id(bill_id, db)
+
+
+async def count_customer_bills_current_month_serv(db: AsyncSession):
+    """
+    Retrieve the bills for users with role 'CUSTOMER'
+    issued during the current month.
+    """
+    now = datetime.now()
+    start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    last_day = monthrange(now.year, now.month)[1]
+    end = now.replace(day=last_day, hour=23, minute=59, second=59, microsecond=999999)
+
+    return await count_customer_bills_in_range(start, end, db)
+
+
+async def get_best_customer_of_month_serv(db: AsyncSession) -> str:
+    """
+    Get the best customer of the month based on the number of bills issued.
+    """
+    now = datetime.now()
+    start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    end = now.replace(hour=23, minute=59, second=59, microsecond=999999)
+    return await get_best_customer_of_month(start, end, db)
+
+
+async def get_all_bills_for_company_serv(db: AsyncSession):
+    """
+    Retrieve all bills for the company.
+    """
+    bills = await get_all_bills_for_company(db)
+    if not bills:
+        raise HTTPException(status_code=404, detail="No bills found")
+    return bills
+
+
+async def get_all_bills_for_customers_serv(db: AsyncSession):
+    """
+    Retrieve all bills associated with customers (users with the "CUSTOMER" role).
+    """
+    bills = await get_all_bills_for_customers(db)
+    if not bills:
+        raise HTTPException(status_code=404, detail="No customer bills found")
+    return bills
+
+
+async def get_monthly_sales_total_serv(db: AsyncSession) -> float:
+    """
+    Retrieves the total amount of sales for the current month.
+    Only bills from customers are considered in the calculation.
+    """
+    now = datetime.now()
+    start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    end = now.replace(hour=23, minute=59, second=59, microsecond=999999)
+
+    return await get_monthly_sales_total(start, end, db)
@@ -1,7 +1,7 @@
 """Router module for Bill endpoints."""
 
 from sqlalchemy.orm import Session
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from fastapi import APIRouter, Depends
 from typing import List
 from app.User.user_schema import UserResponse
@@ -41,14 +41,14 @@ def create_bill_route(bill: BillCreate, db: Session = Depends(get_db)):
 
 # Endpoint to retrieve a specific bill by its ID
 @router.get("/{bill_id}", response_model=BillResponse)
-def get_bill_route(bill_id: int, db: Session = Depends(get_db)):
+def get_bill_route(bill_id: int, db: Session = Depends(get_read_db)):
     """
     Retrieve a bill by its ID.
 
     Args:
         bill_id (int): The unique identifier of the bill to retrieve.
         db (Session, optional): The database session dependency.
-        Defaults to the session provided by `get_db`.
+        Defaults to the session provided by `get_read_db`.
 
     Returns:
         The bill data retrieved by the `read_bill_serv` service function.
@@ -58,7 +58,7 @@ def get_bill_route(bill_id: int, db: Session = Depends(get_db)):
 
 # Endpoint to retrieve all bills
 @router.get("/", response_model= List[BillResponse])
-def read_bills_route(db: Session = Depends(get_db)):
+def read_bills_route(db: Session = Depends(get_read_db)):
     """
     Handles the HTTP GET request to retrieve all bills.
 
@@ -108,7 +108,7 @@ def update_bill_route(
 
 
 @router.get("/customer/countThisMonth")
-def get_customer_bills_count_route(db: Session = Depends(get_db)):
+def get_customer_bills_count_route(db: Session = Depends(get_read_db)):
     """
     Retrieve the count of bills associated with a customer.
 
@@ -123,7 +123,7 @@ def get_customer_bills_count_route(db: Session = Depends(get_db)):
 
 
 @router.get("/customer/bestCustomer")
-def get_best_customer_route(db: Session = Depends(get_db), response_model=UserResponse):
+def get_best_customer_route(db: Session = Depends(get_read_db), response_model=UserResponse):
     """
     Retrieve the best customer based on the number of bills.
 
@@ -138,7 +138,7 @@ def get_best_customer_route(db: Session = Depends(get_db), response_model=UserRe
 
 
 @router.get("/company/getAllOfCompany", response_model= List[BillResponse])
-def get_all_bills_of_company_route(db: Session = Depends(get_db), response_model=list):
+def get_all_bills_of_company_route(db: Session = Depends(get_read_db), response_model=list):
     """
     Retrieve all bills associated with a company.
 
@@ -147,7 +147,7 @@ def get_all_bills_of_company_route(db: Session = Depends(get_db), response_model
 
     Args:
         db (Session, optional): SQLAlchemy database session dependency.
-        Defaults to Depends(get_db).
+        Defaults to Depends(get_read_db).
 
     Returns:
         int: The count of customer bills for the company.
@@ -156,13 +156,15 @@ def get_all_bills_of_company_route(db: Session = Depends(get_db), response_model
 
 
 @router.get("/customer/getAllOfCustomers", response_model= List[BillResponse])
-def get_all_customer_bills_route(db: Session = Depends(get_db), response_model=list[BillResponse]):
+def get_all_customer_bills_route(
+    db: Session = Depends(get_read_db), response_model=list[BillResponse]
+):
     """
     Retrieve all bills associated with customers (users with the "CUSTOMER" role).
 
     Args:
         db (Session, optional): SQLAlchemy database session dependency.
-        Defaults to Depends(get_db).
+        Defaults to Depends(get_read_db).
 
     Returns:
         List: A list of bills associated with customers.
@@ -171,14 +173,14 @@ def get_all_customer_bills_route(db: Session = Depends(get_db), response_model=l
 
 
 @router.get("/company/monthlySalesTotal")
-def get_monthly_sales_total_route(db: Session = Depends(get_db)):
+def get_monthly_sales_total_route(db: Session = Depends(get_read_db)):
     """
     Retrieves the total amount of sales for the current month.
     Only bills from customers are considered in the calculation.
 
     Args:
         db (Session, optional): SQLAlchemy database session dependency.
-        Defaults to Depends(get_db).
+        Defaults to Depends(get_read_db).
 
     Returns:
         float: The total monthly sales amount.
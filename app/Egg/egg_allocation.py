@@ -0,0 +1,189 @@
+"""
+First-expiry-first-out allocation of egg lots.
+
+Each Egg row is a lot. ``allocate_fefo`` covers a requested quantity of one
+egg type from the lots that expire first, splitting it across as many lots as
+needed, and decrements them in the caller's transaction.
+
+Candidates are read in pages of ``ALLOCATION_PAGE_SIZE`` lots along the
+``ix_egg_fefo`` index, so the cost of an allocation depends on the lots it
+uses, not on how many lots the type has. The lots a page is expected to
+consume are re-read for their price and quantity, still without row locks,
+and each is decremented with a guarded
+``UPDATE ... WHERE avalibleQuantity >= :taken``. The row count of that update
+is the only concurrency control: a lot that changed underneath takes nothing
+and is re-read and retried, and when a concurrent order emptied some of the
+lots first, the next page makes up the difference. No row is held between the
+read and the update, so concurrent orders never wait on each other's locks.
+"""
+
+from datetime import datetime
+from typing import NamedTuple, Optional
+
+from fastapi import HTTPException
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+
+from app.Egg.egg_model import Egg
+from app.Egg.stock_summary_repository import apply_stock_delta, stock_key
+
+ALLOCATION_PAGE_SIZE = 16
+
+
+class LotAllocation(NamedTuple):
+    """Eggs taken from one lot, at the lot's sell price."""
+
+    egg_id: int
+    quantity: int
+    unit_price: float
+
+
+def _candidates(db: Session, type_egg_id: int, color: Optional[str], after, now):
+    """Next page of unexpired lots with stock, in FEFO order, without locks."""
+    query = (
+        select(Egg.id, Egg.expirationDate, Egg.avalibleQuantity)
+        .where(
+            Egg.type_egg_id == type_egg_id,
+            Egg.expirationDate > now,
+            Egg.avalibleQuantity > 0,
+        )
+        .order_by(Egg.expirationDate, Egg.id)
+        .limit(ALLOCATION_PAGE_SIZE)
+    )
+    if color is not None:
+        query = query.where(Egg.color == color)
+    if after is not None:
+        expiration, egg_id = after
+        query = query.where(
+            (Egg.expirationDate > expiration)
+            | ((Egg.expirationDate == expiration) & (Egg.id > egg_id))
+        )
+    return db.execute(query).all()
+
+
+def read_lots(db: Session, egg_ids: list) -> dict:
+    """
+    Return the given lots by id, freshly read and without row locks.
+
+    The quantities read are only a hint: decrement with ``take_from_lot``,
+    whose guarded update decides whether the eggs are still there.
+    """
+    lots = db.scalars(
+        select(Egg)
+        .where(Egg.id.in_(egg_ids))
+        .order_by(Egg.id)
+        .execution_options(populate_existing=True)
+    ).all()
+    return {lot.id: lot for lot in lots}
+
+
+def take_from_lot(db: Session, lot: Egg, quantity: int) -> bool:
+    """
+    Decrement a lot and the stock summary in the current transaction.
+
+    Returns:
+        bool: False, changing nothing, if the lot no longer holds ``quantity``
+        or was rolled off as expired.
+    """
+    taken = db.execute(
+        update(Egg)
+        .where(
+            Egg.id == lot.id,
+            Egg.avalibleQuantity >= quantity,
+            Egg.rolled_off.is_(False),
+        )
+        .values(
+            avalibleQuantity=Egg.avalibleQuantity - quantity, version=Egg.version + 1
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.expire(lot, ["avalibleQuantity", "version", "rolled_off"])
+    if not taken:
+        return False
+    apply_stock_delta(db, stock_key(lot), -quantity, -quantity * lot.entryPrice)
+    return True
+
+
+def return_to_lot(db: Session, egg_id: int, quantity: int):
+    """
+    Give eggs back to a lot in the current transaction, and to the stock
+    summary unless the lot was rolled off as expired.
+    """
+    returned = db.execute(
+        update(Egg)
+        .where(Egg.id == egg_id)
+        .values(
+            avalibleQuantity=Egg.avalibleQuantity + quantity, version=Egg.version + 1
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not returned:
+        return
+    lot = db.get(Egg, egg_id)
+    db.expire(lot, ["avalibleQuantity", "version", "rolled_off"])
+    if lot.rolled_off:
+        return
+    apply_stock_delta(db, stock_key(lot), quantity, quantity * lot.entryPrice)
+
+
+def allocate_fefo(
+    db: Session, type_egg_id: int, quantity: int, color: Optional[str] = None
+) -> list:
+    """
+    Take ``quantity`` eggs of a type from the lots that expire first.
+
+    Nothing is committed: the caller commits the allocation together with the
+    order lines it creates, or rolls it back.
+
+    Args:
+        db (Session): Database session of the ongoing transaction.
+        type_egg_id (int): The egg type requested.
+        quantity (int): Number of eggs requested.
+        color (str, optional): Only use lots of this color.
+
+    Returns:
+        list[LotAllocation]: The lots used, in FEFO order.
+
+    Raises:
+        HTTPException: 409 if the unexpired lots do not hold enough eggs.
+    """
+    now = datetime.utcnow()
+    allocations = []
+    remaining = quantity
+    after = None
+    while remaining > 0:
+        page = _candidates(db, type_egg_id, color, after, now)
+        if not page:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Not enough stock of egg type {type_egg_id}",
+            )
+        after = (page[-1].expirationDate, page[-1].id)
+
+        # re-read just the lots this page is expected to consume
+        needed, expected = [], 0
+        for candidate in page:
+            needed.append(candidate)
+            expected += candidate.avalibleQuantity
+            if expected >= remaining:
+                break
+        lots = read_lots(db, [candidate.id for candidate in needed])
+        for candidate in needed:
+            lot = lots.get(candidate.id)
+            # retried only when the lot changed between the read and the update
+            while (
+                lot is not None
+                and remaining > 0
+                and lot.avalibleQuantity > 0
+                and not lot.rolled_off
+            ):
+                taken = min(lot.avalibleQuantity, remaining)
+                if take_from_lot(db, lot, taken):
+                    allocations.append(LotAllocation(lot.id, taken, lot.sellPrice))
+                    remaining -= taken
+                    break
+        if remaining > 0 and len(needed) < len(page):
+            # a concurrent order took part of the lots read: resume right
+            # after the last lot examined rather than after the whole page
+            after = (needed[-1].expirationDate, needed[-1].id)
+    return allocations
@@ -0,0 +1,64 @@
+"""Async repository module for Egg read operations."""
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.loading import response_options
+from app.Egg.egg_model import Egg
+from app.Egg.egg_schema import EggResponse
+from app.Egg.stock_summary_repository import total_quantity_query, type_stock_query
+
+
+def _egg_response_options():
+    """Eager loads for the relationships serialised by EggResponse.
+
+    Async sessions cannot lazy-load, so every relationship the response model
+    reads has to be loaded with the query.
+    """
+    return response_options(Egg, EggResponse)
+
+
+# Retrieves all eggs from the database
+async def get_all_eggs(db: AsyncSession):
+    """Retrieve all egg records from the database."""
+    result = await db.execute(select(Egg).options(*_egg_response_options()))
+    return result.scalars().all()
+
+
+# Retrieves a specific egg by its ID
+async def get_egg_by_id(egg_id: int, db: AsyncSession):
+    """Retrieve a specific egg record by its ID."""
+    result = await db.execute(
+        select(Egg).options(*_egg_response_options()).where(Egg.id == egg_id)
+    )
+    egg = result.scalars().first()
+
+    if not egg:
+        raise HTTPException(status_code=404, detail="Egg not found")
+    return egg
+
+
+async def search_eggs_stock(type_egg_id: int, db: AsyncSession):
+    """Search the stock of an egg type in the stock summary.
+    Args:
+        type_egg_id (int): The ID of the type egg to search for.
+        db (AsyncSession): The async database session.
+    Returns:
+        list[Row]: The stock of the type per color and supplier.
+    """
+    result = await db.execute(type_stock_query(type_egg_id))
+    return result.all()
+
+
+async def get_total_egg_quantity(db: AsyncSession):
+    """
+    Get the total quantity of eggs available, from the stock summary.
+
+    Args:
+        db (AsyncSession): The async database session.
+
+    Returns:
+        int: The total quantity of eggs.
+    """
+    result = await db.execute(total_quantity_query())
+    return result.scalar()
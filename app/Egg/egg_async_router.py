@@ -0,0 +1,70 @@
+"""Async router module for Egg read endpoints, mounted when DB_MODE is "async"."""
+
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_async_db
+from app.Egg.egg_async_service import (
+    get_all_eggs_service,
+    get_egg_by_id_service,
+    get_eggs_stock_service,
+    get_total_egg_quantity_serv,
+)
+from app.Egg.egg_schema import EggResponse, TypeStockResponse
+
+router = APIRouter()
+
+
+@router.get("/{egg_id}", response_model=EggResponse)
+async def get_egg_by_id_route(egg_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Retrieve an egg by its unique identifier.
+
+    Args:
+        egg_id (int): The unique identifier of the egg to retrieve.
+        db (AsyncSession, optional): The async database session dependency.
+
+    Returns:
+        The egg object retrieved by its ID.
+    """
+    return await get_egg_by_id_service(egg_id, db)
+
+
+@router.get("/", response_model=list[EggResponse])
+async def get_all_eggs_route(db: AsyncSession = Depends(get_async_db)):
+    """
+    Handles the HTTP GET request to retrieve all eggs.
+
+    Args:
+        db (AsyncSession): Async database session dependency injected by FastAPI.
+
+    Returns:
+        List[Egg]: A list of all egg records retrieved from the database.
+    """
+    return await get_all_eggs_service(db)
+
+
+@router.get("/stock/{type_egg_id}", response_model=TypeStockResponse)
+async def get_eggs_stock(type_egg_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Retrieves the stock of eggs by type.
+    Args:
+        type_egg_id (int): The unique identifier of the egg type.
+        db (AsyncSession): The async database session dependency.
+    Returns:
+        TypeStockResponse: The available eggs of the type, per color and supplier.
+    """
+    return await get_eggs_stock_service(type_egg_id, db)
+
+
+@router.get("/search/count_this_month", response_model=int)
+async def get_total_egg_quantity_route(db: AsyncSession = Depends(get_async_db)):
+    """
+    Retrieves the total quantity of eggs in the database.
+
+    Args:
+        db (AsyncSession): The async database session dependency.
+
+    Returns:
+        int: The total quantity of eggs in the database.
+    """
+    return await get_total_egg_quantity_serv(db)
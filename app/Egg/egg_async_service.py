@@ -0,0 +1,38 @@
+"""Async service module for Egg read operations."""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+from app.Egg.egg_schema import TypeStockResponse
+from app.Egg.egg_async_repository import (
+    get_all_eggs,
+    get_egg_by_id,
+    get_total_egg_quantity,
+    search_eggs_stock,
+)
+
+
+# Service to retrieve all eggs
+async def get_all_eggs_service(db: AsyncSession):
+    """Retrieve all eggs from the database."""
+    return await get_all_eggs(db)
+
+
+# Service to retrieve an egg by its ID
+async def get_egg_by_id_service(egg_id: int, db: AsyncSession):
+    """Retrieve an egg by its ID."""
+    return await get_egg_by_id(egg_id, db)
+
+
+async def get_eggs_stock_service(type_egg_id: int, db: AsyncSession):
+    """Get the stock of an egg type from the stock summary."""
+    return TypeStockResponse.from_rows(
+        type_egg_id, await search_eggs_stock(type_egg_id, db)
+    )
+
+
+async def get_total_egg_quantity_serv(db: AsyncSession):
+    """Get the total quantity of eggs in stock."""
+    count = await get_total_egg_quantity(db)
+    if not count:
+        raise HTTPException(status_code=404, detail="No eggs found")
+    return count
@@ -3,7 +3,7 @@
 # pylint: disable=too-few-public-methods
 
 from datetime import datetime
-from sqlalchemy import Column, DateTime, Integer, String, ForeignKey, Float
+from sqlalchemy import Boolean, Column, DateTime, Index, Integer, String, ForeignKey, Float
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 
@@ -12,6 +12,12 @@ class Egg(Base):
     """Represents a egg record."""
 
     __tablename__ = "egg"
+    # FEFO allocation walks the lots of a type by expiration date; stock reads
+    # and the roll-off find the expired lots still counted in the summary
+    __table_args__ = (
+        Index("ix_egg_fefo", "type_egg_id", "expirationDate"),
+        Index("ix_egg_roll_off", "rolled_off", "expirationDate"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     avalibleQuantity = Column(Integer, nullable=False)
@@ -28,3 +34,11 @@ class Egg(Base):
     supplier = relationship("Supplier", back_populates="eggs")
 
     order_eggs = relationship("OrderEgg", back_populates="egg")
+
+    # Bumped by every update; an update based on a stale read matches no row
+    # and fails instead of overwriting a concurrent change.
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+    __mapper_args__ = {"version_id_col": version}
+
+    # Set once an expired lot's eggs are taken out of the stock summary.
+    rolled_off = Column(Boolean, nullable=False, default=False, server_default="0")
@@ -1,10 +1,18 @@
 """Repository module for Egg operations."""
 
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 from fastapi import Depends, HTTPException
 from app.db.session import get_db
-from app.Egg.egg_schema import EggCreate
+from app.db.loading import response_options
+from app.Egg.egg_schema import EggCreate, EggResponse, EggUpdate
 from app.Egg.egg_model import Egg
+from app.Egg.stock_summary_repository import (
+    apply_lot_change,
+    lot_state,
+    read_total_quantity,
+    read_type_stock,
+)
 
 
 # Create a new egg in the database
@@ -12,6 +20,7 @@ def create_egg(egg: EggCreate, db: Session = Depends(get_db)):
     """Create a new egg record in the database."""
     db_egg = Egg(**egg.model_dump())
     db.add(db_egg)
+    apply_lot_change(db, None, lot_state(db_egg))
     db.commit()
     db.refresh(db_egg)
     return db_egg
@@ -20,14 +29,19 @@ def create_egg(egg: EggCreate, db: Session = Depends(get_db)):
 # Retrieves all eggs from the database
 def get_all_eggs(db: Session = Depends(get_db)):
     """Retrieve all egg records from the database."""
-    eggs = db.query(Egg).all()
+    eggs = db.query(Egg).options(*response_options(Egg, EggResponse)).all()
     return eggs
 
 
 # Retrieves a specific egg by its ID
 def get_egg_by_id(egg_id: int, db: Session = Depends(get_db)):
     """Retrieve a specific egg record by its ID."""
-    egg = db.query(Egg).filter(Egg.id == egg_id).first()
+    egg = (
+        db.query(Egg)
+        .options(*response_options(Egg, EggResponse))
+        .filter(Egg.id == egg_id)
+        .first()
+    )
 
     if not egg:
         raise HTTPException(status_code=404, detail="Egg not found")
@@ -35,47 +49,77 @@ def get_egg_by_id(egg_id: int, db: Session = Depends(get_db)):
 
 
 # Updates a specific egg in the database
-def update_egg(egg_id: int, egg: EggCreate, db: Session = Depends(get_db)):
-    """Update a specific egg record by its ID."""
+def update_egg(egg_id: int, egg: EggUpdate, db: Session = Depends(get_db)):
+    """
+    Update a specific egg record by its ID.
+
+    The UPDATE only matches the version that was read, so a lot changed
+    concurrently (an order taking eggs, another update) is never overwritten:
+    the update fails with 409 and the client re-reads the lot.
+    """
     db_egg = db.query(Egg).filter(Egg.id == egg_id).first()
 
     if not db_egg:
         raise HTTPException(status_code=404, detail="Egg not found")
+    if egg.version is not None and egg.version != db_egg.version:
+        raise HTTPException(status_code=409, detail="Egg was changed, read it again")
 
-    for key, value in egg.model_dump().items():
+    before = lot_state(db_egg)
+    for key, value in egg.model_dump(exclude={"version"}).items():
         setattr(db_egg, key, value)
-    db.commit()
+    # the new expiration date is in the future: count a rolled off lot again
+    db_egg.rolled_off = False
+    apply_lot_change(db, before, lot_state(db_egg))
+    try:
+        db.commit()
+    except StaleDataError as error:
+        db.rollback()
+        raise HTTPException(
+            status_code=409, detail="Egg was changed, read it again"
+        ) from error
     db.refresh(db_egg)
     return db_egg
 
 
 # Deletes a specific egg from the database
 def delete_egg(egg_id: int, db: Session = Depends(get_db)):
-    """Delete a specific egg record by its ID."""
+    """
+    Delete a specific egg record by its ID.
+
+    Like an update, the DELETE only matches the version that was read, so a
+    lot whose stock moved meanwhile is not removed with a stale summary change.
+    """
     db_egg = db.query(Egg).filter(Egg.id == egg_id).first()
 
     if not db_egg:
         raise HTTPException(status_code=404, detail="Egg not found")
 
+    apply_lot_change(db, lot_state(db_egg), None)
     db.delete(db_egg)
-    db.commit()
+    try:
+        db.commit()
+    except StaleDataError as error:
+        db.rollback()
+        raise HTTPException(
+            status_code=409, detail="Egg was changed, read it again"
+        ) from error
     return {"message": "Egg deleted successfully"}
 
 
 def search_eggs_stock(type_egg_id: int, db: Session):
-    """Search for eggs in stock by type egg ID.
+    """Search the stock of an egg type in the stock summary.
     Args:
         type_egg_id (int): The ID of the type egg to search for.
         db (Session): The database session.
     Returns:
-        list[Egg]: A list of eggs that match the type egg ID.
+        list[Row]: The stock of the type per color and supplier.
     """
-    return db.query(Egg).filter(Egg.type_egg_id == type_egg_id).all()
+    return read_type_stock(db, type_egg_id)
 
 
 def get_total_egg_quantity(db: Session):
     """
-    Get the total quantity of eggs in the database.
+    Get the total quantity of eggs available, from the stock summary.
 
     Args:
         db (Session): The database session.
@@ -83,5 +127,4 @@ def get_total_egg_quantity(db: Session):
     Returns:
         int: The total quantity of eggs.
     """
-    count = db.query(Egg).count()
-    return count
+    return read_total_quantity(db)
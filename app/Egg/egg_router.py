@@ -2,9 +2,11 @@
 
 # pylint: disable=import-error, no-name-in-module
 
+from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
 from app.db.session import get_db
+from app.Auth.auth_service import require_admin
 from app.Egg.egg_service import (
     create_egg_service,
     get_egg_by_id_service,
@@ -13,9 +15,16 @@ from app.Egg.egg_service import (
     update_egg_service,
     get_eggs_stock_service,
     get_total_egg_quantity_serv,
+    set_stock_shards_service,
+)
+from app.Egg.egg_schema import (
+    EggCreate,
+    EggResponse,
+    EggUpdate,
+    StockShards,
+    StockShardsResponse,
+    TypeStockResponse,
 )
-from app.Egg.egg_schema import EggCreate, EggResponse
-from fastapi import APIRouter, Depends
 
 router = APIRouter()
 
@@ -87,13 +96,14 @@ def get_all_eggs_route(db: Session = Depends(get_db)):
 
 
 @router.put("/{egg_id}", response_model=EggResponse)
-def update_egg_route(egg_id: int, egg_update: EggCreate, db: Session = Depends(get_db)):
+def update_egg_route(egg_id: int, egg_update: EggUpdate, db: Session = Depends(get_db)):
     """
     Updates the details of an existing egg in the database.
 
     Args:
         egg_id (int): The unique identifier of the egg to be updated.
-        egg_update (EggCreate): An object containing the updated details of the egg.
+        egg_update (EggUpdate): An object containing the updated details of the
+        egg and, optionally, the version they were based on.
         db (Session): The database session dependency.
 
     Returns:
@@ -102,17 +112,38 @@ def update_egg_route(egg_id: int, egg_update: EggCreate, db: Session = Depends(g
     return update_egg_service(egg_id, egg_update, db)
 
 
-@router.get("/stock/{type_egg_id}", response_model=EggResponse)
+@router.get("/stock/{type_egg_id}", response_model=TypeStockResponse)
 def get_eggs_stock(type_egg_id: int, db: Session = Depends(get_db)):
     """Retrieves the stock of eggs by type.
     Args:
         type_egg_id (int): The unique identifier of the egg type.
         db (Session): The database session dependency.
     Returns:
-        EggResponse: The stock of eggs for the specified type.
+        TypeStockResponse: The available eggs of the type, per color and supplier.
     """
     return get_eggs_stock_service(type_egg_id, db)
 
+
+@router.put(
+    "/stock/{type_egg_id}/shards",
+    response_model=StockShardsResponse,
+    dependencies=[Depends(require_admin)],
+)
+def set_stock_shards(type_egg_id: int, request: StockShards, db: Session = Depends(get_db)):
+    """Spreads the stock counters of a hot egg type over several rows.
+
+    Orders of the type then update one of ``shards`` rows at random instead of
+    all waiting on the same one; stock reads sum the shards. 1 turns it off.
+    Args:
+        type_egg_id (int): The unique identifier of the egg type.
+        request (StockShards): The number of shards.
+        db (Session): The database session dependency.
+    Returns:
+        StockShardsResponse: The new sharding of the type.
+    """
+    return set_stock_shards_service(type_egg_id, request.shards, db)
+
+
 @router.get("/search/count_this_month", response_model = int)
 def get_total_egg_quantity_route(db: Session = Depends(get_db)):
     """
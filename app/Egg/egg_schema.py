@@ -3,7 +3,7 @@
 # pylint: disable=too-few-public-methods
 
 from datetime import date
-from typing import Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel
 from app.Supplier.supplier_schema import SupplierResponse
 from app.TypeEgg.typeegg_schema import TypeEggResponse
@@ -27,6 +27,16 @@ class EggCreate(EggBase):
     """Input schema for creating a new egg."""
 
 
+class EggUpdate(EggBase):
+    """Input schema for updating an egg.
+
+    ``version`` is the version the client read; when given, the update is
+    rejected if the lot has changed since.
+    """
+
+    version: Optional[int] = None
+
+
 class EggResponse(EggBase):
     """Output schema for returning egg data, including related supplier."""
 
@@ -36,6 +46,7 @@ class EggResponse(EggBase):
     entryDate: date
     sellPrice: float
     entryPrice: float
+    version: int = 1
     supplier: Optional[SupplierResponse] = None
     type_egg: Optional[TypeEggResponse] = None
 
@@ -43,3 +54,66 @@ class EggResponse(EggBase):
         """Pydantic configuration for ORM mode."""
 
         from_attributes = True
+
+
+class StockEntryResponse(BaseModel):
+    """Available eggs of one color and supplier, and their value at entry price."""
+
+    color: str
+    supplier_id: int
+    quantity: int
+    value: float
+
+    class Config:
+        """Pydantic configuration for ORM mode."""
+
+        from_attributes = True
+
+
+class TypeStockResponse(BaseModel):
+    """Available eggs of one type, in total and per color and supplier."""
+
+    type_egg_id: int
+    quantity: int
+    value: float
+    breakdown: List[StockEntryResponse]
+
+    @classmethod
+    def from_rows(cls, type_egg_id: int, rows: list) -> "TypeStockResponse":
+        """Build the response from the stock summary rows of the type."""
+        return cls(
+            type_egg_id=type_egg_id,
+            quantity=sum(row.quantity for row in rows),
+            value=sum(row.value for row in rows),
+            breakdown=[StockEntryResponse.model_validate(row) for row in rows],
+        )
+
+
+class StockShards(BaseModel):
+    """Number of rows the stock changes of an egg type are spread over."""
+
+    shards: int
+
+
+class StockShardsResponse(StockShards):
+    """Sharding of the stock counters of an egg type."""
+
+    type_egg_id: int
+
+
+class StockDiscrepancyResponse(BaseModel):
+    """A stock summary entry that disagrees with the egg lots."""
+
+    type_egg_id: int
+    color: str
+    supplier_id: int
+    summary: Dict[str, float]
+    lots: Dict[str, float]
+
+
+class StockReconciliationResponse(BaseModel):
+    """Outcome of comparing the stock summary with the egg lots."""
+
+    checked: int
+    discrepancies: List[StockDiscrepancyResponse]
+    repaired: bool
@@ -4,7 +4,13 @@ from datetime import date
 from datetime import timedelta
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
-from app.Egg.egg_schema import EggCreate
+from app.Egg.egg_schema import (
+    EggCreate,
+    EggUpdate,
+    StockShardsResponse,
+    TypeStockResponse,
+)
+from app.Egg.stock_summary_repository import MAX_STOCK_SHARDS, set_stock_shards
 from app.Egg.egg_repository import (
     create_egg,
     get_all_eggs,
@@ -56,7 +62,7 @@ def get_egg_by_id_service(egg_id: int, db: Session):
 
 
 # Service to update an existing egg
-def update_egg_service(egg_id: int, egg: EggCreate, db: Session):
+def update_egg_service(egg_id: int, egg: EggUpdate, db: Session):
     """Update an existing egg in the database."""
     existing_egg = get_egg_by_id(egg_id, db)
     if not existing_egg:
@@ -90,8 +96,8 @@ def delete_egg_service(egg_id: int, db: Session):
 
 
 def get_eggs_stock_service(type_egg_id: int, db: Session):
-    """Get eggs in stock by type egg ID."""
-    return search_eggs_stock(type_egg_id, db)
+    """Get the stock of an egg type from the stock summary."""
+    return TypeStockResponse.from_rows(type_egg_id, search_eggs_stock(type_egg_id, db))
 
 
 def get_total_egg_quantity_serv(db: Session):
@@ -100,3 +106,18 @@ def get_total_egg_quantity_serv(db: Session):
     if not count:
         raise HTTPException(status_code=404, detail="No eggs found")
     return count or 0
+
+
+# Service to shard the stock counters of a hot egg type
+def set_stock_shards_service(type_egg_id: int, shards: int, db: Session):
+    """Spread the stock changes of an egg type over ``shards`` rows."""
+    if not 1 <= shards <= MAX_STOCK_SHARDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Shards must be between 1 and {MAX_STOCK_SHARDS}",
+        )
+    type_egg = db.query(TypeEgg).filter(TypeEgg.id == type_egg_id).first()
+    if not type_egg:
+        raise HTTPException(status_code=404, detail="TypeEgg not found")
+    set_stock_shards(db, type_egg, shards)
+    return StockShardsResponse(type_egg_id=type_egg_id, shards=shards)
@@ -0,0 +1,99 @@
+"""
+Reconciliation of the stock summary against the egg lots.
+
+The summary is maintained incrementally; this job recomputes it from the egg
+table with one aggregate query and reports every entry that disagrees. With
+``--repair`` the summary is rewritten from the lots:
+
+    python -m app.Egg.stock_reconcile [--repair]
+"""
+
+import argparse
+import math
+
+from sqlalchemy.orm import Session
+
+from app.db.database import SessionLocal, get_engine
+from app.Egg.stock_summary_repository import (
+    compute_stock_from_lots,
+    read_stock_summary,
+    replace_stock_summary,
+)
+
+# Values are sums of float products; tolerate rounding drift.
+VALUE_TOLERANCE = 1e-6
+
+
+def _matches(summary: tuple, lots: tuple) -> bool:
+    return summary[0] == lots[0] and math.isclose(
+        summary[1], lots[1], rel_tol=VALUE_TOLERANCE, abs_tol=VALUE_TOLERANCE
+    )
+
+
+def reconcile_stock(db: Session, repair: bool = False) -> dict:
+    """
+    Compare the stock summary with the egg lots, optionally repairing it.
+
+    Entries with no eggs on either side are ignored.
+
+    Args:
+        db (Session): Database session.
+        repair (bool): Rewrite the summary from the lots when they disagree.
+
+    Returns:
+        dict: The number of entries checked, the discrepancies and whether
+        the summary was repaired.
+    """
+    lots = compute_stock_from_lots(db)
+    summary = read_stock_summary(db)
+    empty = (0, 0.0)
+    discrepancies = []
+    for key in sorted(set(lots) | set(summary), key=str):
+        expected, actual = lots.get(key, empty), summary.get(key, empty)
+        if _matches(actual, expected):
+            continue
+        type_egg_id, color, supplier_id = key
+        discrepancies.append(
+            {
+                "type_egg_id": type_egg_id,
+                "color": color,
+                "supplier_id": supplier_id,
+                "summary": {"quantity": actual[0], "value": actual[1]},
+                "lots": {"quantity": expected[0], "value": expected[1]},
+            }
+        )
+    repaired = bool(repair and discrepancies)
+    if repaired:
+        replace_stock_summary(db, lots)
+    return {
+        "checked": len(set(lots) | set(summary)),
+        "discrepancies": discrepancies,
+        "repaired": repaired,
+    }
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Check the stock summary.")
+    parser.add_argument(
+        "--repair", action="store_true", help="rewrite the summary from the egg lots"
+    )
+    args = parser.parse_args(argv)
+    db = SessionLocal(bind=get_engine())
+    try:
+        report = reconcile_stock(db, repair=args.repair)
+    finally:
+        db.close()
+    for item in report["discrepancies"]:
+        print(
+            f"type {item['type_egg_id']} {item['color']} supplier {item['supplier_id']}: "
+            f"summary {item['summary']['quantity']} eggs, lots {item['lots']['quantity']} eggs"
+        )
+    state = "repaired" if report["repaired"] else "found"
+    print(f"{report['checked']} entries checked, {len(report['discrepancies'])} {state}.")
+    if report["discrepancies"] and not report["repaired"]:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""SQLAlchemy model for the per-type stock summary of eggs."""
+
+# pylint: disable=too-few-public-methods
+
+from sqlalchemy import Column, Float, Integer, String, UniqueConstraint
+from app.db.database import Base
+
+
+class StockSummary(Base):
+    """
+    Available eggs and their value at entry price, per type, color and supplier.
+
+    Maintained in the same transaction as every change to the egg lots, so stock
+    reads never scan the egg table; ``app.Egg.stock_reconcile`` checks it.
+    Expired lots stay counted until ``roll_off_expired_lots`` takes them out;
+    stock reads subtract the ones not rolled off yet.
+    """
+
+    __tablename__ = "stock_summary"
+    __table_args__ = (
+        UniqueConstraint("type_egg_id", "color", "supplier_id", name="uq_stock_summary_key"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    type_egg_id = Column(Integer, nullable=False, index=True)
+    color = Column(String(50), nullable=False)
+    # 0 for lots without a supplier, so the key stays unique
+    supplier_id = Column(Integer, nullable=False, default=0)
+    quantity = Column(Integer, nullable=False, default=0)
+    value = Column(Float, nullable=False, default=0)
+
+
+class StockShard(Base):
+    """
+    Part of the stock changes of a summary key whose egg type is sharded.
+
+    Hot egg types spread their stock changes over ``TypeEgg.stock_shards``
+    rows per key, picked at random, instead of updating a single summary row.
+    The stock of a key is its StockSummary row plus all of its shards.
+    """
+
+    __tablename__ = "stock_shard"
+    __table_args__ = (
+        UniqueConstraint(
+            "type_egg_id", "color", "supplier_id", "shard", name="uq_stock_shard_key"
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+    type_egg_id = Column(Integer, nullable=False, index=True)
+    color = Column(String(50), nullable=False)
+    supplier_id = Column(Integer, nullable=False, default=0)
+    shard = Column(Integer, nullable=False)
+    quantity = Column(Integer, nullable=False, default=0)
+    value = Column(Float, nullable=False, default=0)
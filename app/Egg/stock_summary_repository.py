@@ -0,0 +1,304 @@
+"""Repository functions for the per-type stock summary."""
+
+import random
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import delete, func, insert, select, union_all, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.Egg.egg_model import Egg
+from app.Egg.stock_summary_model import StockShard, StockSummary
+from app.TypeEgg.typeegg_model import TypeEgg
+from app.utils.ttl_cache import TTLCache
+
+# Most shards a type may use; the gain flattens out long before.
+MAX_STOCK_SHARDS = 64
+
+# Per-worker shard counts of the egg types. A change made by an admin reaches
+# the other workers within the ttl; reads sum every shard, so a worker still
+# using the old count only writes to a different row, never a wrong total.
+stock_shard_counts = TTLCache(maxsize=4096, ttl=5)
+
+
+def stock_key(egg) -> tuple:
+    """Returns the summary key ``(type_egg_id, color, supplier_id)`` of an egg lot."""
+    return (egg.type_egg_id, egg.color, egg.supplier_id or 0)
+
+
+def _add_delta(db: Session, model, key: dict, quantity: int, value: float):
+    """Add to the quantity and value of the row of ``model`` at ``key``, creating it."""
+    statement = (
+        update(model)
+        .where(*(getattr(model, column) == item for column, item in key.items()))
+        .values(quantity=model.quantity + quantity, value=model.value + value)
+        .execution_options(synchronize_session=False)
+    )
+    if db.execute(statement).rowcount:
+        return
+    try:
+        with db.begin_nested():
+            db.execute(insert(model).values(**key, quantity=quantity, value=value))
+    except IntegrityError:
+        # another transaction created the row first
+        db.execute(statement)
+
+
+def stock_shards(db: Session, type_egg_id: int) -> int:
+    """Returns the number of rows the stock changes of a type are spread over."""
+    shards = stock_shard_counts.get(type_egg_id)
+    if shards is None:
+        shards = db.scalar(
+            select(TypeEgg.stock_shards).where(TypeEgg.id == type_egg_id)
+        ) or 1
+        stock_shard_counts.set(type_egg_id, shards)
+    return shards
+
+
+def apply_stock_delta(db: Session, key: tuple, quantity: int, value: float):
+    """
+    Adds a change of stock to the summary row of ``key``, creating it if needed.
+
+    The row is updated with ``quantity = quantity + :delta`` so concurrent
+    changes never overwrite each other. For a sharded egg type the change goes
+    to one of its shard rows, picked at random, so concurrent orders of a hot
+    type rarely wait on the same row. Nothing is committed: callers apply the
+    delta in the transaction that changes the egg lots.
+
+    Args:
+        db (Session): Database session of the ongoing transaction.
+        key (tuple): ``(type_egg_id, color, supplier_id)``, see stock_key.
+        quantity (int): Eggs added (positive) or removed (negative).
+        value (float): Change of the stock value at entry price.
+    """
+    if not quantity and not value:
+        return
+    type_egg_id, color, supplier_id = key
+    columns = {"type_egg_id": type_egg_id, "color": color, "supplier_id": supplier_id}
+    shards = stock_shards(db, type_egg_id)
+    if shards > 1:
+        columns["shard"] = random.randrange(shards)
+        _add_delta(db, StockShard, columns, quantity, value)
+    else:
+        _add_delta(db, StockSummary, columns, quantity, value)
+
+
+def fold_stock_shards(db: Session, type_egg_id: int):
+    """Moves the shard rows of a type back into its summary rows; no commit."""
+    rows = db.execute(
+        select(
+            StockShard.color,
+            StockShard.supplier_id,
+            func.sum(StockShard.quantity),
+            func.sum(StockShard.value),
+        )
+        .where(StockShard.type_egg_id == type_egg_id)
+        .group_by(StockShard.color, StockShard.supplier_id)
+    ).all()
+    for color, supplier_id, quantity, value in rows:
+        columns = {"type_egg_id": type_egg_id, "color": color, "supplier_id": supplier_id}
+        _add_delta(db, StockSummary, columns, quantity or 0, value or 0.0)
+    db.execute(delete(StockShard).where(StockShard.type_egg_id == type_egg_id))
+
+
+def apply_lot_change(db: Session, before, after):
+    """
+    Applies the stock change of creating, updating or deleting an egg lot.
+
+    Args:
+        db (Session): Database session of the ongoing transaction.
+        before (tuple, optional): ``(key, quantity, entry_price)`` before the change.
+        after (tuple, optional): ``(key, quantity, entry_price)`` after the change.
+    """
+    if before is not None:
+        key, quantity, price = before
+        apply_stock_delta(db, key, -quantity, -quantity * price)
+    if after is not None:
+        key, quantity, price = after
+        apply_stock_delta(db, key, quantity, quantity * price)
+
+
+def lot_state(egg) -> tuple:
+    """Returns the ``(key, quantity, entry_price)`` of an egg lot in the summary."""
+    quantity = 0 if egg.rolled_off else egg.avalibleQuantity
+    return (stock_key(egg), quantity, egg.entryPrice)
+
+
+def set_stock_shards(db: Session, type_egg: TypeEgg, shards: int):
+    """
+    Changes how many rows the stock changes of a type are spread over and commits.
+
+    Going back to a single row folds the shards into the summary rows.
+    """
+    type_egg.stock_shards = shards
+    if shards == 1:
+        fold_stock_shards(db, type_egg.id)
+    db.commit()
+    stock_shard_counts.pop(type_egg.id)
+
+
+def _expired_and_counted(now: datetime):
+    """Conditions of the expired lots whose eggs are still in the summary."""
+    return Egg.rolled_off.is_(False), Egg.expirationDate <= now
+
+
+def _stock_rows(now: Optional[datetime] = None):
+    """
+    Summary and shard rows together; the stock of a key is the sum of its rows.
+
+    With ``now``, the lots expired by then and not rolled off yet are added
+    as negative rows, so the sums only count eggs that can still be sold.
+    """
+    selects = [
+        select(
+            model.type_egg_id, model.color, model.supplier_id, model.quantity, model.value
+        )
+        for model in (StockSummary, StockShard)
+    ]
+    if now is not None:
+        selects.append(
+            select(
+                Egg.type_egg_id,
+                Egg.color,
+                func.coalesce(Egg.supplier_id, 0),
+                -Egg.avalibleQuantity,
+                -Egg.avalibleQuantity * Egg.entryPrice,
+            ).where(*_expired_and_counted(now))
+        )
+    return union_all(*selects).subquery()
+
+
+def type_stock_query(type_egg_id: int):
+    """Statement for the unexpired stock of one egg type per color and supplier."""
+    rows = _stock_rows(datetime.utcnow())
+    return (
+        select(
+            rows.c.color,
+            rows.c.supplier_id,
+            func.sum(rows.c.quantity).label("quantity"),
+            func.sum(rows.c.value).label("value"),
+        )
+        .where(rows.c.type_egg_id == type_egg_id)
+        .group_by(rows.c.color, rows.c.supplier_id)
+        .order_by(rows.c.color, rows.c.supplier_id)
+    )
+
+
+def total_quantity_query():
+    """Statement for the number of unexpired eggs available across every type."""
+    return select(
+        func.coalesce(func.sum(_stock_rows(datetime.utcnow()).c.quantity), 0)
+    )
+
+
+def read_type_stock(db: Session, type_egg_id: int) -> list:
+    """Returns the stock of one egg type per color and supplier."""
+    return db.execute(type_stock_query(type_egg_id)).all()
+
+
+def read_total_quantity(db: Session) -> int:
+    """Returns the number of eggs available across every type."""
+    return db.scalar(total_quantity_query())
+
+
+def compute_stock_from_lots(db: Session) -> dict:
+    """
+    Aggregates the lots not rolled off into ``{key: (quantity, value)}``; a full scan.
+    """
+    supplier = func.coalesce(Egg.supplier_id, 0)
+    rows = db.execute(
+        select(
+            Egg.type_egg_id,
+            Egg.color,
+            supplier,
+            func.sum(Egg.avalibleQuantity),
+            func.sum(Egg.avalibleQuantity * Egg.entryPrice),
+        )
+        .where(Egg.rolled_off.is_(False))
+        .group_by(Egg.type_egg_id, Egg.color, supplier)
+    ).all()
+    return {(row[0], row[1], row[2]): (row[3] or 0, row[4] or 0.0) for row in rows}
+
+
+def read_stock_summary(db: Session) -> dict:
+    """Returns the whole summary, shards included, as ``{key: (quantity, value)}``."""
+    rows = _stock_rows()
+    return {
+        (row[0], row[1], row[2]): (row[3], row[4])
+        for row in db.execute(
+            select(
+                rows.c.type_egg_id,
+                rows.c.color,
+                rows.c.supplier_id,
+                func.sum(rows.c.quantity),
+                func.sum(rows.c.value),
+            ).group_by(rows.c.type_egg_id, rows.c.color, rows.c.supplier_id)
+        )
+    }
+
+
+def replace_stock_summary(db: Session, stock: dict):
+    """Rewrites the summary from ``{key: (quantity, value)}``, without shards, and commits."""
+    db.query(StockShard).delete()
+    db.query(StockSummary).delete()
+    if stock:
+        db.execute(
+            insert(StockSummary),
+            [
+                {
+                    "type_egg_id": key[0],
+                    "color": key[1],
+                    "supplier_id": key[2],
+                    "quantity": quantity,
+                    "value": value,
+                }
+                for key, (quantity, value) in stock.items()
+            ],
+        )
+    db.commit()
+
+
+def roll_off_expired_lots(db: Session, batch_size: int = 500) -> int:
+    """
+    Takes up to ``batch_size`` expired lots out of the summary and commits.
+
+    Stock reads already leave out the lots past their expiration date; rolling
+    them off keeps that set, read by every stock query, small. Each lot is
+    flagged by an update guarded by the quantity that was read, so runs in
+    several workers never move a lot twice, and a lot that changed meanwhile
+    (an order giving eggs back) is left for the next run.
+
+    Returns:
+        int: The number of lots rolled off.
+    """
+    lots = db.execute(
+        select(
+            Egg.id,
+            Egg.type_egg_id,
+            Egg.color,
+            Egg.supplier_id,
+            Egg.avalibleQuantity,
+            Egg.entryPrice,
+        )
+        .where(*_expired_and_counted(datetime.utcnow()))
+        .order_by(Egg.expirationDate, Egg.id)
+        .limit(batch_size)
+    ).all()
+    rolled = 0
+    for lot in lots:
+        flagged = db.execute(
+            update(Egg)
+            .where(
+                Egg.id == lot.id,
+                Egg.rolled_off.is_(False),
+                Egg.avalibleQuantity == lot.avalibleQuantity,
+            )
+            .values(rolled_off=True, version=Egg.version + 1)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if flagged:
+            quantity = lot.avalibleQuantity
+            apply_stock_delta(db, stock_key(lot), -quantity, -quantity * lot.entryPrice)
+            rolled += 1
+    db.commit()
+    return rolled
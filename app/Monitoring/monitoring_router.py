@@ -0,0 +1,176 @@
+"""Router exposing runtime statistics to administrators."""
+
+from typing import Dict, List
+from fastapi import APIRouter, Depends, Query, Request, status
+from sqlalchemy.orm import Session
+
+from app.Auth.auth_service import require_admin
+from app.db.session import get_db
+from app.Egg.egg_schema import StockReconciliationResponse
+from app.Monitoring.monitoring_schema import (
+    AvailabilityStatsResponse,
+    CacheStatsResponse,
+    PasswordPoolStatsResponse,
+    PoolStatsResponse,
+    ReservationReaperStatsResponse,
+    RevocationStatsResponse,
+    SlowQueryResponse,
+    SqlRouteStatsResponse,
+    StartupStatsResponse,
+)
+from app.Monitoring.monitoring_service import (
+    check_stock_serv,
+    get_availability_stats_serv,
+    get_cache_stats_serv,
+    get_password_pool_stats_serv,
+    get_pool_stats_serv,
+    get_reservation_stats_serv,
+    get_revocation_stats_serv,
+    get_slow_queries_serv,
+    get_sql_stats_serv,
+    reset_sql_stats_serv,
+)
+
+router = APIRouter(dependencies=[Depends(require_admin)])
+
+
+@router.get("/pool", response_model=PoolStatsResponse)
+def get_pool_stats_route():
+    """
+    Retrieve the connection pool statistics of the worker serving the request.
+
+    Statistics are kept per process, so each gunicorn worker reports its own pool.
+
+    Returns:
+        PoolStatsResponse: Occupancy, overflow, wait time and checkout latency.
+    """
+    return get_pool_stats_serv()
+
+
+@router.get("/startup", response_model=StartupStatsResponse)
+def get_startup_stats_route(request: Request):
+    """
+    Retrieve the cold-start timings of the worker serving the request.
+
+    ``import_ms`` covers importing the application modules, ``ready_ms`` the
+    time from the first import until the startup hooks finished, and
+    ``first_request_ms`` the latency of the first request this worker served.
+
+    Returns:
+        StartupStatsResponse: The boot timings of this worker.
+    """
+    return request.app.state.timings
+
+
+@router.get("/sql", response_model=List[SqlRouteStatsResponse])
+def get_sql_stats_route():
+    """
+    Retrieve the query statistics of every route served by this worker.
+
+    Routes are sorted by total database time. ``n_plus_one_statements`` lists
+    the statement shapes a single request repeated often enough to suggest a
+    lazy load per row.
+
+    Returns:
+        List[SqlRouteStatsResponse]: Query count, DB time and N+1 hints per route.
+    """
+    return get_sql_stats_serv()
+
+
+@router.delete("/sql", status_code=status.HTTP_204_NO_CONTENT)
+def reset_sql_stats_route():
+    """Clear the query statistics of the worker serving the request."""
+    reset_sql_stats_serv()
+
+
+@router.get("/slow-queries", response_model=List[SlowQueryResponse])
+def get_slow_queries_route(limit: int = Query(50, ge=1, le=1000)):
+    """
+    Retrieve the most recent entries of the slow query log, newest first.
+
+    Entries hold the statement, its bound parameters, the route that ran it
+    and, for SELECT statements, the EXPLAIN plan.
+
+    Args:
+        limit (int): Maximum number of entries to return.
+
+    Returns:
+        List[SlowQueryResponse]: The logged slow statements.
+    """
+    return get_slow_queries_serv(limit)
+
+
+@router.get("/caches", response_model=Dict[str, CacheStatsResponse])
+def get_cache_stats_route():
+    """
+    Retrieve the size and hit rate of the in-process caches of this worker.
+
+    Returns:
+        Dict[str, CacheStatsResponse]: Statistics keyed by cache name.
+    """
+    return get_cache_stats_serv()
+
+
+@router.get("/password-pool", response_model=PasswordPoolStatsResponse)
+def get_password_pool_stats_route():
+    """
+    Retrieve the queue depth of the bcrypt process pool of this worker.
+
+    Returns:
+        PasswordPoolStatsResponse: Pool size, pending operations and rejections.
+    """
+    return get_password_pool_stats_serv()
+
+
+@router.get("/revocations", response_model=RevocationStatsResponse)
+def get_revocation_stats_route():
+    """
+    Retrieve the revoked token filter statistics of this worker.
+
+    ``checks`` counts revocation checks and ``confirmations`` the ones that hit
+    the filter and needed a query.
+
+    Returns:
+        RevocationStatsResponse: Filter size, revoked IDs and query counters.
+    """
+    return get_revocation_stats_serv()
+
+
+@router.get("/reservations", response_model=ReservationReaperStatsResponse)
+def get_reservation_stats_route():
+    """
+    Retrieve the activity of the reservation reaper of this worker.
+
+    Returns:
+        ReservationReaperStatsResponse: Passes made, reservations released,
+        expired lots rolled off and failed passes.
+    """
+    return get_reservation_stats_serv()
+
+
+@router.get("/availability", response_model=AvailabilityStatsResponse)
+def get_availability_stats_route():
+    """
+    Retrieve the username and email filter statistics of this worker.
+
+    ``lookups`` counts the availability checks that hit a filter and needed a
+    query.
+
+    Returns:
+        AvailabilityStatsResponse: Filter size, checks and lookups.
+    """
+    return get_availability_stats_serv()
+
+
+@router.get("/stock", response_model=StockReconciliationResponse)
+def check_stock_route(db: Session = Depends(get_db)):
+    """
+    Compare the stock summary with the egg lots.
+
+    This scans the egg table; repairs are made with
+    ``python -m app.Egg.stock_reconcile --repair``.
+
+    Returns:
+        StockReconciliationResponse: The entries that disagree, if any.
+    """
+    return check_stock_serv(db)
@@ -0,0 +1,135 @@
+"""Pydantic schemas for the runtime monitoring endpoints."""
+
+# pylint: disable=too-few-public-methods
+
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel
+
+
+class HistogramResponse(BaseModel):
+    """Latency histogram in milliseconds."""
+
+    count: int
+    total_ms: float
+    avg_ms: float
+    max_ms: float
+    buckets: Dict[str, int]
+
+
+class PoolStatsResponse(BaseModel):
+    """Live state of the connection pool of the worker answering the request."""
+
+    pool_class: str
+    worker_pid: int
+    size: Optional[int] = None
+    checked_in: Optional[int] = None
+    checked_out: Optional[int] = None
+    overflow: Optional[int] = None
+    timeout: Optional[float] = None
+    peak_checked_out: Optional[int] = None
+    connects: Optional[int] = None
+    invalidations: Optional[int] = None
+    timeouts: Optional[int] = None
+    wait_ms: Optional[HistogramResponse] = None
+    checkout_ms: Optional[HistogramResponse] = None
+    held_ms: Optional[HistogramResponse] = None
+
+
+class StartupStatsResponse(BaseModel):
+    """Boot timings of the worker answering the request, in milliseconds."""
+
+    worker_pid: int
+    import_ms: float
+    create_app_ms: float
+    startup_ms: Optional[float] = None
+    ready_ms: Optional[float] = None
+    first_request_ms: Optional[float] = None
+
+
+class SqlRouteStatsResponse(BaseModel):
+    """Statements executed by one route, aggregated over its requests."""
+
+    route: str
+    requests: int
+    queries: int
+    avg_queries: float
+    max_queries: int
+    db_ms: float
+    avg_db_ms: float
+    slowest_ms: float
+    slowest_statement: Optional[str] = None
+    n_plus_one_requests: int
+    n_plus_one_statements: List[str]
+
+
+class SlowQueryResponse(BaseModel):
+    """One entry of the slow query log."""
+
+    timestamp: str
+    worker_pid: int
+    route: Optional[str] = None
+    duration_ms: float
+    statement: str
+    parameters: Any = None
+    explain: Optional[List[Dict[str, Any]]] = None
+
+
+class CacheStatsResponse(BaseModel):
+    """Size and hit statistics of a per-worker cache."""
+
+    size: int
+    maxsize: int
+    ttl: float
+    hits: int
+    misses: int
+    hit_rate: float
+    evictions: int
+    expirations: int
+
+
+class PasswordPoolStatsResponse(BaseModel):
+    """Queue depth and counters of the bcrypt process pool."""
+
+    workers: int
+    max_pending: int
+    rounds: Optional[int] = None
+    pending: int
+    completed: int
+    rejected: int
+
+
+class ReservationReaperStatsResponse(BaseModel):
+    """Activity of the reservation reaper of this worker."""
+
+    interval: float
+    batch_size: int
+    running: bool
+    passes: int
+    released: int
+    rolled_off: int = 0
+    errors: int
+    last_pass_ms: Optional[float] = None
+
+
+class RevocationStatsResponse(BaseModel):
+    """Size of the revoked token filter and how often it needed the table."""
+
+    revoked: int
+    capacity: int
+    filter_bits: int
+    hash_functions: int
+    checks: int
+    confirmations: int
+    syncs: int
+    last_id: int
+
+
+class AvailabilityStatsResponse(BaseModel):
+    """Size of the username and email filters and how often they needed a query."""
+
+    users: int
+    capacity: int
+    checks: int
+    lookups: int
+    rebuilds: int
+    last_id: int
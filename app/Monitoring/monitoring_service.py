@@ -0,0 +1,62 @@
+"""Service layer exposing runtime statistics of the current worker."""
+
+from app.Auth.auth_service import principal_cache, token_cache
+from app.Auth.password_pool import password_pool
+from app.Auth.token_revocation import revocation_list
+from app.db.database import get_engine
+from app.Egg.stock_reconcile import reconcile_stock
+from app.Reservation.reservation_reaper import reservation_reaper
+from app.User.user_availability import availability_filter
+from app.db.instrumentation import route_stats
+from app.db.slow_query_log import slow_query_log
+from app.db.pool import pool_status
+
+
+def get_pool_stats_serv():
+    """Service to describe the connection pool of this worker."""
+    return pool_status(get_engine())
+
+
+def get_sql_stats_serv():
+    """Service to list the query statistics of every route served by this worker."""
+    return route_stats.snapshot()
+
+
+def reset_sql_stats_serv():
+    """Service to clear the query statistics of this worker."""
+    route_stats.reset()
+
+
+def get_slow_queries_serv(limit: int):
+    """Service to read the most recent entries of the slow query log."""
+    return slow_query_log.tail(limit)
+
+
+def get_cache_stats_serv():
+    """Service to describe the in-process caches of this worker."""
+    return {"principal": principal_cache.stats(), "token": token_cache.stats()}
+
+
+def get_password_pool_stats_serv():
+    """Service to describe the bcrypt process pool of this worker."""
+    return password_pool.stats()
+
+
+def get_revocation_stats_serv():
+    """Service to describe the revoked token filter of this worker."""
+    return revocation_list.stats()
+
+
+def get_reservation_stats_serv():
+    """Service to describe the reservation reaper of this worker."""
+    return reservation_reaper.stats()
+
+
+def get_availability_stats_serv():
+    """Service to describe the username and email filters of this worker."""
+    return availability_filter.stats()
+
+
+def check_stock_serv(db):
+    """Service to compare the stock summary with the egg lots, without repairing."""
+    return reconcile_stock(db)
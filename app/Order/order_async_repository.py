@@ -0,0 +1,66 @@
+"""Async repository module for Order read operations."""
+
+from datetime import datetime
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.loading import response_options
+from app.Order.order_model import Order
+from app.Order.order_schema import OrderResponse
+
+
+async def read_orders(db: AsyncSession):
+    """Get all orders from the database.
+    Args:
+        db (AsyncSession): The async database session.
+    Returns:
+        List[Order]: A list of all orders.
+    """
+    result = await db.execute(
+        select(Order).options(*response_options(Order, OrderResponse))
+    )
+    return result.scalars().all()
+
+
+async def read_order(order_id: int, db: AsyncSession):
+    """Get a specific order by ID from the database.
+    Args:
+        order_id (int): The ID of the order to retrieve.
+        db (AsyncSession): The async database session.
+    Returns:
+        Order: The order with the specified ID.
+    Raises:
+        HTTPException: If the order is not found.
+    """
+    result = await db.execute(
+        select(Order)
+        .options(*response_options(Order, OrderResponse))
+        .where(Order.id == order_id)
+    )
+    order = result.scalars().first()
+    if order is None:
+        raise HTTPException(status_code=404, detail="Order not found")
+    return order
+
+
+async def read_orders_by_month(db: AsyncSession, year: int, month: int):
+    """Get all orders in a specific month, with the user serialised by OrderResponse.
+    Args:
+        db (AsyncSession): The async database session.
+        year (int): The year of the month to filter.
+        month (int): The month to filter.
+    Returns:
+        List[Order]: A list of orders in the specified month.
+    """
+    start_date = datetime(year, month, 1)
+    if month == 12:
+        end_date = datetime(year + 1, 1, 1)
+    else:
+        end_date = datetime(year, month + 1, 1)
+
+    result = await db.execute(
+        select(Order)
+        .options(*response_options(Order, OrderResponse))
+        .where(Order.orderDate >= start_date, Order.orderDate < end_date)
+    )
+    return result.scalars().all()
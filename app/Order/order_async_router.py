@@ -0,0 +1,59 @@
+"""Async router module for Order read endpoints, mounted when DB_MODE is "async"."""
+
+from typing import List
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.Order.order_schema import OrderResponse
+from app.Order.order_async_service import (
+    get_orders_by_month_serv,
+    read_order_serv,
+    read_orders_serv,
+)
+from app.db.session import get_async_db
+
+router = APIRouter()
+
+
+@router.get("/{order_id}")
+async def get_order_route(order_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Retrieve order details by order ID.
+
+    Args:
+        order_id (int): The unique identifier of the order to retrieve.
+        db (AsyncSession, optional): The async database session dependency.
+
+    Returns:
+        dict: The details of the requested order.
+    """
+    return await read_order_serv(order_id, db)
+
+
+@router.get("/")
+async def read_orders_route(db: AsyncSession = Depends(get_async_db)):
+    """
+    Handles the HTTP GET request to retrieve every order.
+
+    Args:
+        db (AsyncSession): Async database session dependency.
+
+    Returns:
+        The orders stored in the database.
+    """
+    return await read_orders_serv(db)
+
+
+@router.get("/search/totalOrdersMonth", response_model=List[OrderResponse])
+async def total_orders_by_month_route(
+    year: int, month: int, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Retrieves the orders placed in a specific month.
+    Args:
+        year (int): The year for which to retrieve the orders.
+        month (int): The month for which to retrieve the orders.
+        db (AsyncSession, optional): The async database session dependency.
+    Returns:
+        List[OrderResponse]: The orders placed in the specified month.
+    """
+    return await get_orders_by_month_serv(year, month, db)
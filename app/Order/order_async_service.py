@@ -0,0 +1,23 @@
+"""Async service module for Order read operations."""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.Order.order_async_repository import (
+    read_order,
+    read_orders,
+    read_orders_by_month,
+)
+
+
+async def read_orders_serv(db: AsyncSession):
+    """Retrieve all orders from the database."""
+    return await read_orders(db)
+
+
+async def read_order_serv(order_id: int, db: AsyncSession):
+    """Retrieve a single order by ID, or raise 404 if not found."""
+    return await read_order(order_id, db)
+
+
+async def get_orders_by_month_serv(year: int, month: int, db: AsyncSession):
+    """Get all orders in a specific month."""
+    return await read_orders_by_month(db, year, month)
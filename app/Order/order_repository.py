@@ -1,10 +1,13 @@
 """Repository module for Order operations."""
 
+from datetime import datetime
 from fastapi import HTTPException
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
-from datetime import datetime
-from app.Order.order_schema import OrderCreate
+from app.db.loading import response_options
+from app.Order.order_schema import OrderCreate, OrderResponse
 from app.Order.order_model import Order
+from app.OrderEgg.order_egg_model import OrderEgg
 
 
 def create_order(order: OrderCreate, db: Session):
@@ -22,6 +25,26 @@ def create_order(order: OrderCreate, db: Session):
     return db_order
 
 
+def insert_order_with_lines(db: Session, values: dict, lines: list) -> Order:
+    """Insert an order and its lines without committing.
+
+    The order is flushed to get its id, then every line is inserted with a
+    single executemany.
+    Args:
+        values (dict): Columns of the order.
+        lines (list[dict]): egg_id, quantity, unit_price and sub_total of
+        each line.
+        db (Session): The database session of the ongoing transaction.
+    Returns:
+        Order: The new order.
+    """
+    db_order = Order(**values)
+    db.add(db_order)
+    db.flush()
+    db.execute(insert(OrderEgg), [{**line, "order_id": db_order.id} for line in lines])
+    return db_order
+
+
 def read_orders(db: Session):
     """Get all orders from the database.
     Args:
@@ -29,7 +52,7 @@ def read_orders(db: Session):
     Returns:
         List[Order]: A list of all orders.
     """
-    orders = db.query(Order).all()
+    orders = db.query(Order).options(*response_options(Order, OrderResponse)).all()
     return orders
 
 
@@ -43,14 +66,19 @@ def read_order(order_id: int, db: Session):
     Raises:
         HTTPException: If the order is not found.
     """
-    order = db.query(Order).filter(Order.id == order_id).first()
+    order = (
+        db.query(Order)
+        .options(*response_options(Order, OrderResponse))
+        .filter(Order.id == order_id)
+        .first()
+    )
     if order is None:
         raise HTTPException(status_code=404, detail="Order not found")
     return order
 
 
 def delete_order(order_id: int, db: Session):
-    """Delete a specific order by ID from the database.
+    """Delete a specific order by ID in the ongoing transaction.
     Args:
         order_id (int): The ID of the order to delete.
         db (Session): The database session.
@@ -63,7 +91,6 @@ def delete_order(order_id: int, db: Session):
     if order is None:
         raise HTTPException(status_code=404, detail="Order not found")
     db.delete(order)
-    db.commit()
     return {"message": "Order deleted successfully"}
 
 
@@ -107,6 +134,7 @@ def read_orders_by_month(db: Session, year: int, month: int) -> float:
 
     return (
         db.query(Order)
+        .options(*response_options(Order, OrderResponse))
         .filter(Order.orderDate >= start_date, Order.orderDate < end_date)
         .all()
     )
\ No newline at end of file
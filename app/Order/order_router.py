@@ -3,9 +3,15 @@
 from typing import List
 from pytest import Session
 from fastapi import APIRouter, Depends
-from app.Order.order_schema import OrderCreate, OrderResponse
+from app.Order.order_schema import (
+    OrderCreate,
+    OrderPlace,
+    OrderResponse,
+    PlacedOrderResponse,
+)
 from app.Order.order_service import (
     create_order_serv,
+    place_order_serv,
     read_order_serv,
     delete_order_serv,
     read_orders_serv,
@@ -36,6 +42,25 @@ def create_order_route(order: OrderCreate, db: Session = Depends(get_db)):
     return create_order_serv(order, db)
 
 
+@router.post("/place", status_code=201, response_model=PlacedOrderResponse)
+def place_order_route(order: OrderPlace, db: Session = Depends(get_db)):
+    """
+    Places an order from a basket of egg lots in one request.
+
+    The lots are validated and decremented, and the order and its lines are
+    created, in a single transaction. Unit prices, sub totals and the total
+    price are computed by the server.
+
+    Args:
+        order (OrderPlace): The customer, the order state and the basket.
+        db (Session, optional): The database session dependency.
+
+    Returns:
+        PlacedOrderResponse: The new order with its lines.
+    """
+    return place_order_serv(order, db)
+
+
 @router.get("/{order_id}")
 def get_order_route(order_id: int, db: Session = Depends(get_db)):
     """
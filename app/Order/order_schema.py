@@ -3,7 +3,7 @@
 # pylint: disable=too-few-public-methods
 
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from pydantic import BaseModel
 from app.User.user_schema import UserResponse
 
@@ -33,3 +33,42 @@ class OrderResponse(OrderBase):
         """Configuration for Pydantic model."""
 
         from_attributes = True
+
+
+class BasketLine(BaseModel):
+    """One egg lot and the quantity wanted from it."""
+
+    egg_id: int
+    quantity: int
+
+
+class OrderPlace(BaseModel):
+    """Schema for placing an order from a basket in one request.
+
+    Prices are taken from the egg lots; clients do not send totals.
+    """
+
+    user_id: int
+    state: str = "pending"
+    lines: List[BasketLine]
+
+
+class PlacedOrderLineResponse(BaseModel):
+    """Schema for a line of a placed order, priced by the server."""
+
+    id: int
+    egg_id: int
+    quantity: int
+    unit_price: float
+    sub_total: float
+
+    class Config:
+        """Configuration for Pydantic model."""
+
+        from_attributes = True
+
+
+class PlacedOrderResponse(OrderResponse):
+    """Schema for a placed order and its lines."""
+
+    order_eggs: List[PlacedOrderLineResponse] = []
@@ -5,15 +5,20 @@
 from datetime import datetime
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
+from app.db.retry import run_transaction
+from app.Egg.egg_allocation import read_lots, return_to_lot, take_from_lot
 from app.Order.order_repository import (
     create_order,
+    insert_order_with_lines,
     delete_order,
     read_order,
     read_orders,
     update_order,
     read_orders_by_month,
 )
-from app.Order.order_schema import OrderCreate
+from app.Order.order_schema import OrderCreate, OrderPlace
+from app.OrderEgg.order_egg_repository import delete_order_lines
+from app.Reservation.reservation_repository import delete_order_reservations
 from app.User.user_model import User
 
 
@@ -41,6 +46,82 @@ def create_order_serv(order: OrderCreate, db: Session):
     return create_order(order, db)
 
 
+def _basket_quantities(order: OrderPlace) -> dict:
+    """Validate the basket and merge repeated lots into ``{egg_id: quantity}``."""
+    if not order.lines:
+        raise HTTPException(status_code=400, detail="The basket is empty")
+    if not order.state.strip():
+        raise HTTPException(status_code=400, detail="Order is required")
+    quantities = {}
+    for line in order.lines:
+        if line.quantity <= 0:
+            raise HTTPException(
+                status_code=400, detail="Quantity must be greater than 0"
+            )
+        quantities[line.egg_id] = quantities.get(line.egg_id, 0) + line.quantity
+    return quantities
+
+
+def _place_order(order: OrderPlace, quantities: dict, db: Session):
+    """Body of the order placement transaction; commits nothing."""
+    lots = read_lots(db, sorted(quantities))
+    missing = sorted(set(quantities) - set(lots))
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Egg not found: {', '.join(map(str, missing))}",
+        )
+    now = datetime.utcnow()
+    lines = []
+    for egg_id, quantity in quantities.items():
+        lot = lots[egg_id]
+        if lot.expirationDate <= now:
+            raise HTTPException(status_code=409, detail=f"Egg {egg_id} has expired")
+        if not take_from_lot(db, lot, quantity):
+            raise HTTPException(
+                status_code=409, detail=f"Not enough stock of egg {egg_id}"
+            )
+        lines.append(
+            {
+                "egg_id": egg_id,
+                "quantity": quantity,
+                "unit_price": lot.sellPrice,
+                "sub_total": quantity * lot.sellPrice,
+            }
+        )
+    return insert_order_with_lines(
+        db,
+        {
+            "user_id": order.user_id,
+            "state": order.state,
+            "totalPrice": sum(line["sub_total"] for line in lines),
+        },
+        lines,
+    )
+
+
+def place_order_serv(order: OrderPlace, db: Session):
+    """
+    Place an order from a basket in a single transaction.
+
+    The lots are read with one query, without row locks, priced at their
+    sell price and decremented together with the stock summary by guarded
+    updates, so a lot emptied by a concurrent order answers 409 rather than
+    overselling; the order and all its lines are inserted before one commit.
+    Any error rolls everything back, and a transaction aborted by a deadlock
+    is rerun.
+
+    Raises:
+        HTTPException: 400 for an empty basket or a non-positive quantity,
+        404 for an unknown user or egg lot, 409 for an expired lot or one
+        without enough eggs.
+    """
+    quantities = _basket_quantities(order)
+    if db.query(User.id).filter(User.id == order.user_id).first() is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return run_transaction(db, lambda: _place_order(order, quantities, db))
+
+
 def update_order_serv(order_id: int, order_update: OrderCreate, db: Session):
     """Update an existing order after validating that user exists."""
     existing_order = read_order(order_id, db)
@@ -63,8 +144,24 @@ def update_order_serv(order_id: int, order_update: OrderCreate, db: Session):
 
 
 def delete_order_serv(order_id: int, db: Session):
-    """Delete an order by ID, or raise 404 if not found."""
-    return delete_order(order_id, db)
+    """
+    Delete an order by ID, or raise 404 if not found.
+
+    Its lines and reservations are deleted with it and their eggs go back to
+    the lots, in one transaction.
+    """
+    read_order(order_id, db)
+
+    def delete():
+        returned = {}
+        held = delete_order_lines(order_id, db) + delete_order_reservations(db, order_id)
+        for line in held:
+            returned[line.egg_id] = returned.get(line.egg_id, 0) + line.quantity
+        for egg_id in sorted(returned):
+            return_to_lot(db, egg_id, returned[egg_id])
+        return delete_order(order_id, db)
+
+    return run_transaction(db, delete)
 
 
 def get_orders_by_month_serv(year: int, month: int, db: Session):
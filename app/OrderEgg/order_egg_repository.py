@@ -1,7 +1,9 @@
 """Repository module for OrderEgg operations."""
 
+from sqlalchemy import delete, func, select, update
 from sqlalchemy.orm import Session
 from fastapi import Depends, HTTPException
+from app.Order.order_model import Order
 from app.OrderEgg.order_egg_model import OrderEgg
 from app.OrderEgg.order_egg_schema import OrderEggCreate
 from app.db.session import get_db
@@ -9,7 +11,10 @@ from app.db.session import get_db
 
 def create_order_egg(order_egg: OrderEggCreate, db: Session):
     """
-    Creates a new order egg record in the database.
+    Adds a new order egg record to the ongoing transaction and flushes it.
+
+    Nothing is committed: the line belongs to the transaction taking its eggs
+    from the lot.
 
     Args:
         order_egg (OrderEggCreate): The data required to create a new order egg.
@@ -20,11 +25,47 @@ def create_order_egg(order_egg: OrderEggCreate, db: Session):
     """
     db_order_egg = OrderEgg(**order_egg.model_dump())
     db.add(db_order_egg)
-    db.commit()
-    db.refresh(db_order_egg)
+    db.flush()
     return db_order_egg
 
 
+def add_allocated_lines(db: Session, order, allocations: list) -> list:
+    """
+    Adds one order line per allocated lot and their total to the order.
+
+    Nothing is committed: the lines belong to the allocation's transaction.
+
+    Args:
+        db (Session): Database session of the ongoing transaction.
+        order (Order): The order receiving the lines.
+        allocations (list[LotAllocation]): Lots and quantities taken.
+
+    Returns:
+        list[OrderEgg]: The new order lines.
+    """
+    lines = [
+        OrderEgg(
+            order_id=order.id,
+            egg_id=allocation.egg_id,
+            quantity=allocation.quantity,
+            unit_price=allocation.unit_price,
+            sub_total=allocation.quantity * allocation.unit_price,
+        )
+        for allocation in allocations
+    ]
+    db.add_all(lines)
+    total = sum(line.sub_total for line in lines)
+    # added in SQL so concurrent allocations to one order do not lose lines
+    db.execute(
+        update(Order)
+        .where(Order.id == order.id)
+        .values(totalPrice=func.coalesce(Order.totalPrice, 0) + total)
+        .execution_options(synchronize_session=False)
+    )
+    db.expire(order, ["totalPrice"])
+    return lines
+
+
 def read_order_eggs(db: Session = Depends(get_db)):
     """
     Fetches all OrderEgg records from the database.
@@ -59,33 +100,87 @@ def read_order_egg(order_egg_id: int, db: Session = Depends(get_db)):
     return order_egg
 
 
+def _read_line_stock(order_egg_id: int, db: Session):
+    """The lot and quantity of an order line, or raise 404."""
+    line = db.execute(
+        select(OrderEgg.egg_id, OrderEgg.quantity).where(OrderEgg.id == order_egg_id)
+    ).first()
+    if line is None:
+        raise HTTPException(status_code=404, detail="OrderEgg not found")
+    return line
+
+
+def _line_changed():
+    return HTTPException(status_code=409, detail="OrderEgg was changed, read it again")
+
+
 def delete_order_egg(order_egg_id: int, db: Session = Depends(get_db)):
     """
-    Deletes an OrderEgg record from the database based on the provided order_egg_id.
+    Deletes an OrderEgg record in the ongoing transaction.
+
+    The DELETE only matches the lot and quantity that were read, so the eggs
+    handed back to the lot are exactly the ones the line held.
 
     Args:
         order_egg_id (int): The ID of the OrderEgg to be deleted.
         db (Session): The database session dependency.
 
     Raises:
-        HTTPException: If the OrderEgg with the given ID is not found, a 404 error is raised.
+        HTTPException: 404 if the OrderEgg is not found, 409 if it changed
+        since it was read.
 
     Returns:
-        model_dump: A model_dumpionary containing a success message indicating the OrderEgg was deleted.
+        Row: The ``egg_id`` and ``quantity`` of the deleted line.
     """
-    order_egg = db.query(OrderEgg).filter(OrderEgg.id == order_egg_id).first()
-    if order_egg is None:
-        raise HTTPException(status_code=404, detail="OrderEgg not found")
-    db.delete(order_egg)
-    db.commit()
-    return {"message": "Order_egg deleted successfully"}
+    line = _read_line_stock(order_egg_id, db)
+    deleted = db.execute(
+        delete(OrderEgg)
+        .where(
+            OrderEgg.id == order_egg_id,
+            OrderEgg.egg_id == line.egg_id,
+            OrderEgg.quantity == line.quantity,
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not deleted:
+        raise _line_changed()
+    return line
+
+
+def delete_order_lines(order_id: int, db: Session) -> list:
+    """
+    Deletes every line of an order in the ongoing transaction.
+
+    Args:
+        order_id (int): The order whose lines are deleted.
+        db (Session): The database session.
+
+    Raises:
+        HTTPException: 409 if the lines changed since they were read.
+
+    Returns:
+        list[Row]: The ``egg_id`` and ``quantity`` of each deleted line.
+    """
+    lines = db.execute(
+        select(OrderEgg.egg_id, OrderEgg.quantity).where(OrderEgg.order_id == order_id)
+    ).all()
+    deleted = db.execute(
+        delete(OrderEgg)
+        .where(OrderEgg.order_id == order_id)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if deleted != len(lines):
+        raise _line_changed()
+    return lines
 
 
 def update_order_egg(
     order_egg_id: int, order_egg_update: OrderEggCreate, db: Session = Depends(get_db)
 ):
     """
-    Updates an existing OrderEgg record in the database.
+    Updates an existing OrderEgg record in the ongoing transaction.
+
+    Like a delete, the UPDATE only matches the lot and quantity that were read.
 
     Args:
         order_egg_id (int): The ID of the OrderEgg to update.
@@ -93,18 +188,23 @@ def update_order_egg(
         db (Session): The database session dependency.
 
     Returns:
-        OrderEgg: The updated OrderEgg object.
+        Row: The ``egg_id`` and ``quantity`` the line held before.
 
     Raises:
-        HTTPException: If the OrderEgg with the given ID is not found, raises a 404 error.
+        HTTPException: 404 if the OrderEgg is not found, 409 if it changed
+        since it was read.
     """
-    order_egg = db.query(OrderEgg).filter(OrderEgg.id == order_egg_id).first()
-    if order_egg is None:
-        raise HTTPException(status_code=404, detail="OrderEgg not found")
-
-    for key, value in order_egg_update.model_dump(exclude_unset=True).items():
-        setattr(order_egg, key, value)
-
-    db.commit()
-    db.refresh(order_egg)
-    return order_egg
+    line = _read_line_stock(order_egg_id, db)
+    updated = db.execute(
+        update(OrderEgg)
+        .where(
+            OrderEgg.id == order_egg_id,
+            OrderEgg.egg_id == line.egg_id,
+            OrderEgg.quantity == line.quantity,
+        )
+        .values(**order_egg_update.model_dump(exclude_unset=True))
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if not updated:
+        raise _line_changed()
+    return line
@@ -1,9 +1,15 @@
 """Router module for OrderEgg endpoints."""
 
+from typing import List
 from fastapi import APIRouter, Depends
 from pytest import Session
-from app.OrderEgg.order_egg_schema import OrderEggCreate, OrderEggResponse
+from app.OrderEgg.order_egg_schema import (
+    OrderEggCreate,
+    OrderEggResponse,
+    OrderLineAllocationRequest,
+)
 from app.OrderEgg.order_egg_service import (
+    allocate_order_line_serv,
     create_order_egg_serv,
     delete_order_egg_serv,
     read_order_egg_serv,
@@ -32,6 +38,27 @@ def create_order_egg_route(order_egg: OrderEggCreate, db: Session = Depends(get_
     return create_order_egg_serv(order_egg, db)
 
 
+@router.post("/allocate", status_code=201, response_model=List[OrderEggResponse])
+def allocate_order_line_route(
+    request: OrderLineAllocationRequest, db: Session = Depends(get_db)
+):
+    """
+    Adds eggs of one type to an order from the lots that expire first.
+
+    The requested quantity is split across as many lots as needed; each lot
+    used becomes one order line at its sell price and is decremented.
+
+    Args:
+        request (OrderLineAllocationRequest): Order, egg type, quantity and
+        optional color.
+        db (Session, optional): The database session dependency.
+
+    Returns:
+        List[OrderEggResponse]: One order line per lot used.
+    """
+    return allocate_order_line_serv(request, db)
+
+
 @router.get("/{order_egg_id}")
 def get_order_egg_route(order_egg_id: int, db: Session = Depends(get_db)):
     """
@@ -32,4 +32,11 @@ class OrderEggResponse(OrderEggBase):
 
         from_attributes = True
 
-        
+
+class OrderLineAllocationRequest(BaseModel):
+    """Eggs of one type to add to an order from the lots that expire first."""
+
+    order_id: int
+    type_egg_id: int
+    quantity: int
+    color: Optional[str] = None
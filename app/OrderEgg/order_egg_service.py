@@ -2,16 +2,20 @@
 
 # pylint: disable=no-name-in-module
 
+from datetime import datetime
 from sqlalchemy.orm import Session
 from fastapi import Depends, HTTPException
+from app.db.retry import run_transaction
+from app.Egg.egg_allocation import allocate_fefo, read_lots, return_to_lot, take_from_lot
 from app.OrderEgg.order_egg_repository import (
+    add_allocated_lines,
     read_order_eggs,
     read_order_egg,
     create_order_egg,
     update_order_egg,
     delete_order_egg,
 )
-from app.OrderEgg.order_egg_schema import OrderEggCreate
+from app.OrderEgg.order_egg_schema import OrderEggCreate, OrderLineAllocationRequest
 from app.db.session import get_db
 from app.Order.order_model import Order
 from app.Egg.egg_model import Egg
@@ -27,8 +31,7 @@ def read_order_egg_serv(order_egg_id: int, db: Session = Depends(get_db)):
     return read_order_egg(order_egg_id, db)
 
 
-def create_order_egg_serv(order_egg: OrderEggCreate, db: Session = Depends(get_db)):
-    """Create a new order egg after validating that user and order exist."""
+def _validate_line(order_egg: OrderEggCreate):
     if order_egg.quantity <= 0:
         raise HTTPException(
             status_code=400, detail="the amount of has to be greater than or equal to 0"
@@ -41,31 +44,95 @@ def create_order_egg_serv(order_egg: OrderEggCreate, db: Session = Depends(get_d
         raise HTTPException(
             status_code=400, detail=" the sub total must be greater than 0"
         )
-    return create_order_egg(order_egg, db)
+
+
+def _take_eggs(db: Session, egg_id: int, quantity: int):
+    """Take the eggs of a line from its lot, or raise 404/409."""
+    lot = read_lots(db, [egg_id]).get(egg_id)
+    if lot is None:
+        raise HTTPException(status_code=404, detail="Egg not found")
+    if lot.expirationDate <= datetime.utcnow():
+        raise HTTPException(status_code=409, detail=f"Egg {egg_id} has expired")
+    if not take_from_lot(db, lot, quantity):
+        raise HTTPException(status_code=409, detail=f"Not enough stock of egg {egg_id}")
+
+
+def create_order_egg_serv(order_egg: OrderEggCreate, db: Session = Depends(get_db)):
+    """
+    Create a new order egg, taking its eggs from the lot in the same transaction.
+
+    Raises:
+        HTTPException: 400 for invalid amounts, 404 for an unknown lot, 409 for
+        an expired lot or one without enough eggs.
+    """
+    _validate_line(order_egg)
+
+    def create():
+        _take_eggs(db, order_egg.egg_id, order_egg.quantity)
+        return create_order_egg(order_egg, db)
+
+    line = run_transaction(db, create)
+    db.refresh(line)
+    return line
 
 
 def update_order_egg_serv(
     order_egg_id: int, order_egg_update: OrderEggCreate, db: Session = Depends(get_db)
 ):
-    """Update an existing order egg after validating that user and order exist."""
-    existing_order_egg = read_order_egg(order_egg_id, db)
-    if not existing_order_egg:
-        raise HTTPException(status_code=404, detail="OrderEgg not found")
-    if existing_order_egg.quantity <= 0:
-        raise HTTPException(
-            status_code=400, detail="the amount of has to be greater than or equal to 0"
-        )
-    if existing_order_egg.unit_price <=  0:
-        raise HTTPException(
-            status_code=400, detail=" the unit price must be greater than 0"
-        )
-    if existing_order_egg.sub_total <=  0:
-        raise HTTPException(
-            status_code=400, detail=" the sub total must be greater than 0"
-        )
-    return update_order_egg(order_egg_id, order_egg_update, db)
+    """
+    Update an existing order egg and move the stock it holds accordingly.
+
+    The eggs the line held go back to their lot and the new quantity is taken
+    from the new lot, all in one transaction.
+    """
+    _validate_line(order_egg_update)
+
+    def update():
+        previous = update_order_egg(order_egg_id, order_egg_update, db)
+        return_to_lot(db, previous.egg_id, previous.quantity)
+        _take_eggs(db, order_egg_update.egg_id, order_egg_update.quantity)
+
+    run_transaction(db, update)
+    line = read_order_egg(order_egg_id, db)
+    db.refresh(line)
+    return line
 
 
 def delete_order_egg_serv(order_egg_id: int, db: Session = Depends(get_db)):
-    """Delete an order egg by ID, or raise 404 if not found."""
-    return delete_order_egg(order_egg_id, db)
+    """Delete an order egg by ID and give its eggs back, or raise 404 if not found."""
+
+    def delete():
+        line = delete_order_egg(order_egg_id, db)
+        return_to_lot(db, line.egg_id, line.quantity)
+
+    run_transaction(db, delete)
+    return {"message": "Order_egg deleted successfully"}
+
+
+def allocate_order_line_serv(request: OrderLineAllocationRequest, db: Session):
+    """
+    Add eggs of one type to an order, split across lots first-expiry-first-out.
+
+    The lots are decremented and the lines created in one transaction, rerun
+    if a deadlock aborts it.
+
+    Raises:
+        HTTPException: 400 for a non-positive quantity, 404 if the order does
+        not exist, 409 if there is not enough unexpired stock.
+    """
+    if request.quantity <= 0:
+        raise HTTPException(status_code=400, detail="Quantity must be greater than 0")
+    order = db.query(Order).filter(Order.id == request.order_id).first()
+    if order is None:
+        raise HTTPException(status_code=404, detail="Order not found")
+
+    def allocate():
+        allocations = allocate_fefo(
+            db, request.type_egg_id, request.quantity, request.color
+        )
+        return add_allocated_lines(db, order, allocations)
+
+    lines = run_transaction(db, allocate)
+    for line in lines:
+        db.refresh(line)
+    return lines
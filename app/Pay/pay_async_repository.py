@@ -0,0 +1,55 @@
+"""Async repository module for Pay read operations."""
+
+from datetime import datetime
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import HTTPException
+from app.db.loading import response_options
+from app.Pay.pay_model import Pay
+from app.Pay.pay_schema import PayResponse
+
+
+def _pay_response_options():
+    """Eager loads for the user (and roles) serialised by PayResponse."""
+    return response_options(Pay, PayResponse)
+
+
+async def read_pays(db: AsyncSession):
+    """Retrieve all payments from the database."""
+    result = await db.execute(select(Pay).options(*_pay_response_options()))
+    return result.scalars().all()
+
+
+async def read_pay(pay_id: int, db: AsyncSession):
+    """Retrieve a single payment by ID, or raise 404 if not found."""
+    result = await db.execute(
+        select(Pay).options(*_pay_response_options()).where(Pay.id == pay_id)
+    )
+    pay = result.scalars().first()
+    if not pay:
+        raise HTTPException(status_code=404, detail="Payment not found")
+    return pay
+
+
+async def total_earnings_by_month(db: AsyncSession, year: int, month: int) -> float:
+    """Calculate the total earnings for a specific month and year."""
+    start_date = datetime(year, month, 1)
+    if month == 12:
+        end_date = datetime(year + 1, 1, 1)
+    else:
+        end_date = datetime(year, month + 1, 1)
+
+    result = await db.execute(
+        select(func.sum(Pay.amount_paid)).where(  # pylint: disable=not-callable
+            and_(Pay.issueDate >= start_date, Pay.issueDate < end_date)
+        )
+    )
+    return result.scalar() or 0.0
+
+
+async def total_earnings(db: AsyncSession):
+    """Calculate the total earnings of all payments."""
+    result = await db.execute(
+        select(func.sum(Pay.amount_paid))  # pylint: disable=not-callable
+    )
+    return result.scalar() or 0.0
@@ -0,0 +1,54 @@
+"""Async router module for Pay read endpoints, mounted when DB_MODE is "async"."""
+
+from typing import List
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_async_db
+from app.Pay.pay_schema import PayResponse
+from app.Pay.pay_async_service import (
+    get_total_earnings_by_month_serv,
+    get_total_earnings_serv,
+    read_pay_serv,
+    read_pays_serv,
+)
+
+router = APIRouter()
+
+
+@router.get("/{pay_id}", response_model=PayResponse)
+async def get_pay_route(pay_id: int, db: AsyncSession = Depends(get_async_db)):
+    """Get a payment by ID via GET."""
+    return await read_pay_serv(pay_id, db)
+
+
+@router.get("/", response_model=List[PayResponse])
+async def read_pays_route(db: AsyncSession = Depends(get_async_db)):
+    """Get all payments via GET."""
+    return await read_pays_serv(db)
+
+
+@router.get("/earnings/total_earnings")
+async def total_pay_route(db: AsyncSession = Depends(get_async_db)):
+    """Endpoint to retrieve the total earnings."""
+    return await get_total_earnings_serv(db)
+
+
+@router.get("/earnings/total_earnings_month")
+async def total_pay_month_route(
+    year: int, month: int, db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Calculates and returns the total amount paid for a specific month and year.
+
+    Args:
+        year (int): The year for which the total payment is to be calculated.
+        month (int): The month for which the total payment is to be calculated.
+        db (AsyncSession, optional): Async database session dependency.
+
+    Returns:
+        dict: A dictionary containing the total amount paid,
+        the specified year, and the specified month.
+    """
+    total = await get_total_earnings_by_month_serv(year, month, db)
+    return {"Total Pagado": total, "En el año:": year, "Del mes:": month}
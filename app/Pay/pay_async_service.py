@@ -0,0 +1,29 @@
+"""Async service module for Pay read operations."""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.Pay.pay_async_repository import (
+    read_pay,
+    read_pays,
+    total_earnings,
+    total_earnings_by_month,
+)
+
+
+async def read_pays_serv(db: AsyncSession):
+    """Retrieve all payments from the database."""
+    return await read_pays(db)
+
+
+async def read_pay_serv(pay_id: int, db: AsyncSession):
+    """Retrieve a single payment by ID, or raise 404 if not found."""
+    return await read_pay(pay_id, db)
+
+
+async def get_total_earnings_serv(db: AsyncSession):
+    """Get total earnings from all payments."""
+    return await total_earnings(db)
+
+
+async def get_total_earnings_by_month_serv(year: int, month: int, db: AsyncSession):
+    """Get total earnings for a specific month and year."""
+    return await total_earnings_by_month(db, year, month)
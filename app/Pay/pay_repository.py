@@ -4,19 +4,25 @@ from datetime import datetime
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_
 from fastapi import HTTPException
+from app.db.loading import response_options
 from app.Pay.pay_model import Pay
-from app.Pay.pay_schema import PayCreate
+from app.Pay.pay_schema import PayCreate, PayResponse
 from app.User.user_model import User
 
 
 def read_pays(db: Session):
     """Retrieve all payments from the database."""
-    return db.query(Pay).all()
+    return db.query(Pay).options(*response_options(Pay, PayResponse)).all()
 
 
 def read_pay(pay_id: int, db: Session):
     """Retrieve a single payment by ID, or raise 404 if not found."""
-    pay = db.query(Pay).filter(Pay.id == pay_id).first()
+    pay = (
+        db.query(Pay)
+        .options(*response_options(Pay, PayResponse))
+        .filter(Pay.id == pay_id)
+        .first()
+    )
     if not pay:
         raise HTTPException(status_code=404, detail="Payment not found")
     return pay
@@ -3,7 +3,7 @@
 from sqlalchemy.orm import Session
 from fastapi import APIRouter, Depends
 
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.Report.report_schema import (
     ReportCreate,
     ReportResponse,
@@ -32,7 +32,7 @@ def create_report_route(report: ReportCreate, db: Session = Depends(get_db)):
 
 
 @router.get("/{report_id}", response_model=ReportResponse)
-def get_report_route(report_id: int, db: Session = Depends(get_db)):
+def get_report_route(report_id: int, db: Session = Depends(get_read_db)):
     """Retrieves a report by ID."""
     return read_report_serv(report_id, db)
 
@@ -44,7 +44,7 @@ def delete_report_route(report_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/", response_model=list[ReportResponse])
-def read_reports_route(db: Session = Depends(get_db)):
+def read_reports_route(db: Session = Depends(get_read_db)):
     """Retrieves all reports."""
     return read_reports_serv(db)
 
@@ -58,24 +58,24 @@ def update_report_route(
 
 
 @router.get("/bills/staff", response_model=list[BillResponse])
-def get_bills_staff_route(db: Session = Depends(get_db)):
+def get_bills_staff_route(db: Session = Depends(get_read_db)):
     """Returns bills where user is Admin or Employee."""
     return get_staff_bills_serv(db)
 
 
 @router.get("/bills/clients", response_model=list[BillResponse])
-def get_bills_client_route(db: Session = Depends(get_db)):
+def get_bills_client_route(db: Session = Depends(get_read_db)):
     """Returns bills where user is Client."""
     return get_client_bills_serv(db)
 
 
 @router.get("/bills/clients/month-total", response_model=float)
-def get_total_client_bills_route(db: Session = Depends(get_db)):
+def get_total_client_bills_route(db: Session = Depends(get_read_db)):
     """Returns total price of client bills this month."""
     return get_monthly_total_client_bills_serv(db)
 
 
 @router.get("/bills/clients/top-spender", response_model=TopSpenderResponse)
-def get_top_spender_route(db: Session = Depends(get_db)):
+def get_top_spender_route(db: Session = Depends(get_read_db)):
     """Returns the name of the client who spent the most this month."""
     return {"name": get_top_client_this_month_serv(db)}
@@ -0,0 +1,27 @@
+"""SQLAlchemy model for timed stock reservations."""
+
+# pylint: disable=too-few-public-methods
+
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer
+from app.db.database import Base
+
+
+class Reservation(Base):
+    """
+    Eggs of a lot held for an order while its customer pays.
+
+    The eggs are taken from the lot (and the stock summary) when the hold is
+    created, so every stock read already excludes them, and priced at the
+    lot's sell price of that moment. Confirming the order turns the holds into
+    order lines at that price; holds past ``expires_at`` are released
+    back into their lots by the reaper, which walks the expiry index.
+    """
+
+    __tablename__ = "reservation"
+
+    id = Column(Integer, primary_key=True)
+    egg_id = Column(Integer, ForeignKey("egg.id"), nullable=False)
+    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False, index=True)
+    quantity = Column(Integer, nullable=False)
+    unit_price = Column(Float)
+    expires_at = Column(DateTime, nullable=False, index=True)
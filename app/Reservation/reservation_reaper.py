@@ -0,0 +1,120 @@
+"""
+Background release of lapsed reservations.
+
+Each worker runs one reaper task, started and stopped with the application.
+Every ``interval`` seconds it releases lapsed holds in batches of
+``batch_size`` along the expiry index until none is left, so the cost of a
+pass depends on the holds that lapsed, not on how many are active. Several
+workers may reap at once: each batch is claimed by a single DELETE, so the
+eggs of a hold are given back exactly once.
+
+Each pass then rolls the egg lots that expired out of the stock summary (see
+``roll_off_expired_lots``), in batches of the same size.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.db.database import SessionLocal, get_engine
+from app.Egg.stock_summary_repository import roll_off_expired_lots
+from app.Reservation.reservation_service import release_expired_reservations
+
+logger = logging.getLogger(__name__)
+
+
+class ReservationReaper:
+    """
+    Periodic task giving the eggs of lapsed reservations back to their lots
+    and rolling expired lots out of the stock summary.
+    """
+
+    def __init__(self, interval: float = 5, batch_size: int = 500):
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+        self.passes = 0
+        self.released = 0
+        self.rolled_off = 0
+        self.errors = 0
+        self.last_pass_ms: Optional[float] = None
+
+    def configure(self, interval: float, batch_size: int):
+        """Apply new settings; an interval of 0 disables the background task."""
+        self.interval = interval
+        self.batch_size = batch_size
+
+    def reap(self) -> int:
+        """
+        Release every lapsed reservation now, then roll off the expired lots.
+
+        Returns:
+            int: The number of reservations released.
+        """
+        started = time.perf_counter()
+        released = rolled_off = 0
+        db = SessionLocal(bind=get_engine())
+        try:
+            while True:
+                batch = release_expired_reservations(db, self.batch_size)
+                released += batch
+                # a short batch may only mean other workers took some holds
+                if batch == 0:
+                    break
+            while True:
+                batch = roll_off_expired_lots(db, self.batch_size)
+                rolled_off += batch
+                if batch == 0:
+                    break
+        finally:
+            db.close()
+        self.passes += 1
+        self.released += released
+        self.rolled_off += rolled_off
+        self.last_pass_ms = round((time.perf_counter() - started) * 1000, 3)
+        return released
+
+    async def _run(self):
+        while True:
+            # the first pass waits too, so starting a worker opens no connection
+            await asyncio.sleep(self.interval)
+            try:
+                await run_in_threadpool(self.reap)
+            except Exception:  # pylint: disable=broad-except
+                self.errors += 1
+                logger.exception("Releasing lapsed reservations failed")
+
+    def start(self):
+        """Start the background task on the running event loop."""
+        if self.interval > 0 and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        """Cancel the background task and wait for it to finish."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def stats(self) -> dict:
+        """Counters of the reaper of this worker."""
+        return {
+            "interval": self.interval,
+            "batch_size": self.batch_size,
+            "running": self._task is not None,
+            "passes": self.passes,
+            "released": self.released,
+            "rolled_off": self.rolled_off,
+            "errors": self.errors,
+            "last_pass_ms": self.last_pass_ms,
+        }
+
+
+reservation_reaper = ReservationReaper()
@@ -0,0 +1,113 @@
+"""Repository functions for timed stock reservations."""
+
+from datetime import datetime
+from fastapi import HTTPException
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+from app.Reservation.reservation_model import Reservation
+
+
+def insert_reservation(
+    db: Session,
+    order_id: int,
+    egg_id: int,
+    quantity: int,
+    unit_price: float,
+    expires_at: datetime,
+) -> Reservation:
+    """Adds a reservation to the ongoing transaction and flushes it."""
+    # pylint: disable=too-many-arguments,too-many-positional-arguments
+    reservation = Reservation(
+        order_id=order_id,
+        egg_id=egg_id,
+        quantity=quantity,
+        unit_price=unit_price,
+        expires_at=expires_at,
+    )
+    db.add(reservation)
+    db.flush()
+    return reservation
+
+
+def read_order_reservations(db: Session, order_id: int) -> list:
+    """Returns the reservations of an order, lapsed ones included."""
+    return (
+        db.query(Reservation)
+        .filter(Reservation.order_id == order_id)
+        .order_by(Reservation.id)
+        .all()
+    )
+
+
+def read_expired_reservations(db: Session, now: datetime, limit: int) -> list:
+    """
+    Returns up to ``limit`` lapsed reservations, oldest first, along the expiry index.
+
+    The rows are locked, skipping those another reaper has locked, on backends
+    with row locks; SQLite ignores the clause.
+    """
+    return db.execute(
+        select(Reservation.id, Reservation.egg_id, Reservation.quantity)
+        .where(Reservation.expires_at <= now)
+        .order_by(Reservation.expires_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    ).all()
+
+
+def claim_reservation(db: Session, reservation_id: int, *conditions) -> bool:
+    """
+    Deletes a reservation if it still exists and matches ``conditions``.
+
+    Confirmation, early release and the reaper may race for the same hold;
+    only the transaction whose DELETE removed the row may use its eggs.
+
+    Returns:
+        bool: Whether this transaction removed the reservation.
+    """
+    return bool(
+        db.execute(
+            delete(Reservation)
+            .where(Reservation.id == reservation_id, *conditions)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+    )
+
+
+def claim_reservations(db: Session, reservation_ids: list, *conditions) -> int:
+    """
+    Deletes the given reservations that still exist and match ``conditions``.
+
+    Returns:
+        int: How many reservations this transaction removed.
+    """
+    return db.execute(
+        delete(Reservation)
+        .where(Reservation.id.in_(reservation_ids), *conditions)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+
+
+def delete_order_reservations(db: Session, order_id: int) -> list:
+    """
+    Deletes the reservations of an order in the ongoing transaction.
+
+    Raises:
+        HTTPException: 409 if some were released since they were read.
+
+    Returns:
+        list[Row]: The ``egg_id`` and ``quantity`` of each reservation removed.
+    """
+    held = db.execute(
+        select(Reservation.id, Reservation.egg_id, Reservation.quantity).where(
+            Reservation.order_id == order_id
+        )
+    ).all()
+    if not held:
+        return []
+    claimed = claim_reservations(db, [reservation.id for reservation in held])
+    if claimed != len(held):
+        raise HTTPException(
+            status_code=409, detail="Reservations were changed, read them again"
+        )
+    return held
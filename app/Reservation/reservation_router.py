@@ -0,0 +1,81 @@
+"""Router module for timed stock reservation endpoints."""
+
+from typing import List
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from app.db.session import get_db
+from app.OrderEgg.order_egg_schema import OrderEggResponse
+from app.Reservation.reservation_schema import ReservationCreate, ReservationResponse
+from app.Reservation.reservation_service import (
+    confirm_reservations_serv,
+    read_order_reservations_serv,
+    release_reservation_serv,
+    reserve_serv,
+)
+
+router = APIRouter()
+
+
+@router.post("/", status_code=201, response_model=ReservationResponse)
+def reserve_route(request: ReservationCreate, db: Session = Depends(get_db)):
+    """
+    Holds eggs of a lot for an order while its customer pays.
+
+    The eggs leave the available stock at once and come back if the order is
+    not confirmed before the reservation lapses.
+
+    Args:
+        request (ReservationCreate): The order, the lot and the quantity.
+        db (Session, optional): The database session dependency.
+
+    Returns:
+        ReservationResponse: The reservation and when it lapses.
+    """
+    return reserve_serv(request, db)
+
+
+@router.get("/order/{order_id}", response_model=List[ReservationResponse])
+def read_order_reservations_route(order_id: int, db: Session = Depends(get_db)):
+    """
+    Retrieves the reservations of an order.
+
+    Args:
+        order_id (int): The unique identifier of the order.
+        db (Session, optional): The database session dependency.
+
+    Returns:
+        List[ReservationResponse]: The reservations not yet confirmed or released.
+    """
+    return read_order_reservations_serv(order_id, db)
+
+
+@router.post(
+    "/order/{order_id}/confirm", status_code=201, response_model=List[OrderEggResponse]
+)
+def confirm_reservations_route(order_id: int, db: Session = Depends(get_db)):
+    """
+    Turns the active reservations of a paid order into order lines.
+
+    Args:
+        order_id (int): The unique identifier of the order.
+        db (Session, optional): The database session dependency.
+
+    Returns:
+        List[OrderEggResponse]: One order line per reservation.
+    """
+    return confirm_reservations_serv(order_id, db)
+
+
+@router.delete("/{reservation_id}")
+def release_reservation_route(reservation_id: int, db: Session = Depends(get_db)):
+    """
+    Releases a reservation before it lapses, giving its eggs back to the lot.
+
+    Args:
+        reservation_id (int): The unique identifier of the reservation.
+        db (Session, optional): The database session dependency.
+
+    Returns:
+        dict: A confirmation message.
+    """
+    return release_reservation_serv(reservation_id, db)
@@ -0,0 +1,27 @@
+"""Pydantic schemas for timed stock reservations."""
+
+# pylint: disable=too-few-public-methods
+
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class ReservationCreate(BaseModel):
+    """Schema for holding eggs of a lot for an order."""
+
+    order_id: int
+    egg_id: int
+    quantity: int
+
+
+class ReservationResponse(ReservationCreate):
+    """Schema for a reservation and when it lapses."""
+
+    id: int
+    unit_price: float
+    expires_at: datetime
+
+    class Config:
+        """Pydantic configuration to enable ORM mode."""
+
+        from_attributes = True
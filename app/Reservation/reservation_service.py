@@ -0,0 +1,181 @@
+"""Service module for timed stock reservations."""
+
+from collections import defaultdict
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from fastapi import HTTPException
+from app.db.database import get_settings
+from app.db.retry import run_transaction
+from app.Egg.egg_allocation import LotAllocation, read_lots, return_to_lot, take_from_lot
+from app.Order.order_model import Order
+from app.OrderEgg.order_egg_repository import add_allocated_lines
+from app.Reservation.reservation_model import Reservation
+from app.Reservation.reservation_repository import (
+    claim_reservation,
+    claim_reservations,
+    insert_reservation,
+    read_expired_reservations,
+    read_order_reservations,
+)
+from app.Reservation.reservation_schema import ReservationCreate
+
+
+class _BatchTaken(Exception):
+    """Another worker released part of a batch first."""
+
+
+def _read_order(order_id: int, db: Session) -> Order:
+    order = db.query(Order).filter(Order.id == order_id).first()
+    if order is None:
+        raise HTTPException(status_code=404, detail="Order not found")
+    return order
+
+
+def _read_pending_order(order_id: int, db: Session) -> Order:
+    order = _read_order(order_id, db)
+    if order.state != "pending":
+        raise HTTPException(status_code=409, detail="The order is not pending")
+    return order
+
+
+def reserve_serv(request: ReservationCreate, db: Session):
+    """
+    Hold eggs of a lot for an order for ``reservation_ttl_seconds``, at the
+    lot's current sell price.
+
+    Raises:
+        HTTPException: 400 for a non-positive quantity, 404 for an unknown
+        order or lot, 409 for an order that is not pending, an expired lot or
+        one without enough eggs.
+    """
+    if request.quantity <= 0:
+        raise HTTPException(status_code=400, detail="Quantity must be greater than 0")
+    _read_pending_order(request.order_id, db)
+    ttl = timedelta(seconds=get_settings().reservation_ttl_seconds)
+
+    def reserve():
+        lot = read_lots(db, [request.egg_id]).get(request.egg_id)
+        if lot is None:
+            raise HTTPException(status_code=404, detail="Egg not found")
+        now = datetime.utcnow()
+        if lot.expirationDate <= now:
+            raise HTTPException(
+                status_code=409, detail=f"Egg {request.egg_id} has expired"
+            )
+        if not take_from_lot(db, lot, request.quantity):
+            raise HTTPException(
+                status_code=409, detail=f"Not enough stock of egg {request.egg_id}"
+            )
+        return insert_reservation(
+            db,
+            request.order_id,
+            request.egg_id,
+            request.quantity,
+            lot.sellPrice,
+            now + ttl,
+        )
+
+    reservation = run_transaction(db, reserve)
+    db.refresh(reservation)
+    return reservation
+
+
+def read_order_reservations_serv(order_id: int, db: Session):
+    """Retrieve the reservations of an order."""
+    _read_order(order_id, db)
+    return read_order_reservations(db, order_id)
+
+
+def release_reservation_serv(reservation_id: int, db: Session):
+    """Give the eggs of a reservation back to its lot, or raise 404."""
+    reservation = db.get(Reservation, reservation_id)
+    if reservation is None:
+        raise HTTPException(status_code=404, detail="Reservation not found")
+    egg_id, quantity = reservation.egg_id, reservation.quantity
+
+    def release():
+        if not claim_reservation(db, reservation_id):
+            raise HTTPException(status_code=404, detail="Reservation not found")
+        return_to_lot(db, egg_id, quantity)
+
+    run_transaction(db, release)
+    return {"message": "Reservation released"}
+
+
+def confirm_reservations_serv(order_id: int, db: Session):
+    """
+    Turn the unexpired reservations of an order into order lines.
+
+    The eggs were taken from their lots when reserved, so confirming touches
+    no lot row: each line is priced at the price fixed by its reservation and
+    added to the order total in one transaction. Lapsed reservations are left
+    to the reaper.
+
+    Raises:
+        HTTPException: 404 for an unknown order, 409 if the order is not
+        pending or has no unexpired reservation.
+    """
+    order = _read_pending_order(order_id, db)
+
+    def confirm():
+        now = datetime.utcnow()
+        held = [
+            reservation
+            for reservation in read_order_reservations(db, order_id)
+            if reservation.expires_at > now
+        ]
+        allocations = [
+            LotAllocation(reservation.egg_id, reservation.quantity, reservation.unit_price)
+            for reservation in held
+            if claim_reservation(db, reservation.id, Reservation.expires_at > now)
+        ]
+        if not allocations:
+            raise HTTPException(
+                status_code=409, detail="The order has no active reservation"
+            )
+        return add_allocated_lines(db, order, allocations)
+
+    lines = run_transaction(db, confirm)
+    for line in lines:
+        db.refresh(line)
+    return lines
+
+
+def release_expired_reservations(db: Session, batch_size: int) -> int:
+    """
+    Give the eggs of one batch of lapsed reservations back to their lots.
+
+    The batch is claimed with a single DELETE. Where the backend has row locks
+    it was read with ``SKIP LOCKED``, so concurrent reapers take different
+    holds; elsewhere a DELETE matching fewer rows than were read means another
+    worker released some of them first, and the batch is read again. Holds of
+    the same lot are returned with a single update.
+
+    Returns:
+        int: The number of reservations released.
+    """
+
+    def release():
+        now = datetime.utcnow()
+        batch = read_expired_reservations(db, now, batch_size)
+        if not batch:
+            return 0
+        claimed = claim_reservations(
+            db, [reservation.id for reservation in batch], Reservation.expires_at <= now
+        )
+        if claimed != len(batch):
+            raise _BatchTaken()
+        returned = defaultdict(int)
+        for reservation in batch:
+            returned[reservation.egg_id] += reservation.quantity
+        for egg_id in sorted(returned):
+            return_to_lot(db, egg_id, returned[egg_id])
+        return claimed
+
+    for _ in range(get_settings().db_retry_attempts):
+        try:
+            return run_transaction(db, release)
+        except _BatchTaken:
+            continue
+    # the other workers are releasing these holds; the next pass sees the rest
+    return 0
@@ -4,6 +4,8 @@ from sqlalchemy.orm import Session
 from fastapi import Depends
 from fastapi import HTTPException
 from app.db.session import get_db
+from app.Auth.auth_service import invalidate_all_principals, revoke_token_version
+from app.User.user_repository import revoke_tokens_of_role
 from app.Role.role_schema import RoleCreate
 from app.Role.role_repository import (
     create_role,
@@ -37,15 +39,33 @@ def read_roles_serv(db: Session = Depends(get_db)):
     return read_roles(db)
 
 
+def _revoke_tokens_of_role(role_id: int, role_name: str, db: Session):
+    """Revoke the tokens of a role's members after the role changed."""
+    members = revoke_tokens_of_role(role_id, db)
+    # require_admin trusts the role claim without loading the user, so tokens
+    # claiming ADMIN are revoked in the revocation list as well
+    if role_name == "ADMIN":
+        for username, version in members:
+            revoke_token_version(username, version or 0, db)
+
+
 def update_role_serv(
     role_id: int, role_update: RoleCreate, db: Session = Depends(get_db)
 ):
     """Updates an existing role by ID."""
     if not role_update.name.strip():
         raise HTTPException(status_code=400, detail="name is required")
-    return update_role(role_id, role_update, db)
+    previous_name = read_role(role_id, db).name
+    role = update_role(role_id, role_update, db)
+    # tokens and cached principals embed role names, which require_admin checks
+    _revoke_tokens_of_role(role_id, previous_name, db)
+    invalidate_all_principals()
+    return role
 
 
 def delete_role_serv(role_id: int, db: Session = Depends(get_db)):
     """Deletes a role by ID."""
-    return delete_role(role_id, db)
+    _revoke_tokens_of_role(role_id, read_role(role_id, db).name, db)
+    result = delete_role(role_id, db)
+    invalidate_all_principals()
+    return result
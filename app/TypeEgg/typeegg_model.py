@@ -12,5 +12,7 @@ class TypeEgg(Base):
 
     id = Column(Integer, primary_key=True)  # Primary key
     name = Column(String(50), unique=True, nullable=False)
+    # Rows its stock changes are spread over; see StockShard. 1 disables sharding.
+    stock_shards = Column(Integer, nullable=False, default=1, server_default="1")
 
     eggs = relationship("Egg", back_populates="type_egg")
@@ -0,0 +1,46 @@
+"""Async repository functions for reading users from the database."""
+
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.loading import response_options
+from app.User.user_model import User
+from app.User.user_schema import UserResponse
+from app.User.user_repository import users_page_query
+
+
+async def read_users(db: AsyncSession, after_id: int = None, limit: int = 100):
+    """Retrieves one page of users from the database."""
+    result = await db.execute(users_page_query(after_id, limit))
+    return result.scalars().all()
+
+
+async def read_user(user_id: int, db: AsyncSession):
+    """Retrieves a specific user by its ID."""
+    result = await db.execute(
+        select(User)
+        .options(*response_options(User, UserResponse))
+        .where(User.id == user_id)
+    )
+    user = result.scalars().first()
+    if user is None:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
+
+
+async def read_users_by_role(
+    role_id: int, db: AsyncSession, after_id: int = None, limit: int = 100
+):
+    """Retrieves one page of the users with a specific role."""
+    result = await db.execute(users_page_query(after_id, limit, role_id))
+    return result.scalars().all()
+
+
+async def get_user_by_username(db: AsyncSession, username: str) -> User:
+    """Retrieve a user by their username."""
+    result = await db.execute(
+        select(User)
+        .options(*response_options(User, UserResponse))
+        .where(User.username == username)
+    )
+    return result.scalars().first()
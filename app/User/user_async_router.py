@@ -0,0 +1,102 @@
+"""Async router for user read endpoints, mounted when DB_MODE is "async"."""
+
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_async_db
+from app.User.user_schema import UserAvailabilityResponse, UserResponse
+from app.User.user_async_service import (
+    check_availability_async_serv,
+    read_user_serv,
+    read_users_serv,
+    read_users_by_role_serv,
+)
+from app.Auth.auth_service import require_admin_async
+
+router = APIRouter()
+
+
+# Registered ahead of "/{user_id}", which would otherwise capture the path.
+@router.get("/availability", response_model=UserAvailabilityResponse)
+async def check_availability_route(
+    username: Optional[str] = None,
+    email: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Tell whether a username and/or email are still free, without creating a user.
+
+    Args:
+        username (str, optional): The username to check.
+        email (str, optional): The email to check.
+        db (AsyncSession, optional): Async database session dependency.
+
+    Returns:
+        UserAvailabilityResponse: ``true`` for each requested value that is free.
+
+    Raises:
+        HTTPException: 400 if neither value is given.
+    """
+    return await check_availability_async_serv(username, email, db)
+
+
+@router.get("/{user_id}", response_model=UserResponse, dependencies=[Depends(require_admin_async)])
+async def get_user_route(user_id: int, db: AsyncSession = Depends(get_async_db)):
+    """
+    Retrieve a user by their user ID.
+
+    Args:
+        user_id (int): The ID of the user to retrieve.
+        db (AsyncSession, optional): Async database session dependency.
+
+    Returns:
+        User: The user object corresponding to the provided user_id.
+    """
+    return await read_user_serv(user_id, db)
+
+
+@router.get("/", response_model=List[UserResponse], dependencies=[Depends(require_admin_async)])
+async def read_users_route(
+    after_id: Optional[int] = Query(None, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Retrieves one page of users ordered by ID.
+
+    Args:
+        after_id (int, optional): ID of the last user of the previous page.
+        limit (int): Maximum number of users to return.
+        db (AsyncSession, optional): Async database session dependency.
+
+    Returns:
+        List[UserResponse]: Up to ``limit`` users with an ID above ``after_id``.
+    """
+    return await read_users_serv(db, after_id, limit)
+
+
+@router.get(
+    "/byrole/{role_id}",
+    response_model=List[UserResponse],
+    dependencies=[Depends(require_admin_async)],
+)
+async def get_users_by_role(
+    role_id: int,
+    after_id: Optional[int] = Query(None, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db),
+):
+    """
+    Retrieve a list of users filtered by their role ID.
+
+    Args:
+        role_id (int): The ID of the role to filter users by.
+        after_id (int, optional): ID of the last user of the previous page.
+        limit (int): Maximum number of users to return.
+        db (AsyncSession, optional): Async database session dependency.
+
+    Returns:
+        List[User]: One page of the users associated with the specified role.
+    """
+    return await read_users_by_role_serv(role_id, db, after_id, limit)
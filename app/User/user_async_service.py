@@ -0,0 +1,29 @@
+"""Async service layer for user read operations."""
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.User.user_async_repository import read_users, read_user, read_users_by_role
+from app.User.user_service import check_availability_serv
+
+
+async def read_users_serv(db: AsyncSession, after_id: int = None, limit: int = 100):
+    """Service to get one page of users."""
+    return await read_users(db, after_id, limit)
+
+
+async def read_user_serv(user_id: int, db: AsyncSession):
+    """Service to get a user by ID with 404 handling."""
+    return await read_user(user_id, db)
+
+
+async def read_users_by_role_serv(
+    role_id: int, db: AsyncSession, after_id: int = None, limit: int = 100
+):
+    """Service to get one page of users by role ID."""
+    return await read_users_by_role(role_id, db, after_id, limit)
+
+
+async def check_availability_async_serv(username: str, email: str, db: AsyncSession):
+    """Service to tell whether a username and/or email are still free."""
+    return await db.run_sync(
+        lambda session: check_availability_serv(username, email, session)
+    )
@@ -0,0 +1,148 @@
+"""
+Per-worker Bloom filters of the usernames and emails in the user table.
+
+A value missing from its filter is certainly free, which is the answer for
+nearly every sign-up form check and needs no query. A filter hit (a taken
+value, a value freed by an update or delete, or a rare false positive) is
+confirmed with an indexed lookup.
+
+Users written by this worker are added immediately. Users created by other
+workers are picked up by an incremental sync of the rows with an id above the
+last one seen, at most once every ``sync_interval`` seconds; values changed by
+updates in other workers are picked up when the filters are rebuilt from the
+table every ``rebuild_interval`` seconds, or earlier when they are saturated.
+Until then an answer may say "free" for a value just taken elsewhere; the
+unique constraints still reject it on create.
+"""
+
+import threading
+import time
+
+from sqlalchemy.orm import Session
+
+from app.User.user_repository import find_taken_values, read_user_keys_after
+from app.utils.bloom import BloomFilter
+
+# Fields that can be checked, as named in the query string.
+AVAILABILITY_FIELDS = ("username", "email")
+
+
+def _key(value: str) -> str:
+    # The unique constraints compare with a case-insensitive collation.
+    return value.strip().casefold()
+
+
+class AvailabilityFilter:
+    """Bloom filters of taken usernames and emails kept in sync with the table."""
+
+    def __init__(
+        self,
+        capacity: int = 100_000,
+        error_rate: float = 0.001,
+        sync_interval: float = 5,
+        rebuild_interval: float = 300,
+    ):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self._lock = threading.Lock()
+        self._filters = self._new_filters()
+        self._last_id = 0
+        self._synced_at = None
+        self._built_at = None
+        self.checks = 0
+        self.lookups = 0
+        self.rebuilds = 0
+
+    def configure(self, capacity: int, sync_interval: float, rebuild_interval: float):
+        """Apply new settings; the filters are rebuilt on the next check."""
+        self.capacity = capacity
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self.reset()
+
+    def reset(self):
+        """Forget every value seen so far; the next check rebuilds the filters."""
+        with self._lock:
+            self._filters = self._new_filters()
+            self._last_id = 0
+            self._synced_at = None
+            self._built_at = None
+            self.checks = 0
+            self.lookups = 0
+            self.rebuilds = 0
+
+    def _new_filters(self) -> dict:
+        return {
+            field: BloomFilter(self.capacity, self.error_rate)
+            for field in AVAILABILITY_FIELDS
+        }
+
+    def add(self, user):
+        """Record the username and email of a user written by this worker."""
+        for field in AVAILABILITY_FIELDS:
+            self._filters[field].add(_key(getattr(user, field)))
+
+    def sync(self, db: Session):
+        """Add users created since the last sync, rebuilding the filters when due."""
+        now = time.monotonic()
+        rebuild = (
+            self._built_at is None
+            or now - self._built_at >= self.rebuild_interval
+            or any(bloom.saturated for bloom in self._filters.values())
+        )
+        if (
+            not rebuild
+            and self._synced_at is not None
+            and now - self._synced_at < self.sync_interval
+        ):
+            return
+        filters, last_id = (
+            (self._new_filters(), 0) if rebuild else (self._filters, self._last_id)
+        )
+        rows = read_user_keys_after(db, last_id)
+        for row_id, username, email in rows:
+            filters["username"].add(_key(username))
+            filters["email"].add(_key(email))
+            last_id = max(last_id, row_id)
+        with self._lock:
+            self._filters = filters
+            self._last_id = last_id
+            self._synced_at = now
+            if rebuild:
+                self._built_at = now
+                self.rebuilds += 1
+
+    def is_taken(self, field: str, value: str, db: Session) -> bool:
+        """
+        Check one value, querying the table only on a filter hit.
+
+        Args:
+            field (str): One of AVAILABILITY_FIELDS.
+            value (str): The candidate username or email.
+            db (Session): Session used for syncs and lookups.
+
+        Returns:
+            bool: Whether a user already has the value.
+        """
+        self.sync(db)
+        self.checks += 1
+        if _key(value) not in self._filters[field]:
+            return False
+        self.lookups += 1
+        return bool(find_taken_values(db, field, [value.strip()]))
+
+    def stats(self) -> dict:
+        """Return the size of the filters and how often they avoided a query."""
+        return {
+            "users": self._filters["username"].count,
+            "capacity": self.capacity,
+            "checks": self.checks,
+            "lookups": self.lookups,
+            "rebuilds": self.rebuilds,
+            "last_id": self._last_id,
+        }
+
+
+availability_filter = AvailabilityFilter()
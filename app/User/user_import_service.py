@@ -0,0 +1,194 @@
+"""
+Service layer for bulk user imports.
+
+An import is validated as a whole before anything is written: every row goes
+through UserCreate and the checks of ``create_user_serv``, unique fields are
+compared lowercased within the file and against the database with one ``IN``
+query per field and chunk, and roles are loaded once. Passwords of the
+accepted rows are hashed across the password pool and the users are inserted
+in batches of ``IMPORT_BATCH_SIZE``, each one transaction of two executemany
+statements. A batch rejected by a unique constraint, because a user was
+created meanwhile, is split in halves and retried to find the rows at fault.
+"""
+
+import csv
+import io
+import json
+import re
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.Auth.auth_service import get_password_hashes
+from app.User.user_availability import availability_filter
+from app.User.user_repository import (
+    UNIQUE_FIELDS,
+    find_taken_values,
+    insert_users_batch,
+    read_roles_by_ids,
+)
+from app.User.user_schema import UserCreate
+from app.User.user_service import check_new_user_fields
+
+IMPORT_BATCH_SIZE = 500
+
+
+def _parse_ndjson(text: str):
+    records = []
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            records.append(None)
+    return records
+
+
+def _parse_csv(text: str):
+    records = []
+    for record in csv.DictReader(io.StringIO(text)):
+        roles = record.get("role_ids") or ""
+        record["role_ids"] = [role for role in re.split(r"[;\s]+", roles) if role]
+        records.append(record)
+    return records
+
+
+def parse_import(body: bytes, content_type: str) -> list:
+    """
+    Split an import into records: NDJSON by default, CSV for ``text/csv``.
+
+    CSV files need a header row with the UserCreate field names; ``role_ids``
+    holds the role IDs separated by semicolons or spaces.
+
+    Returns:
+        list: One dict per record, or None for an unreadable NDJSON line.
+
+    Raises:
+        HTTPException: 400 if the body is not UTF-8.
+    """
+    try:
+        text = body.decode("utf-8-sig")
+    except UnicodeDecodeError as exc:
+        raise HTTPException(status_code=400, detail="Import must be UTF-8 encoded") from exc
+    if (content_type or "").split(";")[0].strip() == "text/csv":
+        return _parse_csv(text)
+    return _parse_ndjson(text)
+
+
+def _validate(record) -> tuple:
+    if not isinstance(record, dict):
+        return None, ["Invalid JSON object"]
+    try:
+        user = UserCreate.model_validate(record)
+    except ValidationError as exc:
+        return None, [
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+            for error in exc.errors()
+        ]
+    try:
+        check_new_user_fields(user)
+    except HTTPException as exc:
+        return None, [exc.detail]
+    return user, []
+
+
+def _chunks(items: list, size: int = IMPORT_BATCH_SIZE):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _insert_rows(db: Session, batch: list) -> list:
+    """Insert ``(row, values)`` pairs and return the rows that conflict."""
+    try:
+        insert_users_batch(db, [values for _, values in batch])
+    except IntegrityError:
+        db.rollback()
+        if len(batch) == 1:
+            return [batch[0][0]]
+        middle = len(batch) // 2
+        return _insert_rows(db, batch[:middle]) + _insert_rows(db, batch[middle:])
+    return []
+
+
+def import_users_serv(body: bytes, content_type: str, db: Session) -> dict:
+    """
+    Service to create many users at once and report the rejected rows.
+
+    Rows are numbered from 1 in file order, not counting the CSV header.
+    Valid rows are created even when other rows are rejected.
+
+    Args:
+        body (bytes): NDJSON or CSV content.
+        content_type (str): Content type of the body.
+        db (Session): Database session.
+
+    Returns:
+        dict: Received, created and failed counts and the errors of each row.
+
+    Raises:
+        HTTPException: 400 if the body is not UTF-8.
+    """
+    records = parse_import(body, content_type)
+    errors = {}
+    users = {}
+    for row, record in enumerate(records, start=1):
+        user, messages = _validate(record)
+        if messages:
+            errors[row] = messages
+        else:
+            users[row] = user
+
+    for field in UNIQUE_FIELDS:
+        seen = {}
+        for row, user in users.items():
+            value = getattr(user, field).lower()
+            if value in seen:
+                errors.setdefault(row, []).append(
+                    f"{field.capitalize()} duplicates row {seen[value]}"
+                )
+            else:
+                seen[value] = row
+        taken = set()
+        for chunk in _chunks([getattr(user, field) for user in users.values()]):
+            taken |= find_taken_values(db, field, chunk)
+        for row, user in users.items():
+            if getattr(user, field).lower() in taken:
+                errors.setdefault(row, []).append(
+                    f"{field.capitalize()} is already registered for another user"
+                )
+
+    roles = read_roles_by_ids(
+        db, {role_id for user in users.values() for role_id in user.role_ids}
+    )
+    for row, user in users.items():
+        if not set(user.role_ids) <= roles.keys():
+            errors.setdefault(row, []).append("One or more specified roles do not exist")
+
+    accepted = [(row, user) for row, user in users.items() if row not in errors]
+    hashes = get_password_hashes([user.password for _, user in accepted])
+    rows = [
+        (row, {**user.model_dump(), "password": hashed})
+        for (row, user), hashed in zip(accepted, hashes)
+    ]
+
+    created = 0
+    for batch in _chunks(rows):
+        conflicts = set(_insert_rows(db, batch))
+        for row, _ in batch:
+            if row in conflicts:
+                errors[row] = ["Conflicts with a user created during the import"]
+            else:
+                created += 1
+                availability_filter.add(users[row])
+
+    return {
+        "received": len(records),
+        "created": created,
+        "failed": len(errors),
+        "errors": [
+            {"row": row, "errors": messages} for row, messages in sorted(errors.items())
+        ],
+    }
@@ -16,9 +16,11 @@ class User(Base):
     phone_number = Column(String(50), unique=True)
     email = Column(String(50), unique=True)
     username = Column(String(50), unique=True)
-    password = Column(String(50))
+    password = Column(String(255))  # bcrypt hash
     address = Column(String(50), unique=True)
     enabled = Column(Boolean)
+    # Bumped to revoke every token issued before a role or credential change.
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")
 
     orders = relationship("Order", back_populates="user")
     roles = relationship("Role", secondary=user_role, back_populates="users")
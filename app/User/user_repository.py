@@ -1,12 +1,15 @@
 """Repository functions for managing users in the database."""
 
+from fastapi import Depends, HTTPException
+from sqlalchemy import case, func, insert, or_, select, update
+from sqlalchemy.orm import Session, load_only, selectinload
+
+from app.db.loading import response_options
 from app.db.session import get_db
-from app.User.user_model import User
 from app.Role.role_model import Role
-from app.User.user_schema import UserCreate
-
-from sqlalchemy.orm import Session
-from fastapi import Depends, HTTPException
+from app.User.user_model import User
+from app.User.user_schema import UserCreate, UserResponse
+from app.UserRole.userrole_model import user_role
 
 
 def create_user(user_data: UserCreate, roles: list[Role], db: Session):
@@ -27,49 +30,182 @@ def create_user(user_data: UserCreate, roles: list[Role], db: Session):
     return db_user
 
 
-def read_users(db: Session = Depends(get_db)):
-    """Retrieves all users from the database."""
-    return db.query(User).all()
+def users_page_query(after_id: int = None, limit: int = 100, role_id: int = None):
+    """
+    Builds the query of one page of users ordered by ID (keyset pagination).
+
+    Only the columns of UserResponse are loaded (never the password hash) and
+    the roles of the whole page come from one selectin query.
+
+    Args:
+        after_id (int, optional): Return users with an ID above this one.
+        limit (int): Maximum number of users in the page.
+        role_id (int, optional): Only return users holding this role.
+
+    Returns:
+        Select: The query, usable by sync and async sessions.
+    """
+    query = (
+        select(User)
+        .options(
+            load_only(
+                User.name,
+                User.phone_number,
+                User.email,
+                User.username,
+                User.address,
+                User.enabled,
+            ),
+            selectinload(User.roles).load_only(Role.name),
+        )
+        .order_by(User.id)
+        .limit(limit)
+    )
+    if after_id is not None:
+        query = query.where(User.id > after_id)
+    if role_id is not None:
+        query = query.where(User.roles.any(Role.id == role_id))
+    return query
+
+
+def read_users(db: Session, after_id: int = None, limit: int = 100):
+    """Retrieves one page of users from the database."""
+    return db.scalars(users_page_query(after_id, limit)).all()
 
 
 def read_user(user_id: int, db: Session = Depends(get_db)):
     """Retrieves a specific user by its ID."""
-    user = db.query(User).filter(User.id == user_id).first()
+    user = (
+        db.query(User)
+        .options(*response_options(User, UserResponse))
+        .filter(User.id == user_id)
+        .first()
+    )
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
     return user
 
 
-def update_user(user_id: int, user_update: UserCreate, db: Session = Depends(get_db)):
-    """Updates a user in the database by its ID."""
+def update_user(
+    user_id: int,
+    user_update: UserCreate,
+    roles: list[Role],
+    db: Session = Depends(get_db),
+    revoke_tokens: bool = False,
+):
+    """Updates a user and its roles by ID, optionally revoking its tokens."""
     user = db.query(User).filter(User.id == user_id).first()
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
 
-    for key, value in user_update.dict(exclude_unset=True).items():
+    for key, value in user_update.model_dump(exclude_unset=True, exclude={"role_ids"}).items():
         setattr(user, key, value)
+    user.roles = roles
+    if revoke_tokens:
+        user.token_version = User.token_version + 1
 
     db.commit()
     db.refresh(user)
     return user
 
 
-def check_previous_user(db: Session, field_name: str, value: str):
-    """Checks if a user with the given field name and value already exists."""
+# Unique columns in the order their conflicts are reported.
+UNIQUE_FIELDS = ("email", "username", "address", "phone_number")
 
-    return db.query(User).filter(getattr(User, field_name) == value).first()
 
-def check_previous_user_edit(
-    db: Session, field_name: str, value: str, exclude_user_id: int = None
-):
+def find_user_conflicts(db: Session, values: dict, exclude_user_id: int = None):
     """
-    Checks if a user with the given field name and value already exists,
-    optionally excluding a specific user by ID.
+    Finds which unique fields already belong to another user, in one query.
+
+    The comparison runs in the database so its collation decides, as it does
+    for the unique constraints.
+
+    Args:
+        db (Session): Database session.
+        values (dict): Candidate values keyed by field name (see UNIQUE_FIELDS).
+        exclude_user_id (int, optional): The user being updated.
+
+    Returns:
+        list[str]: The colliding field names, in UNIQUE_FIELDS order.
     """
-    query = db.query(User).filter(getattr(User, field_name) == value)
+    fields = [field for field in UNIQUE_FIELDS if values.get(field) is not None]
+    if not fields:
+        return []
+    matches = [getattr(User, field) == values[field] for field in fields]
+    query = select(
+        *(func.max(case((match, 1), else_=0)) for match in matches)  # pylint: disable=not-callable
+    ).where(or_(*matches))
     if exclude_user_id is not None:
-        query = query.filter(User.id != exclude_user_id)
-    return query.first()
+        query = query.where(User.id != exclude_user_id)
+    flags = db.execute(query).one()
+    return [field for field, flag in zip(fields, flags) if flag]
+
+
+def find_taken_values(db: Session, field_name: str, values: list) -> set:
+    """
+    Returns which of the given values of a unique field are already used.
+
+    Values are compared lowercased on both sides, whatever the collation of
+    the column, and the matches are returned lowercased.
+    """
+    if not values:
+        return set()
+    lowered = func.lower(getattr(User, field_name))
+    return set(
+        db.scalars(
+            select(lowered).where(lowered.in_({value.lower() for value in values}))
+        ).all()
+    )
+
+
+def read_user_keys_after(db: Session, after_id: int) -> list:
+    """Returns the ``(id, username, email)`` of users with an ID above ``after_id``."""
+    return db.execute(
+        select(User.id, User.username, User.email)
+        .where(User.id > after_id)
+        .order_by(User.id)
+    ).all()
+
+
+def read_roles_by_ids(db: Session, role_ids) -> dict:
+    """Returns the existing roles among the given IDs, keyed by ID."""
+    if not role_ids:
+        return {}
+    return {
+        role.id: role
+        for role in db.scalars(select(Role).where(Role.id.in_(role_ids))).all()
+    }
+
+
+def insert_users_batch(db: Session, rows: list):
+    """
+    Inserts users and their role links with two executemany statements.
+
+    Args:
+        db (Session): Database session; the batch is committed as one transaction.
+        rows (list[dict]): User columns plus ``role_ids``; passwords already hashed.
+    """
+    db.execute(
+        insert(User),
+        [{key: value for key, value in row.items() if key != "role_ids"} for row in rows],
+    )
+    ids = dict(
+        db.execute(
+            select(User.username, User.id).where(
+                User.username.in_([row["username"] for row in rows])
+            )
+        ).all()
+    )
+    db.execute(
+        insert(user_role),
+        [
+            {"user_id": ids[row["username"]], "role_id": role_id}
+            for row in rows
+            for role_id in set(row["role_ids"])
+        ],
+    )
+    db.commit()
+
 
 def delete_user(user_id: int, db: Session = Depends(get_db)):
     """Deletes a user from the database by its ID."""
@@ -81,11 +217,40 @@ def delete_user(user_id: int, db: Session = Depends(get_db)):
     return {"message": "User deleted successfully"}
 
 
-def read_users_by_role(role_id: int, db: Session):
-    """Retrieves all users with a specific role."""
-    return db.query(User).filter(User.roles.any(Role.id == role_id)).all()
+def read_users_by_role(
+    role_id: int, db: Session, after_id: int = None, limit: int = 100
+):
+    """Retrieves one page of the users with a specific role."""
+    return db.scalars(users_page_query(after_id, limit, role_id)).all()
+
+
+def update_password_hash(db: Session, user: User, hashed_password: str):
+    """Replaces the stored hash of a user without touching its token version."""
+    user.password = hashed_password
+    db.commit()
 
 
 def get_user_by_username(db: Session, username: str) -> User:
     """Retrieve a user by their username."""
     return db.query(User).filter(User.username == username).first()
+
+
+def revoke_tokens_of_role(role_id: int, db: Session) -> list:
+    """
+    Bumps the token version of every user holding the given role.
+
+    Returns:
+        list: The ``(username, token_version)`` of the members before the bump.
+    """
+    members = select(user_role.c.user_id).where(user_role.c.role_id == role_id)
+    previous = db.execute(
+        select(User.username, User.token_version).where(User.id.in_(members))
+    ).all()
+    db.execute(
+        update(User)
+        .where(User.id.in_(members))
+        .values(token_version=User.token_version + 1)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return previous
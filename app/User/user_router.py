@@ -1,11 +1,18 @@
 """Router for handling user-related API endpoints."""
 
-from typing import List
-from fastapi import APIRouter, Depends
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, Request
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 
 from app.db.session import get_db
-from app.User.user_schema import UserCreate, UserResponse
+from app.User.user_schema import (
+    UserAvailabilityResponse,
+    UserCreate,
+    UserImportReport,
+    UserResponse,
+)
+from app.User.user_import_service import import_users_serv
 from app.User.user_service import (
     create_user_serv,
     read_user_serv,
@@ -13,10 +20,10 @@ from app.User.user_service import (
     read_users_serv,
     update_user_serv,
     read_users_by_role_serv,
+    check_availability_serv,
 )
 
 from app.Auth.auth_service import get_current_user, require_admin
-from app.User.user_model import User
 
 router = APIRouter()
 
@@ -39,16 +46,65 @@ def create_user_route(user: UserCreate, db: Session = Depends(get_db)):
     return create_user_serv(user, db)
 
 
+@router.post(
+    "/import", response_model=UserImportReport, dependencies=[Depends(require_admin)]
+)
+async def import_users_route(request: Request, db: Session = Depends(get_db)):
+    """
+    Creates many users from an NDJSON body, or CSV with ``Content-Type: text/csv``.
+
+    Every row is validated like ``POST /user/``; valid rows are created and the
+    others are reported with their row number.
+
+    Args:
+        request (Request): The request carrying the file as its body.
+        db (Session, optional): The database session dependency.
+
+    Returns:
+        UserImportReport: Counts of received, created and rejected rows and the
+        errors of each rejected row.
+    """
+    body = await request.body()
+    return await run_in_threadpool(
+        import_users_serv, body, request.headers.get("content-type"), db
+    )
+
+
+@router.get("/availability", response_model=UserAvailabilityResponse)
+def check_availability_route(
+    username: Optional[str] = None,
+    email: Optional[str] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    Tell whether a username and/or email are still free, without creating a user.
+
+    Most answers come from an in-memory filter and need no query.
+
+    Args:
+        username (str, optional): The username to check.
+        email (str, optional): The email to check.
+        db (Session, optional): SQLAlchemy database session dependency.
+
+    Returns:
+        UserAvailabilityResponse: ``true`` for each requested value that is free.
+
+    Raises:
+        HTTPException: 400 if neither value is given.
+    """
+    return check_availability_serv(username, email, db)
+
+
 @router.get("/search/me", response_model=UserResponse)
-def get_logged_user(current_user: User = Depends(get_current_user)):
+def get_logged_user(current_user: UserResponse = Depends(get_current_user)):
     """
     Retrieve the currently authenticated user.
 
     Args:
-        current_user (User): The user object obtained from the authentication dependency.
+        current_user (UserResponse): The user obtained from the authentication dependency.
 
     Returns:
-        User: The currently authenticated user.
+        UserResponse: The currently authenticated user.
     """
     return current_user
 
@@ -94,10 +150,24 @@ def delete_user_route(
 
 @router.get("/", response_model=List[UserResponse], dependencies=[Depends(require_admin)])
 def read_users_route(
+    after_id: Optional[int] = Query(None, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
     db: Session = Depends(get_db),
 ):
-    """Retrieves all users."""
-    return read_users_serv(db)
+    """
+    Retrieves one page of users ordered by ID.
+
+    Pass the ID of the last user received as ``after_id`` to get the next page.
+
+    Args:
+        after_id (int, optional): ID of the last user of the previous page.
+        limit (int): Maximum number of users to return.
+        db (Session, optional): SQLAlchemy database session dependency.
+
+    Returns:
+        List[UserResponse]: Up to ``limit`` users with an ID above ``after_id``.
+    """
+    return read_users_serv(db, after_id, limit)
 
 
 @router.put("/{user_id}", response_model=UserResponse, dependencies=[Depends(require_admin)])
@@ -123,6 +193,8 @@ def update_user_route(
 @router.get("/byrole/{role_id}", response_model=List[UserResponse], dependencies=[Depends(require_admin)])
 def get_users_by_role(
     role_id: int,
+    after_id: Optional[int] = Query(None, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
     db: Session = Depends(get_db),
 ):
     """
@@ -130,9 +202,11 @@ def get_users_by_role(
 
     Args:
         role_id (int): The ID of the role to filter users by.
+        after_id (int, optional): ID of the last user of the previous page.
+        limit (int): Maximum number of users to return.
         db (Session, optional): SQLAlchemy database session dependency. Defaults to Depends(get_db).
 
     Returns:
-        List[User]: A list of user objects associated with the specified role.
+        List[User]: One page of the users associated with the specified role.
     """
-    return read_users_by_role_serv(role_id, db)
+    return read_users_by_role_serv(role_id, db, after_id, limit)
@@ -2,7 +2,7 @@
 
 from pydantic import BaseModel, EmailStr, constr, field_validator
 from app.Role.role_schema import RoleResponse
-from typing import List
+from typing import List, Optional
 import re
 
 
@@ -48,3 +48,26 @@ class UserResponse(BaseModel):
         """Pydantic configuration."""
 
         from_attributes = True
+
+
+class UserImportRowError(BaseModel):
+    """Reasons one imported row was rejected."""
+
+    row: int
+    errors: List[str]
+
+
+class UserImportReport(BaseModel):
+    """Outcome of a bulk user import."""
+
+    received: int
+    created: int
+    failed: int
+    errors: List[UserImportRowError]
+
+
+class UserAvailabilityResponse(BaseModel):
+    """Whether each requested username or email is still free."""
+
+    username: Optional[bool] = None
+    email: Optional[bool] = None
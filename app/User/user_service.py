@@ -1,10 +1,17 @@
 """Service layer for user-related operations."""
 
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from app.User.user_schema import UserCreate
-from app.Auth.auth_service import get_password_hash
+from app.Auth.auth_service import (
+    get_password_hash,
+    invalidate_principal,
+    revoke_token_version,
+    verify_password,
+)
 from app.Role.role_model import Role
+from app.User.user_availability import availability_filter
 from app.User.user_repository import (
     read_users,
     read_user,
@@ -12,14 +19,13 @@ from app.User.user_repository import (
     delete_user,
     update_user,
     read_users_by_role,
-    check_previous_user,
-    check_previous_user_edit
+    find_user_conflicts,
 )
 
 
-def read_users_serv(db: Session):
-    """Service to get all users."""
-    return read_users(db)
+def read_users_serv(db: Session, after_id: int = None, limit: int = 100):
+    """Service to get one page of users."""
+    return read_users(db, after_id, limit)
 
 
 def read_user_serv(user_id: int, db: Session):
@@ -30,9 +36,24 @@ def read_user_serv(user_id: int, db: Session):
     return user
 
 
-def create_user_serv(user: UserCreate, db: Session):
-    """Service to create a new user with full validation."""
+def _conflict_error(db: Session, user: UserCreate, exclude_user_id: int = None):
+    """
+    Explain a unique constraint violation, or return None if it was another one.
+
+    Only called after a failed write, so successful writes need no pre-reads.
+    """
+    db.rollback()
+    conflicts = find_user_conflicts(db, user.model_dump(), exclude_user_id)
+    if not conflicts:
+        return None
+    return HTTPException(
+        status_code=400,
+        detail=f"{conflicts[0].capitalize()} is already registered for another user",
+    )
 
+
+def check_new_user_fields(user: UserCreate):
+    """Rejects a new user with blank required fields or without roles."""
     if not user.name.strip():
         raise HTTPException(status_code=400, detail="Name is required")
 
@@ -42,19 +63,16 @@ def create_user_serv(user: UserCreate, db: Session):
     if not user.username.strip():
         raise HTTPException(status_code=400, detail="Username is required")
 
-    for attr in ["email", "username", "address"]:
-        value = getattr(user, attr).strip()
-        if check_previous_user(db, attr, value):
-            raise HTTPException(
-                status_code=400,
-                detail=f"{attr.capitalize()} is already registered for another user",
-            )
-
     if not user.role_ids:
         raise HTTPException(
             status_code=400, detail="User must have at least one role assigned"
         )
 
+
+def create_user_serv(user: UserCreate, db: Session):
+    """Service to create a new user with full validation."""
+    check_new_user_fields(user)
+
     roles = db.query(Role).filter(Role.id.in_(user.role_ids)).all()
     if len(roles) != len(set(user.role_ids)):
         raise HTTPException(
@@ -63,7 +81,15 @@ def create_user_serv(user: UserCreate, db: Session):
 
     user.password = get_password_hash(user.password)
 
-    return create_user(user, roles, db)
+    try:
+        created = create_user(user, roles, db)
+    except IntegrityError as exc:
+        error = _conflict_error(db, user)
+        if error is None:
+            raise
+        raise error from exc
+    availability_filter.add(created)
+    return created
 
 
 def delete_user_serv(user_id: int, db: Session):
@@ -71,7 +97,11 @@ def delete_user_serv(user_id: int, db: Session):
     user = read_user(user_id, db)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    return delete_user(user_id, db)
+    username, version = user.username, user.token_version or 0
+    result = delete_user(user_id, db)
+    invalidate_principal(username)
+    revoke_token_version(username, version, db)
+    return result
 
 
 def update_user_serv(user_id: int, user_update: UserCreate, db: Session):
@@ -87,14 +117,6 @@ def update_user_serv(user_id: int, user_update: UserCreate, db: Session):
     if not user_update.address.strip():
         raise HTTPException(status_code=400, detail="Address is required")
 
-    for attr in ["email", "username", "address"]:
-        value = getattr(user_update, attr).strip()
-        if check_previous_user_edit(db, attr, value, exclude_user_id=user_id):
-            raise HTTPException(
-                status_code=400,
-                detail=f"{attr.capitalize()} is already registered for another user",
-            )
-
     if not user_update.role_ids:
         raise HTTPException(status_code=400, detail="User must have at least one role")
 
@@ -102,9 +124,57 @@ def update_user_serv(user_id: int, user_update: UserCreate, db: Session):
     if len(roles) != len(set(user_update.role_ids)):
         raise HTTPException(status_code=400, detail="One or more roles do not exist")
 
-    return update_user(user_id, user_update, db)
-
-
-def read_users_by_role_serv(role_id: int, db: Session):
-    """Service to get users by role ID."""
-    return read_users_by_role(role_id, db)
+    # Outstanding tokens carry the old roles and credentials: revoke them.
+    password_changed = not verify_password(user_update.password, existing_user.password)
+    revoke_tokens = (
+        {role.id for role in existing_user.roles} != {role.id for role in roles}
+        or (existing_user.enabled and not user_update.enabled)
+        or password_changed
+    )
+    user_update.password = (
+        get_password_hash(user_update.password)
+        if password_changed
+        else existing_user.password
+    )
+
+    previous_username = existing_user.username
+    previous_version = existing_user.token_version or 0
+    try:
+        updated = update_user(
+            user_id, user_update, roles, db, revoke_tokens=revoke_tokens
+        )
+    except IntegrityError as exc:
+        error = _conflict_error(db, user_update, exclude_user_id=user_id)
+        if error is None:
+            raise
+        raise error from exc
+    invalidate_principal(previous_username)
+    invalidate_principal(updated.username)
+    if revoke_tokens:
+        revoke_token_version(previous_username, previous_version, db)
+    availability_filter.add(updated)
+    return updated
+
+
+def check_availability_serv(username: str, email: str, db: Session):
+    """
+    Service to tell whether a username and/or email are still free.
+
+    Raises:
+        HTTPException: 400 if neither value is given.
+    """
+    values = {"username": username, "email": email}
+    if not any(value and value.strip() for value in values.values()):
+        raise HTTPException(status_code=400, detail="Username or email is required")
+    return {
+        field: not availability_filter.is_taken(field, value, db)
+        for field, value in values.items()
+        if value and value.strip()
+    }
+
+
+def read_users_by_role_serv(
+    role_id: int, db: Session, after_id: int = None, limit: int = 100
+):
+    """Service to get one page of users by role ID."""
+    return read_users_by_role(role_id, db, after_id, limit)
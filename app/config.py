@@ -0,0 +1,186 @@
+"""Application settings read from the environment."""
+
+# pylint: disable=too-few-public-methods
+
+import os
+from typing import Optional
+from dotenv import load_dotenv
+from pydantic import BaseModel
+
+load_dotenv()
+
+
+def _optional_float(value: str) -> Optional[float]:
+    """Parse a number; an empty value or "off" disables the option."""
+    if value.strip().lower() in ("", "off", "none"):
+        return None
+    return float(value)
+
+
+def _optional_int(value: str) -> Optional[int]:
+    """Parse an integer; an empty value or "off" leaves the option unset."""
+    number = _optional_float(value)
+    return None if number is None else int(number)
+
+
+class Settings(BaseModel):
+    """Runtime configuration shared by the app factory and the database layer."""
+
+    database_url: str
+    async_database_url: str
+    # Optional read replica; get_read_db falls back to the primary without it.
+    replica_database_url: Optional[str] = None
+
+    # "sync" serves every route from the threadpool; "async" also mounts the
+    # async read routes of the User, Egg, Order, Bill and Pay modules.
+    db_mode: str = "sync"
+
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: str = "always"
+    db_pool_pre_ping_idle: float = 30
+    db_replica_retry_seconds: float = 30
+
+    # Run Base.metadata.create_all when a worker starts. Deployments apply the
+    # schema once with ``python -m app.db.migrate`` instead; this is for local use.
+    create_schema_on_startup: bool = False
+    # Repetitions of one statement shape within a request reported as N+1.
+    sql_n_plus_one_threshold: int = 5
+
+    # Statements slower than this many milliseconds go to the slow query log;
+    # None disables it. SELECTs are logged with their EXPLAIN plan. Bound values
+    # may hold password hashes and emails: they are redacted unless opted in.
+    slow_query_ms: Optional[float] = 500
+    slow_query_log_path: str = "slow_queries.log"
+    slow_query_explain: bool = True
+    slow_query_log_parameters: bool = False
+
+    # Per-worker cache of authenticated users; a size or TTL of 0 disables it.
+    principal_cache_size: int = 1024
+    principal_cache_ttl: float = 30
+    # Verified JWT claims, each kept at most until its token expires.
+    token_cache_size: int = 4096
+
+    # Embed role names in access tokens so admin checks need no role query.
+    jwt_role_claims: bool = True
+
+    # bcrypt runs in this many processes per worker (0 runs it inline); calls
+    # beyond bcrypt_pool_max_pending queued operations are rejected with 503.
+    bcrypt_pool_workers: int = 2
+    bcrypt_pool_max_pending: int = 16
+    # The bcrypt cost is calibrated so a verification takes about
+    # bcrypt_target_ms; bcrypt_rounds pins it instead. The calibrated cost is
+    # read from bcrypt_rounds_file, written once per deploy, so the workers
+    # share one cost; without a file every worker calibrates at startup.
+    bcrypt_target_ms: float = 250
+    bcrypt_rounds: Optional[int] = None
+    bcrypt_rounds_file: Optional[str] = None
+
+    # Refresh tokens trade for a new access token without a bcrypt login.
+    refresh_token_expire_days: float = 7
+    # Revoked token IDs are checked through a per-worker Bloom filter sized
+    # for this many IDs and synced from the revoked_token table this often.
+    revocation_filter_capacity: int = 100_000
+    revocation_sync_seconds: float = 5
+
+    # Usernames and emails are checked for availability through per-worker
+    # Bloom filters, synced with new users and rebuilt from the table.
+    availability_filter_capacity: int = 100_000
+    availability_sync_seconds: float = 5
+    availability_rebuild_seconds: float = 300
+
+    # Transactions aborted by a deadlock or a serialization failure are rerun
+    # up to this many times in all, backing off exponentially from the delay.
+    db_retry_attempts: int = 4
+    db_retry_backoff_seconds: float = 0.02
+
+    # Reservations hold eggs this long while the customer pays; each worker
+    # releases lapsed ones every reap interval (0 disables), a batch at a time.
+    reservation_ttl_seconds: float = 600
+    reservation_reap_seconds: float = 5
+    reservation_reap_batch: int = 500
+
+    # Seconds ``app.db.migrate`` waits for another process holding the lock.
+    migration_lock_timeout: float = 300
+
+    @classmethod
+    def from_env(cls) -> "Settings":
+        """Build the settings from environment variables (and a .env file)."""
+        user = os.getenv("MYSQL_USER", "user")
+        password = os.getenv("MYSQL_PASSWORD", "password")
+        host = os.getenv("MYSQL_HOST", "mysql-golden-egg")
+        database = os.getenv("MYSQL_DB", "mydatabase")
+        replica_host = os.getenv("MYSQL_REPLICA_HOST")
+        return cls(
+            database_url=os.getenv(
+                "DATABASE_URL", f"mysql+pymysql://{user}:{password}@{host}/{database}"
+            ),
+            async_database_url=os.getenv(
+                "ASYNC_DATABASE_URL",
+                f"mysql+aiomysql://{user}:{password}@{host}/{database}",
+            ),
+            replica_database_url=(
+                f"mysql+pymysql://{user}:{password}@{replica_host}/{database}"
+                if replica_host
+                else None
+            ),
+            db_mode=os.getenv("DB_MODE", "sync").lower(),
+            db_pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+            db_max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+            db_pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+            db_pool_recycle=int(os.getenv("DB_POOL_RECYCLE", "1800")),
+            db_pool_pre_ping=os.getenv("DB_POOL_PRE_PING", "always").lower(),
+            db_pool_pre_ping_idle=float(os.getenv("DB_POOL_PRE_PING_IDLE", "30")),
+            db_replica_retry_seconds=float(os.getenv("DB_REPLICA_RETRY_SECONDS", "30")),
+            create_schema_on_startup=os.getenv("CREATE_SCHEMA_ON_STARTUP", "false").lower()
+            in ("1", "true", "yes"),
+            sql_n_plus_one_threshold=int(os.getenv("SQL_N_PLUS_ONE_THRESHOLD", "5")),
+            slow_query_ms=_optional_float(os.getenv("SLOW_QUERY_MS", "500")),
+            slow_query_log_path=os.getenv("SLOW_QUERY_LOG", "slow_queries.log"),
+            slow_query_explain=os.getenv("SLOW_QUERY_EXPLAIN", "true").lower()
+            in ("1", "true", "yes"),
+            slow_query_log_parameters=os.getenv("SLOW_QUERY_LOG_PARAMETERS", "false")
+            .lower()
+            in ("1", "true", "yes"),
+            principal_cache_size=int(os.getenv("PRINCIPAL_CACHE_SIZE", "1024")),
+            principal_cache_ttl=float(os.getenv("PRINCIPAL_CACHE_TTL", "30")),
+            jwt_role_claims=os.getenv("JWT_ROLE_CLAIMS", "true").lower()
+            in ("1", "true", "yes"),
+            bcrypt_pool_workers=int(os.getenv("BCRYPT_POOL_WORKERS", "2")),
+            bcrypt_pool_max_pending=int(os.getenv("BCRYPT_POOL_MAX_PENDING", "16")),
+            bcrypt_target_ms=float(os.getenv("BCRYPT_TARGET_MS", "250")),
+            bcrypt_rounds=_optional_int(os.getenv("BCRYPT_ROUNDS", "")),
+            bcrypt_rounds_file=os.getenv("BCRYPT_ROUNDS_FILE", ".bcrypt_rounds") or None,
+            token_cache_size=int(os.getenv("TOKEN_CACHE_SIZE", "4096")),
+            refresh_token_expire_days=float(os.getenv("REFRESH_TOKEN_EXPIRE_DAYS", "7")),
+            revocation_filter_capacity=int(
+                os.getenv("REVOCATION_FILTER_CAPACITY", "100000")
+            ),
+            revocation_sync_seconds=float(os.getenv("REVOCATION_SYNC_SECONDS", "5")),
+            availability_filter_capacity=int(
+                os.getenv("AVAILABILITY_FILTER_CAPACITY", "100000")
+            ),
+            availability_sync_seconds=float(os.getenv("AVAILABILITY_SYNC_SECONDS", "5")),
+            availability_rebuild_seconds=float(
+                os.getenv("AVAILABILITY_REBUILD_SECONDS", "300")
+            ),
+            db_retry_attempts=int(os.getenv("DB_RETRY_ATTEMPTS", "4")),
+            db_retry_backoff_seconds=float(os.getenv("DB_RETRY_BACKOFF_SECONDS", "0.02")),
+            reservation_ttl_seconds=float(os.getenv("RESERVATION_TTL_SECONDS", "600")),
+            reservation_reap_seconds=float(os.getenv("RESERVATION_REAP_SECONDS", "5")),
+            reservation_reap_batch=int(os.getenv("RESERVATION_REAP_BATCH", "500")),
+            migration_lock_timeout=float(os.getenv("MIGRATION_LOCK_TIMEOUT", "300")),
+        )
+
+    def pool_options(self) -> dict:
+        """Pool options understood by build_engine and build_async_engine."""
+        return {
+            "pool_size": self.db_pool_size,
+            "max_overflow": self.db_max_overflow,
+            "pool_timeout": self.db_pool_timeout,
+            "pool_recycle": self.db_pool_recycle,
+            "pre_ping": self.db_pool_pre_ping,
+            "pre_ping_idle": self.db_pool_pre_ping_idle,
+        }
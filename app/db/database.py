@@ -1,28 +1,161 @@
-"""Database connection module for FastAPI application."""
+"""Database connection module for FastAPI application.
 
+Engines are created lazily on first use from the settings passed to
+``configure_database`` (or read from the environment), so importing the
+application never opens a database connection.
+"""
+
+import threading
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-import os
-from dotenv import load_dotenv
+from app.config import Settings
+from app.db.pool import InstrumentedQueuePool, install_pool_listeners
+from app.db.routing import ReplicaHealth, RoutingSession
+
+Base = declarative_base()
 
-load_dotenv()
+SessionLocal = sessionmaker(autocommit=False, autoflush=False)
 
-MYSQL_USER = os.getenv("MYSQL_USER", "user")
-MYSQL_PASSWORD = os.getenv("MYSQL_PASSWORD", "password")
-MYSQL_HOST = os.getenv("MYSQL_HOST", "mysql-golden-egg")
-MYSQL_DB = os.getenv("MYSQL_DB", "mydatabase")
+ReadSessionLocal = sessionmaker(
+    class_=RoutingSession, autocommit=False, autoflush=False
+)
 
+AsyncSessionLocal = async_sessionmaker(autoflush=False, expire_on_commit=False)
 
-DATABASE_URL = f"mysql+pymysql://{MYSQL_USER}:{MYSQL_PASSWORD}@{MYSQL_HOST}/{MYSQL_DB}"
+_settings = None
+_engines = {}
+_replica_health = None
+_lock = threading.Lock()
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+def build_engine(url: str, **overrides):
+    """
+    Create an engine backed by an instrumented, configurable pool.
 
-Base = declarative_base()
-try:
-    Base.metadata.create_all(bind=engine)
-    print("Tablas creadas correctamente.")
-except Exception as e:
-    print(f"Error al crear tablas: {e}")
+    Args:
+        url (str): The database URL.
+        **overrides: Pool options replacing the values from the settings.
+
+    Returns:
+        Engine: The configured SQLAlchemy engine.
+    """
+    options = {**get_settings().pool_options(), **overrides}
+    db_engine = create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=options["pool_size"],
+        max_overflow=options["max_overflow"],
+        pool_timeout=options["pool_timeout"],
+        pool_recycle=options["pool_recycle"],
+        pool_pre_ping=options["pre_ping"] == "always",
+    )
+    install_pool_listeners(db_engine, options["pre_ping"], options["pre_ping_idle"])
+    return db_engine
+
+
+def build_async_engine(url: str, **overrides):
+    """
+    Create an AsyncEngine using the same pool configuration as the sync engine.
+
+    The pre-ping strategies behave as for the sync engine: the listeners are
+    attached to the pool of the underlying sync engine.
+
+    Args:
+        url (str): The async database URL (e.g. mysql+aiomysql or sqlite+aiosqlite).
+        **overrides: Pool options replacing the values from the settings.
+
+    Returns:
+        AsyncEngine: The configured async SQLAlchemy engine.
+    """
+    options = {**get_settings().pool_options(), **overrides}
+    pool_kwargs = {}
+    if not url.startswith("sqlite"):
+        pool_kwargs = {
+            "pool_size": options["pool_size"],
+            "max_overflow": options["max_overflow"],
+            "pool_timeout": options["pool_timeout"],
+            "pool_recycle": options["pool_recycle"],
+        }
+    async_engine = create_async_engine(
+        url, pool_pre_ping=options["pre_ping"] == "always", **pool_kwargs
+    )
+    install_pool_listeners(
+        async_engine.sync_engine, options["pre_ping"], options["pre_ping_idle"]
+    )
+    return async_engine
+
+
+def configure_database(settings: Settings):
+    """
+    Use the given settings for every engine created from now on.
+
+    Engines built with previous settings are disposed; new ones are only
+    created when a session first needs them.
+    """
+    global _settings, _replica_health  # pylint: disable=global-statement
+    dispose_engines()
+    with _lock:
+        _settings = settings
+        _replica_health = None
+
+
+def get_settings() -> Settings:
+    """Return the configured settings, reading the environment if needed."""
+    global _settings  # pylint: disable=global-statement
+    if _settings is None:
+        with _lock:
+            if _settings is None:
+                _settings = Settings.from_env()
+    return _settings
+
+
+def _get_or_create(name: str, factory):
+    engine = _engines.get(name)
+    if engine is None:
+        with _lock:
+            engine = _engines.get(name)
+            if engine is None:
+                engine = _engines[name] = factory()
+    return engine
+
+
+def get_engine():
+    """Return the primary engine, creating it on first use."""
+    return _get_or_create("primary", lambda: build_engine(get_settings().database_url))
+
+
+def get_replica_engine():
+    """Return the read replica engine, or None when no replica is configured."""
+    url = get_settings().replica_database_url
+    if not url:
+        return None
+    return _get_or_create("replica", lambda: build_engine(url))
+
+
+def get_async_engine():
+    """Return the async engine, creating it on first use."""
+    return _get_or_create(
+        "async", lambda: build_async_engine(get_settings().async_database_url)
+    )
+
+
+def get_replica_health() -> ReplicaHealth:
+    """Return the replica health tracker shared by every read session."""
+    global _replica_health  # pylint: disable=global-statement
+    if _replica_health is None:
+        with _lock:
+            if _replica_health is None:
+                _replica_health = ReplicaHealth(get_settings().db_replica_retry_seconds)
+    return _replica_health
+
+
+def dispose_engines():
+    """Close the pools of every engine created so far."""
+    with _lock:
+        engines = list(_engines.values())
+        _engines.clear()
+    for engine in engines:
+        # AsyncEngine.dispose is a coroutine; its sync_engine shares the same pool.
+        getattr(engine, "sync_engine", engine).dispose()
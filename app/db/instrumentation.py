@@ -0,0 +1,187 @@
+"""SQL instrumentation attributing every statement to the request that ran it.
+
+Engine-wide ``before/after_cursor_execute`` hooks time each statement and add
+it to the ``RequestQueries`` of the current request, which the HTTP middleware
+installed by ``create_app`` stores in a context variable. Context variables are
+copied into the threadpool used by sync routes and into the greenlets of the
+async engine, so both stacks are covered.
+
+When a request finishes, its totals are folded into per-route ``RouteStats``.
+A statement shape (the SQL with literals and parameter lists collapsed) that
+repeats ``n_plus_one_threshold`` times within one request is reported as an
+N+1 pattern, typically a lazy-loaded relationship serialized per row.
+Statements over the slow query threshold are also handed to the slow query log.
+"""
+
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.db.slow_query_log import slow_query_log
+
+DEFAULT_N_PLUS_ONE_THRESHOLD = 5
+
+_IN_LIST = re.compile(r"\(\s*(?:\?|%s|:\w+|%\(\w+\)s)(?:\s*,\s*(?:\?|%s|:\w+|%\(\w+\)s))*\s*\)")
+_LITERAL = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SPACES = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Normalize a statement so repetitions differing only in values compare equal."""
+    shape = _SPACES.sub(" ", statement).strip()
+    shape = _LITERAL.sub("?", shape)
+    return _IN_LIST.sub("(?)", shape)
+
+
+class RequestQueries:
+    """Statements executed while serving a single request."""
+
+    def __init__(self, method: str = "", scope: Optional[dict] = None):
+        self.method = method
+        self.scope = scope if scope is not None else {}
+        self.count = 0
+        self.total_ms = 0.0
+        self.slowest_ms = 0.0
+        self.slowest_statement = None
+        self.shapes = Counter()
+
+    @property
+    def route(self) -> Optional[str]:
+        """The matched route, e.g. ``GET /egg/{egg_id}``, once routing happened."""
+        route = self.scope.get("route")
+        return f"{self.method} {route.path}" if route is not None else None
+
+    def record(self, statement: str, elapsed_ms: float):
+        """Add one executed statement."""
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.shapes[statement_shape(statement)] += 1
+        if elapsed_ms >= self.slowest_ms:
+            self.slowest_ms = elapsed_ms
+            self.slowest_statement = statement
+
+    def repeated_shapes(self, threshold: int) -> list:
+        """Return the statement shapes executed at least ``threshold`` times."""
+        return [shape for shape, count in self.shapes.items() if count >= threshold]
+
+
+class RouteStats:
+    """Query statistics aggregated per route across requests."""
+
+    def __init__(self, n_plus_one_threshold: int = DEFAULT_N_PLUS_ONE_THRESHOLD):
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def record(self, route: str, queries: RequestQueries):
+        """Fold the statements of one finished request into its route."""
+        repeated = queries.repeated_shapes(self.n_plus_one_threshold)
+        with self._lock:
+            stats = self._routes.setdefault(
+                route,
+                {
+                    "route": route,
+                    "requests": 0,
+                    "queries": 0,
+                    "max_queries": 0,
+                    "db_ms": 0.0,
+                    "slowest_ms": 0.0,
+                    "slowest_statement": None,
+                    "n_plus_one_requests": 0,
+                    "n_plus_one_statements": [],
+                },
+            )
+            stats["requests"] += 1
+            stats["queries"] += queries.count
+            stats["max_queries"] = max(stats["max_queries"], queries.count)
+            stats["db_ms"] += queries.total_ms
+            if queries.slowest_statement and queries.slowest_ms >= stats["slowest_ms"]:
+                stats["slowest_ms"] = queries.slowest_ms
+                stats["slowest_statement"] = queries.slowest_statement
+            if repeated:
+                stats["n_plus_one_requests"] += 1
+                for shape in repeated:
+                    if shape not in stats["n_plus_one_statements"]:
+                        stats["n_plus_one_statements"].append(shape)
+
+    def snapshot(self) -> list:
+        """Return the per-route statistics, most DB time first."""
+        with self._lock:
+            routes = [dict(stats) for stats in self._routes.values()]
+        for stats in routes:
+            stats["n_plus_one_statements"] = list(stats["n_plus_one_statements"])
+            stats["avg_queries"] = round(stats["queries"] / stats["requests"], 3)
+            stats["db_ms"] = round(stats["db_ms"], 3)
+            stats["avg_db_ms"] = round(stats["db_ms"] / stats["requests"], 3)
+            stats["slowest_ms"] = round(stats["slowest_ms"], 3)
+        return sorted(routes, key=lambda stats: stats["db_ms"], reverse=True)
+
+    def reset(self):
+        """Forget every recorded route."""
+        with self._lock:
+            self._routes.clear()
+
+
+route_stats = RouteStats()
+
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("sql_request_queries", default=None)
+
+
+def start_request(method: str, scope: dict) -> RequestQueries:
+    """Start collecting the statements of the request described by an ASGI scope."""
+    queries = RequestQueries(method, scope)
+    _current.set(queries)
+    return queries
+
+
+def current_request() -> Optional[RequestQueries]:
+    """Return the statements collected for the current request, if any."""
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # pylint: disable=unused-argument,too-many-arguments
+    conn.info.setdefault("sql_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # pylint: disable=unused-argument,too-many-arguments
+    elapsed_ms = (time.perf_counter() - conn.info["sql_started"].pop()) * 1000
+    queries = _current.get()
+    if queries is not None:
+        queries.record(statement, elapsed_ms)
+    slow_query_log.observe(
+        conn,
+        statement,
+        parameters,
+        elapsed_ms,
+        _route_label(queries),
+        executemany,
+    )
+
+
+def _route_label(queries: Optional[RequestQueries]) -> Optional[str]:
+    if queries is None:
+        return None
+    return queries.route or f"{queries.method} {queries.scope.get('path', '')}"
+
+
+def _handle_error(context):
+    # a failed statement never reaches after_cursor_execute
+    started = context.connection.info.get("sql_started") if context.connection else None
+    if started:
+        started.pop()
+
+
+def install_sql_instrumentation():
+    """Register the statement hooks on every engine; safe to call repeatedly."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
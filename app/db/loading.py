@@ -0,0 +1,70 @@
+"""
+Eager-loading policy derived from the response models.
+
+Serialising an ORM object with a response model reads every relationship the
+model declares; without eager loads that is one lazy query per row and
+relationship (and async sessions cannot lazy-load at all). ``response_options``
+walks the fields of a response model and returns the loader options matching
+the relationships they read, recursively:
+
+* many-to-one and one-to-one relationships use ``joinedload``, which adds a
+  LEFT OUTER JOIN to the same query;
+* collections use ``selectinload``, one extra ``IN`` query per collection for
+  the whole result, which avoids multiplying the joined rows.
+
+Repositories apply the options of the model their routes respond with, so a
+list costs the same number of queries whatever its length.
+"""
+
+import functools
+import typing
+
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import joinedload, selectinload
+
+
+def _nested_model(annotation):
+    """Return the response model inside ``Optional[...]``/``List[...]``, if any."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for argument in typing.get_args(annotation):
+        model = _nested_model(argument)
+        if model is not None:
+            return model
+    return None
+
+
+def _loaders(entity, schema, parent=None) -> list:
+    relationships = inspect(entity).relationships
+    loaders = []
+    for name, field in schema.model_fields.items():
+        nested = _nested_model(field.annotation)
+        if nested is None or name not in relationships:
+            continue
+        relationship = relationships[name]
+        attribute = getattr(entity, name)
+        strategy = selectinload if relationship.uselist else joinedload
+        loader = (
+            strategy(attribute)
+            if parent is None
+            else getattr(parent, strategy.__name__)(attribute)
+        )
+        loaders.append(loader)
+        loaders.extend(_loaders(relationship.mapper.class_, nested, loader))
+    return loaders
+
+
+@functools.lru_cache(maxsize=None)
+def response_options(entity, schema) -> tuple:
+    """
+    Loader options for querying ``entity`` rows serialised with ``schema``.
+
+    Args:
+        entity: The mapped class being queried.
+        schema (type[BaseModel]): The response model of the route.
+
+    Returns:
+        tuple: Options for ``Query.options``/``Select.options``.
+    """
+    return tuple(_loaders(entity, schema))
@@ -0,0 +1,169 @@
+"""Schema migration command, run once per deploy before the workers start.
+
+    python -m app.db.migrate            # apply pending migrations
+    python -m app.db.migrate --status   # list applied and pending versions
+
+Concurrent runs (several containers starting together) are serialized with a
+MySQL advisory lock, so exactly one of them applies the pending migrations and
+the others find nothing left to do.
+"""
+
+import argparse
+import importlib
+import pkgutil
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Optional
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, select, text
+
+from app.db import migrations
+from app.db.database import get_engine, get_settings
+
+LOCK_NAME = "golden_egg_schema_migrations"
+
+version_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    version_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("description", String(200), nullable=False),
+    Column("applied_at", DateTime, nullable=False),
+)
+
+
+class MigrationLockTimeout(RuntimeError):
+    """Raised when another process holds the migration lock for too long."""
+
+
+def load_migrations() -> list:
+    """
+    Import every ``mNNNN_*`` module of the migrations package.
+
+    Returns:
+        list: The migration modules sorted by VERSION.
+    """
+    modules = [
+        importlib.import_module(f"{migrations.__name__}.{info.name}")
+        for info in pkgutil.iter_modules(migrations.__path__)
+        if info.name[:1] == "m" and info.name[1:5].isdigit()
+    ]
+    modules.sort(key=lambda module: module.VERSION)
+    versions = [module.VERSION for module in modules]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError(f"Duplicate migration versions: {versions}")
+    return modules
+
+
+@contextmanager
+def advisory_lock(connection, timeout: float):
+    """
+    Hold a server-wide named lock for the lifetime of the block.
+
+    MySQL's GET_LOCK is bound to the session, not to a transaction, so it stays
+    held across the commits of the individual migrations. Other backends (the
+    SQLite files used locally and in tests) have a single writer and need none.
+
+    Raises:
+        MigrationLockTimeout: If the lock is not acquired within ``timeout`` seconds.
+    """
+    if connection.dialect.name not in ("mysql", "mariadb"):
+        yield
+        return
+    acquired = connection.execute(
+        text("SELECT GET_LOCK(:name, :timeout)"),
+        {"name": LOCK_NAME, "timeout": int(timeout)},
+    ).scalar()
+    connection.commit()
+    if acquired != 1:
+        raise MigrationLockTimeout(
+            f"Could not acquire migration lock {LOCK_NAME!r} within {timeout}s"
+        )
+    try:
+        yield
+    finally:
+        connection.rollback()
+        connection.execute(text("SELECT RELEASE_LOCK(:name)"), {"name": LOCK_NAME})
+        connection.commit()
+
+
+def applied_versions(connection) -> set:
+    """Return the versions recorded in the schema_migrations table."""
+    version_metadata.create_all(connection, checkfirst=True)
+    versions = set(connection.execute(select(schema_migrations.c.version)).scalars())
+    connection.commit()
+    return versions
+
+
+def migrate(engine=None, lock_timeout: Optional[float] = None) -> list:
+    """
+    Apply every pending migration, each one in its own transaction.
+
+    Args:
+        engine (Engine, optional): Target database. Defaults to the primary engine.
+        lock_timeout (float, optional): Seconds to wait for the migration lock.
+        Defaults to the configured ``migration_lock_timeout``.
+
+    Returns:
+        list: The versions applied by this call.
+    """
+    engine = engine or get_engine()
+    if lock_timeout is None:
+        lock_timeout = get_settings().migration_lock_timeout
+    applied = []
+    with engine.connect() as connection:
+        with advisory_lock(connection, lock_timeout):
+            done = applied_versions(connection)
+            for module in load_migrations():
+                if module.VERSION in done:
+                    continue
+                module.upgrade(connection)
+                connection.execute(
+                    schema_migrations.insert().values(
+                        version=module.VERSION,
+                        description=module.DESCRIPTION,
+                        applied_at=datetime.utcnow(),
+                    )
+                )
+                connection.commit()
+                applied.append(module.VERSION)
+    return applied
+
+
+def status(engine=None) -> list:
+    """
+    Describe every known migration.
+
+    Returns:
+        list: ``(version, description, applied)`` tuples in version order.
+    """
+    engine = engine or get_engine()
+    with engine.connect() as connection:
+        done = applied_versions(connection)
+    return [
+        (module.VERSION, module.DESCRIPTION, module.VERSION in done)
+        for module in load_migrations()
+    ]
+
+
+def main(argv=None):
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Apply database schema migrations.")
+    parser.add_argument(
+        "--status", action="store_true", help="list migrations without applying them"
+    )
+    args = parser.parse_args(argv)
+    if args.status:
+        for version, description, done in status():
+            print(f"{version:04d} {'applied' if done else 'pending':8} {description}")
+        return
+    applied = migrate()
+    if applied:
+        print("Applied migrations: " + ", ".join(f"{v:04d}" for v in applied))
+    else:
+        print("Schema is up to date.")
+
+
+if __name__ == "__main__":
+    main()
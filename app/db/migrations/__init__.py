@@ -0,0 +1,86 @@
+"""
+Versioned schema migrations applied by ``python -m app.db.migrate``.
+
+Each ``mNNNN_<name>.py`` module defines ``VERSION``, ``DESCRIPTION`` and
+``upgrade(connection)``. The helpers below are idempotent so a migration can
+adopt a database whose tables were created earlier by ``create_all``.
+"""
+
+# pylint: disable=unused-import
+
+from sqlalchemy import inspect
+from sqlalchemy.schema import CreateIndex
+from app.db.database import Base
+
+# Register every model on Base.metadata.
+from app.Auth import revoked_token_model  # noqa: F401
+from app.Bill import bill_model  # noqa: F401
+from app.Egg import egg_model  # noqa: F401
+from app.Egg import stock_summary_model  # noqa: F401
+from app.Order import order_model  # noqa: F401
+from app.OrderEgg import order_egg_model  # noqa: F401
+from app.Pay import pay_model  # noqa: F401
+from app.Report import report_model  # noqa: F401
+from app.Reservation import reservation_model  # noqa: F401
+from app.Role import role_model  # noqa: F401
+from app.Supplier import supplier_model  # noqa: F401
+from app.TypeEgg import typeegg_model  # noqa: F401
+from app.User import user_model  # noqa: F401
+from app.UserRole import userrole_model  # noqa: F401
+from app.WebVisit import webvisit_model  # noqa: F401
+
+
+def create_tables(connection, *table_names: str):
+    """Create the given tables from the model metadata unless they already exist."""
+    tables = [Base.metadata.tables[name] for name in table_names]
+    Base.metadata.create_all(connection, tables=tables, checkfirst=True)
+
+
+def add_column(connection, table_name: str, column_name: str):
+    """Add a column declared on the model to an existing table, if missing."""
+    existing = {column["name"] for column in inspect(connection).get_columns(table_name)}
+    if column_name in existing:
+        return
+    column = Base.metadata.tables[table_name].c[column_name]
+    column_type = column.type.compile(dialect=connection.dialect)
+    ddl = (
+        f"ALTER TABLE {_quote(connection, table_name)} "
+        f"ADD COLUMN {_quote(connection, column_name)} {column_type}"
+    )
+    if column.server_default is not None:
+        default = column.server_default.arg
+        ddl += f" DEFAULT {getattr(default, 'text', default)}"
+    if not column.nullable:
+        ddl += " NOT NULL"
+    connection.exec_driver_sql(ddl)
+
+
+def alter_column_type(connection, table_name: str, column_name: str):
+    """
+    Change a column to the type declared on the model.
+
+    SQLite does not enforce declared lengths, so only MySQL needs the DDL.
+    """
+    if connection.dialect.name not in ("mysql", "mariadb"):
+        return
+    column = Base.metadata.tables[table_name].c[column_name]
+    column_type = column.type.compile(dialect=connection.dialect)
+    nullable = "NULL" if column.nullable else "NOT NULL"
+    connection.exec_driver_sql(
+        f"ALTER TABLE {_quote(connection, table_name)} MODIFY COLUMN "
+        f"{_quote(connection, column_name)} {column_type} {nullable}"
+    )
+
+
+def create_index(connection, table_name: str, index_name: str):
+    """Create an index declared on the model, if missing."""
+    existing = {index["name"] for index in inspect(connection).get_indexes(table_name)}
+    if index_name in existing:
+        return
+    table = Base.metadata.tables[table_name]
+    index = next(index for index in table.indexes if index.name == index_name)
+    connection.execute(CreateIndex(index))
+
+
+def _quote(connection, name: str) -> str:
+    return connection.dialect.identifier_preparer.quote(name)
@@ -0,0 +1,25 @@
+"""Initial schema: the tables previously created by create_all at import time."""
+
+from app.db.migrations import create_tables
+
+VERSION = 1
+DESCRIPTION = "initial schema"
+
+
+def upgrade(connection):
+    """Create the original tables, adopting any that already exist."""
+    create_tables(
+        connection,
+        "role",
+        "user",
+        "users_roles",
+        "supplier",
+        "typeEgg",
+        "egg",
+        "orders",
+        "order_egg",
+        "bill",
+        "payment",
+        "reports",
+        "web_visit",
+    )
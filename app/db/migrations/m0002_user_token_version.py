@@ -0,0 +1,11 @@
+"""Token version of each user, embedded in JWTs so they can be revoked."""
+
+from app.db.migrations import add_column
+
+VERSION = 2
+DESCRIPTION = "user token version"
+
+
+def upgrade(connection):
+    """Add user.token_version, starting every existing user at 0."""
+    add_column(connection, "user", "token_version")
@@ -0,0 +1,11 @@
+"""Widen user.password: bcrypt hashes are 60 characters, more than String(50)."""
+
+from app.db.migrations import alter_column_type
+
+VERSION = 3
+DESCRIPTION = "user password hash length"
+
+
+def upgrade(connection):
+    """Store full-length password hashes."""
+    alter_column_type(connection, "user", "password")
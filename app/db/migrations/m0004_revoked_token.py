@@ -0,0 +1,11 @@
+"""Revoked token IDs of the refresh token flow."""
+
+from app.db.migrations import create_tables
+
+VERSION = 4
+DESCRIPTION = "revoked tokens"
+
+
+def upgrade(connection):
+    """Create the revoked_token table."""
+    create_tables(connection, "revoked_token")
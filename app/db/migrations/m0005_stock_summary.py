@@ -0,0 +1,18 @@
+"""Per-type stock summary, backfilled from the egg lots."""
+
+from app.db.migrations import create_tables
+
+VERSION = 5
+DESCRIPTION = "stock summary"
+
+
+def upgrade(connection):
+    """Create stock_summary and fill it from the current egg table."""
+    create_tables(connection, "stock_summary")
+    connection.exec_driver_sql("DELETE FROM stock_summary")
+    connection.exec_driver_sql(
+        "INSERT INTO stock_summary (type_egg_id, color, supplier_id, quantity, value) "
+        "SELECT type_egg_id, color, COALESCE(supplier_id, 0), "
+        "SUM(avalibleQuantity), SUM(avalibleQuantity * entryPrice) "
+        "FROM egg GROUP BY type_egg_id, color, COALESCE(supplier_id, 0)"
+    )
@@ -0,0 +1,11 @@
+"""Index for first-expiry-first-out allocation of egg lots."""
+
+from app.db.migrations import create_index
+
+VERSION = 6
+DESCRIPTION = "egg FEFO index"
+
+
+def upgrade(connection):
+    """Index egg lots by type and expiration date."""
+    create_index(connection, "egg", "ix_egg_fefo")
@@ -0,0 +1,11 @@
+"""Version counter of egg lots, for optimistic concurrency control."""
+
+from app.db.migrations import add_column
+
+VERSION = 7
+DESCRIPTION = "egg version"
+
+
+def upgrade(connection):
+    """Add egg.version, starting every existing lot at 1."""
+    add_column(connection, "egg", "version")
@@ -0,0 +1,12 @@
+"""Sharded stock counters for hot egg types."""
+
+from app.db.migrations import add_column, create_tables
+
+VERSION = 8
+DESCRIPTION = "stock shards"
+
+
+def upgrade(connection):
+    """Create stock_shard and add typeEgg.stock_shards, unsharded by default."""
+    create_tables(connection, "stock_shard")
+    add_column(connection, "typeEgg", "stock_shards")
@@ -0,0 +1,11 @@
+"""Timed stock reservations held while customers pay."""
+
+from app.db.migrations import create_tables
+
+VERSION = 9
+DESCRIPTION = "reservations"
+
+
+def upgrade(connection):
+    """Create the reservation table and its expiry index."""
+    create_tables(connection, "reservation")
@@ -0,0 +1,11 @@
+"""Index of revocation times, read back by every revocation sync."""
+
+from app.db.migrations import create_index
+
+VERSION = 10
+DESCRIPTION = "revoked token time index"
+
+
+def upgrade(connection):
+    """Index revoked_token by revocation time."""
+    create_index(connection, "revoked_token", "ix_revoked_token_revoked_at")
@@ -0,0 +1,24 @@
+"""Price of reserved eggs, fixed when the reservation is made."""
+
+from sqlalchemy import select, update
+from app.db.database import Base
+from app.db.migrations import add_column
+
+VERSION = 11
+DESCRIPTION = "reservation unit price"
+
+
+def upgrade(connection):
+    """Add reservation.unit_price, pricing existing holds at their lot's sell price."""
+    add_column(connection, "reservation", "unit_price")
+    reservation = Base.metadata.tables["reservation"]
+    egg = Base.metadata.tables["egg"]
+    connection.execute(
+        update(reservation)
+        .where(reservation.c.unit_price.is_(None))
+        .values(
+            unit_price=select(egg.c.sellPrice)
+            .where(egg.c.id == reservation.c.egg_id)
+            .scalar_subquery()
+        )
+    )
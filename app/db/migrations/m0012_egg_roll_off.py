@@ -0,0 +1,12 @@
+"""Flag of expired egg lots taken out of the stock summary."""
+
+from app.db.migrations import add_column, create_index
+
+VERSION = 12
+DESCRIPTION = "egg roll off"
+
+
+def upgrade(connection):
+    """Add egg.rolled_off, counting every existing lot, and index it by expiry."""
+    add_column(connection, "egg", "rolled_off")
+    create_index(connection, "egg", "ix_egg_roll_off")
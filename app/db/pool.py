@@ -0,0 +1,187 @@
+"""Instrumented connection pool and pre-ping strategies for the SQLAlchemy engine."""
+
+import os
+import threading
+import time
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+from app.utils.histogram import Histogram
+
+PRE_PING_STRATEGIES = ("always", "idle", "never")
+
+
+class PoolStats:
+    """Counters and latency histograms collected by InstrumentedQueuePool."""
+
+    def __init__(self):
+        self.wait = Histogram()
+        self.checkout = Histogram()
+        self.held = Histogram()
+        self.timeouts = 0
+        self.connects = 0
+        self.invalidations = 0
+        self.peak_checked_out = 0
+        self._lock = threading.Lock()
+
+    def record_timeout(self):
+        """Count a checkout that gave up after pool_timeout seconds."""
+        with self._lock:
+            self.timeouts += 1
+
+    def record_connect(self):
+        """Count a brand new DBAPI connection opened by the pool."""
+        with self._lock:
+            self.connects += 1
+
+    def record_invalidation(self):
+        """Count a pooled connection discarded as broken or stale."""
+        with self._lock:
+            self.invalidations += 1
+
+    def record_checked_out(self, checked_out: int):
+        """Track the high-water mark of simultaneously checked-out connections."""
+        with self._lock:
+            self.peak_checked_out = max(self.peak_checked_out, checked_out)
+
+    def reset(self):
+        """Clear every counter and histogram."""
+        with self._lock:
+            self.timeouts = self.connects = self.invalidations = 0
+            self.peak_checked_out = 0
+        for histogram in (self.wait, self.checkout, self.held):
+            histogram.reset()
+
+    def snapshot(self) -> dict:
+        """Return the collected statistics as a plain dictionary."""
+        return {
+            "peak_checked_out": self.peak_checked_out,
+            "connects": self.connects,
+            "invalidations": self.invalidations,
+            "timeouts": self.timeouts,
+            "wait_ms": self.wait.snapshot(),
+            "checkout_ms": self.checkout.snapshot(),
+            "held_ms": self.held.snapshot(),
+        }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that records how long callers wait for a connection.
+
+    ``wait_ms`` measures the time spent inside the pool queue (including
+    opening a new connection when the pool grows), while ``checkout_ms``
+    measures the complete checkout, pre-ping round trips included.
+    ``held_ms`` measures how long a connection stays checked out.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.stats.record_timeout()
+            raise
+        finally:
+            self.stats.wait.observe((time.perf_counter() - started) * 1000)
+
+    def connect(self):
+        started = time.perf_counter()
+        connection = super().connect()
+        self.stats.checkout.observe((time.perf_counter() - started) * 1000)
+        self.stats.record_checked_out(self.checkedout())
+        return connection
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.stats = self.stats
+        return pool
+
+
+def install_pool_listeners(engine, pre_ping: str, pre_ping_idle: float):
+    """
+    Attach the statistics and pre-ping listeners to an engine's pool.
+
+    Args:
+        engine (Engine): The engine whose pool should be instrumented; for an
+            AsyncEngine, its ``sync_engine``.
+        pre_ping (str): "always" pings on every checkout (handled by SQLAlchemy),
+            "idle" pings only connections idle for more than ``pre_ping_idle``
+            seconds and "never" relies on pool_recycle and disconnect handling.
+        pre_ping_idle (float): Idle time in seconds after which "idle" pings.
+    """
+    if pre_ping not in PRE_PING_STRATEGIES:
+        raise ValueError(
+            f"DB_POOL_PRE_PING must be one of {', '.join(PRE_PING_STRATEGIES)}"
+        )
+    stats = getattr(engine.pool, "stats", None)
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(_dbapi_connection, connection_record):
+        connection_record.info["checked_in_at"] = time.monotonic()
+        if stats is not None:
+            stats.record_connect()
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(_dbapi_connection, connection_record, _connection_proxy):
+        connection_record.info["checked_out_at"] = time.monotonic()
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(_dbapi_connection, connection_record):
+        if connection_record is None:
+            return
+        now = time.monotonic()
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if stats is not None and checked_out_at is not None:
+            stats.held.observe((now - checked_out_at) * 1000)
+        connection_record.info["checked_in_at"] = now
+
+    @event.listens_for(engine, "invalidate")
+    def _on_invalidate(_dbapi_connection, _connection_record, _exception):
+        if stats is not None:
+            stats.record_invalidation()
+
+    if pre_ping == "idle":
+
+        @event.listens_for(engine, "checkout")
+        def _ping_idle(dbapi_connection, connection_record, _connection_proxy):
+            idle = time.monotonic() - connection_record.info.get("checked_in_at", 0)
+            if idle < pre_ping_idle:
+                return
+            try:
+                # the dialect's ping also works on the adapted async drivers
+                engine.dialect.do_ping(dbapi_connection)
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                # The pool discards the connection and retries with a fresh one.
+                raise exc.DisconnectionError() from error
+
+
+def pool_status(engine) -> dict:
+    """
+    Describe the live state of an engine's connection pool.
+
+    Args:
+        engine (Engine): The engine to inspect.
+
+    Returns:
+        dict: Pool occupancy plus the statistics gathered by InstrumentedQueuePool.
+    """
+    pool = engine.pool
+    status = {"pool_class": type(pool).__name__, "worker_pid": os.getpid()}
+    if isinstance(pool, QueuePool):
+        status.update(
+            {
+                "size": pool.size(),
+                "checked_in": pool.checkedin(),
+                "checked_out": pool.checkedout(),
+                "overflow": max(pool.overflow(), 0),
+                "timeout": pool.timeout(),
+            }
+        )
+    stats = getattr(pool, "stats", None)
+    if stats is not None:
+        status.update(stats.snapshot())
+    return status
@@ -0,0 +1,83 @@
+"""
+Retry of transactions aborted by lock conflicts.
+
+Under concurrent checkouts the database may abort a transaction to break a
+deadlock or to preserve serializability. Such a transaction did nothing and
+can simply be run again: ``run_transaction`` rolls it back and reruns it with
+exponential backoff and jitter, so competing requests do not collide again in
+lockstep.
+"""
+
+import random
+import time
+from typing import Callable, Optional
+
+from fastapi import HTTPException
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+
+from app.db.database import get_settings
+
+# SQLSTATEs of a serialization failure and of a detected deadlock.
+RETRYABLE_SQLSTATES = frozenset({"40001", "40P01"})
+# MySQL error codes of a lock wait timeout and of a deadlock.
+RETRYABLE_MYSQL_ERRORS = frozenset({1205, 1213})
+
+
+def is_retryable(error: DBAPIError) -> bool:
+    """Whether the database aborted the transaction only because of a conflict."""
+    orig = error.orig
+    if getattr(orig, "sqlstate", None) in RETRYABLE_SQLSTATES:
+        return True
+    if getattr(orig, "pgcode", None) in RETRYABLE_SQLSTATES:
+        return True
+    args = getattr(orig, "args", ())
+    if args and args[0] in RETRYABLE_MYSQL_ERRORS:
+        return True
+    # SQLite gave up waiting for another connection's write lock
+    return "database is locked" in str(orig)
+
+
+def run_transaction(
+    db: Session,
+    work: Callable,
+    attempts: Optional[int] = None,
+    backoff: Optional[float] = None,
+):
+    """
+    Run ``work()`` and commit, rerunning it when a lock conflict aborts it.
+
+    ``work`` must do all of its reads and writes through ``db`` so a rerun
+    starts from a clean transaction. Any other error rolls back and propagates.
+
+    Args:
+        db (Session): Database session.
+        work (Callable): The body of the transaction; its result is returned.
+        attempts (int, optional): Total runs; defaults to ``db_retry_attempts``.
+        backoff (float, optional): First delay in seconds; defaults to
+        ``db_retry_backoff_seconds``.
+
+    Raises:
+        HTTPException: 503 when the conflicts persist after every attempt.
+    """
+    settings = get_settings()
+    attempts = max(1, attempts or settings.db_retry_attempts)
+    backoff = settings.db_retry_backoff_seconds if backoff is None else backoff
+    for attempt in range(attempts):
+        try:
+            result = work()
+            db.commit()
+            return result
+        except DBAPIError as error:
+            db.rollback()
+            if not is_retryable(error):
+                raise
+            if attempt == attempts - 1:
+                raise HTTPException(
+                    status_code=503, detail="Too many concurrent updates, please retry"
+                ) from error
+        except BaseException:
+            db.rollback()
+            raise
+        time.sleep(backoff * 2**attempt * random.uniform(0.5, 1.5))
+    return None
@@ -0,0 +1,82 @@
+"""Session that routes read-only statements to a replica engine."""
+
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+
+class ReplicaHealth:
+    """
+    Remembers that the replica failed so reads skip it for a while.
+
+    After ``retry_interval`` seconds the replica is tried again; a worker
+    therefore pays for at most one failed attempt per interval.
+    """
+
+    def __init__(self, retry_interval: float = 30):
+        self.retry_interval = retry_interval
+        self._down_until = 0.0
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        """Whether reads may be sent to the replica."""
+        return time.monotonic() >= self._down_until
+
+    def mark_down(self):
+        """Stop using the replica until the retry interval elapses."""
+        with self._lock:
+            self._down_until = time.monotonic() + self.retry_interval
+
+
+class RoutingSession(Session):
+    """
+    Session sending plain SELECTs to a replica and everything else to the primary.
+
+    The session pins itself to the primary as soon as it flushes or executes
+    any non-SELECT statement, so a request always reads its own writes. If the
+    replica cannot be reached the statement is retried on the primary and the
+    replica is skipped until ``ReplicaHealth`` allows a new attempt.
+    """
+
+    def __init__(self, primary, replica=None, replica_health=None, **kwargs):
+        super().__init__(**kwargs)
+        self.primary = primary
+        self.replica = replica
+        self.replica_health = replica_health or ReplicaHealth()
+        self.pinned_to_primary = False
+        self._last_bind = None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        """
+        Return the engine for a statement: the replica for a plain SELECT.
+
+        SQLAlchemy passes ``mapper`` and other keywords by name; only ``clause``
+        decides the engine, so the rest are accepted and ignored.
+        """
+        # pylint: disable=unused-argument
+        if self._flushing or not self._is_replica_read(clause):
+            self.pinned_to_primary = True
+        use_replica = (
+            self.replica is not None
+            and not self.pinned_to_primary
+            and self.replica_health.available()
+        )
+        self._last_bind = self.replica if use_replica else self.primary
+        return self._last_bind
+
+    @staticmethod
+    def _is_replica_read(clause) -> bool:
+        return isinstance(clause, Select) and clause._for_update_arg is None  # pylint: disable=protected-access
+
+    def execute(self, statement, *args, **kwargs):
+        """Execute a statement, retrying it on the primary if the replica fails."""
+        try:
+            return super().execute(statement, *args, **kwargs)
+        except exc.OperationalError:
+            if self.replica is None or self._last_bind is not self.replica:
+                raise
+            self.replica_health.mark_down()
+            self.rollback()
+            return super().execute(statement, *args, **kwargs)
@@ -1,16 +1,113 @@
-"""Database connection module for FastAPI application."""
+"""Database connection module for FastAPI application.
 
-from app.db.database import SessionLocal
+``get_db`` and ``get_read_db`` yield a ``LazySession``: the real session (and
+so the engine and a pooled connection) is only created when a route first
+uses it. Requests rejected by validation or authentication never touch the
+pool. The sessions of a request are registered with the ``release_sessions``
+middleware, which closes them as soon as the response has been produced
+instead of after it has been sent, returning the connection to the pool early.
+"""
+
+from contextvars import ContextVar
+from typing import Optional
+
+from app.db.database import (
+    AsyncSessionLocal,
+    ReadSessionLocal,
+    SessionLocal,
+    get_async_engine,
+    get_engine,
+    get_replica_engine,
+    get_replica_health,
+)
+
+_request_sessions: ContextVar[Optional[list]] = ContextVar("request_sessions", default=None)
+
+
+class LazySession:
+    """Proxy creating its session on first attribute access."""
+
+    def __init__(self, factory):
+        self._factory = factory
+        self._session = None
+
+    @property
+    def started(self) -> bool:
+        """Whether the underlying session has been created."""
+        return self._session is not None
+
+    def __getattr__(self, name):
+        if self._session is None:
+            self._session = self._factory()
+        return getattr(self._session, name)
+
+    def close(self):
+        """Close the underlying session, releasing its connection, if it was used."""
+        if self._session is not None:
+            self._session.close()
+
+
+def track_request_sessions() -> list:
+    """Start collecting the sessions opened while serving the current request."""
+    sessions = []
+    _request_sessions.set(sessions)
+    return sessions
+
+
+def close_sessions(sessions: list):
+    """Close the given sessions; sessions that were never used are skipped."""
+    for session in sessions:
+        session.close()
+
+
+def _lazy_session(factory) -> LazySession:
+    session = LazySession(factory)
+    sessions = _request_sessions.get()
+    if sessions is not None:
+        sessions.append(session)
+    return session
 
 
 def get_db():
     """
     Dependency that provides a database session for FastAPI routes.
     Yields:
-        Session: A database session object.
+        LazySession: A database session created on first use.
     """
-    db = SessionLocal()
+    db = _lazy_session(lambda: SessionLocal(bind=get_engine()))
     try:
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    """
+    Dependency that provides a session for read-only routes.
+
+    SELECTs go to the read replica when one is configured and reachable;
+    writes, and every statement after the first write, go to the primary.
+    Yields:
+        LazySession: A RoutingSession created on first use.
+    """
+    db = _lazy_session(
+        lambda: ReadSessionLocal(
+            primary=get_engine(),
+            replica=get_replica_engine(),
+            replica_health=get_replica_health(),
+        )
+    )
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    """
+    Dependency that provides an async database session for async routes.
+    Yields:
+        AsyncSession: An async database session object.
+    """
+    async with AsyncSessionLocal(bind=get_async_engine()) as db:
+        yield db
@@ -0,0 +1,201 @@
+"""Slow query log written as JSON lines, with the EXPLAIN plan of each statement.
+
+Statements slower than the configured threshold are recorded with the route
+that ran them. Bound values (password hashes, emails...) are redacted unless
+parameter logging is turned on; executemany batches only record their size.
+For SELECT statements the plan is captured with ``EXPLAIN`` (``EXPLAIN QUERY
+PLAN`` on SQLite) on a separate pooled connection, from a background thread so
+the request is not delayed further. A single thread runs the EXPLAINs, so at
+most one pooled connection is borrowed for them; when ``MAX_PENDING_EXPLAINS``
+are already waiting, further statements are logged without a plan.
+"""
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Optional
+
+# Execution option marking the EXPLAIN connection so its own statements are skipped.
+SKIP_OPTION = "skip_slow_query_log"
+
+# Stands for every bound value when parameters are not logged.
+REDACTED = "?"
+
+# EXPLAINs queued at most; beyond it slow statements are logged without a plan.
+MAX_PENDING_EXPLAINS = 16
+
+# Bytes read per step when ``tail`` scans the log backwards.
+TAIL_BLOCK_SIZE = 8192
+
+
+def redact(parameters):
+    """Replace every bound value with a placeholder, keeping names and positions."""
+    if isinstance(parameters, dict):
+        return {name: REDACTED for name in parameters}
+    if isinstance(parameters, (list, tuple)):
+        return [REDACTED] * len(parameters)
+    return None if parameters is None else REDACTED
+
+
+class SlowQueryLog:
+    """Append-only JSON lines log of the statements exceeding a threshold."""
+
+    def __init__(
+        self,
+        path: str = "slow_queries.log",
+        threshold_ms: Optional[float] = None,
+        explain: bool = True,
+        log_parameters: bool = False,
+    ):
+        self.path = path
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.log_parameters = log_parameters
+        self._executor = None
+        self._pending = set()
+        self._lock = threading.Lock()
+        self.explains_dropped = 0
+
+    def configure(
+        self,
+        path: str,
+        threshold_ms: Optional[float],
+        explain: bool,
+        log_parameters: bool = False,
+    ):
+        """Apply new settings; a threshold of None disables the log."""
+        self.wait()
+        self.path = path
+        self.threshold_ms = threshold_ms
+        self.explain = explain
+        self.log_parameters = log_parameters
+
+    def observe(self, conn, statement, parameters, elapsed_ms, route, executemany):
+        # pylint: disable=too-many-arguments
+        """Record the statement if it ran slower than the threshold."""
+        if self.threshold_ms is None or elapsed_ms < self.threshold_ms:
+            return
+        if conn.get_execution_options().get(SKIP_OPTION):
+            return
+        entry = {
+            "timestamp": datetime.utcnow().isoformat(timespec="milliseconds") + "Z",
+            "worker_pid": os.getpid(),
+            "route": route,
+            "duration_ms": round(elapsed_ms, 3),
+            "statement": statement,
+            "parameters": None,
+            "explain": None,
+        }
+        if executemany:
+            # a whole batch, e.g. an import chunk with every password hash
+            entry["batch_size"] = len(parameters)
+        else:
+            entry["parameters"] = parameters if self.log_parameters else redact(parameters)
+        explainable = (
+            self.explain
+            and not executemany
+            and statement.lstrip()[:6].upper() == "SELECT"
+        )
+        if not explainable:
+            self._write(entry)
+            return
+        with self._lock:
+            saturated = len(self._pending) >= MAX_PENDING_EXPLAINS
+            if saturated:
+                self.explains_dropped += 1
+        if saturated:
+            self._write(entry)
+            return
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="slow-query-explain"
+                )
+            future = self._executor.submit(
+                self._explain_and_write, conn.engine, entry, parameters
+            )
+            self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+
+    def _explain_and_write(self, engine, entry, parameters):
+        try:
+            entry["explain"] = explain_statement(engine, entry["statement"], parameters)
+        except Exception as error:  # pylint: disable=broad-except
+            entry["explain"] = [{"error": str(error)}]
+        self._write(entry)
+
+    def _write(self, entry):
+        line = json.dumps(entry, default=str) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as log_file:
+                log_file.write(line)
+
+    def wait(self):
+        """Block until every pending EXPLAIN has been written."""
+        with self._lock:
+            pending = list(self._pending)
+        for future in pending:
+            future.result()
+
+    def tail(self, limit: int = 50) -> list:
+        """
+        Return the most recent entries, newest first.
+
+        The log is read backwards from its end, only as far as needed.
+
+        Args:
+            limit (int): Maximum number of entries to return.
+
+        Returns:
+            list: The decoded log entries.
+        """
+        if limit <= 0 or not os.path.exists(self.path):
+            return []
+        lines = _last_lines(self.path, limit)
+        entries = []
+        for line in reversed(lines):
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                continue  # a line still being written by another worker
+        return entries
+
+
+def _last_lines(path: str, limit: int) -> list:
+    """Return up to ``limit`` last lines of a file, reading blocks from its end."""
+    with open(path, "rb") as log_file:
+        position = log_file.seek(0, os.SEEK_END)
+        data = b""
+        while position > 0 and data.count(b"\n") <= limit:
+            step = min(TAIL_BLOCK_SIZE, position)
+            position -= step
+            log_file.seek(position)
+            data = log_file.read(step) + data
+    lines = data.splitlines()
+    if position > 0:
+        lines = lines[1:]  # the first line read may start before the block
+    return [line.decode("utf-8", "replace") for line in lines[-limit:]]
+
+
+def explain_statement(engine, statement: str, parameters) -> list:
+    """
+    Capture the plan of a statement on a side connection.
+
+    Args:
+        engine (Engine): The engine that ran the statement.
+        statement (str): The SQL as sent to the driver.
+        parameters: The driver-level parameters of the statement.
+
+    Returns:
+        list: One dict per plan row.
+    """
+    prefix = "EXPLAIN QUERY PLAN" if engine.dialect.name == "sqlite" else "EXPLAIN"
+    with engine.connect() as side:
+        side = side.execution_options(**{SKIP_OPTION: True})
+        result = side.exec_driver_sql(f"{prefix} {statement}", parameters)
+        return [dict(row._mapping) for row in result]  # pylint: disable=protected-access
+
+
+slow_query_log = SlowQueryLog()
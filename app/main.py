@@ -1,62 +1,185 @@
 """Main entry point for FastAPI application, including all routers and database initialization."""
 
+import time
+
+IMPORT_STARTED = time.perf_counter()
+
+# pylint: disable=wrong-import-position
+
+import os
+from contextlib import asynccontextmanager
+from typing import Optional
+
+from fastapi import FastAPI, Request
+from starlette.concurrency import run_in_threadpool
+
 # App module imports
-from app.db.database import engine
-from app.User import user_router, user_model
-from app.Role import role_router, role_model
-from app.Supplier import supplier_router, supplier_model
-from app.Pay import pay_router, pay_model
-from app.Order import order_router, order_model
-from app.Report import report_router, report_model
-from app.Egg import egg_router, egg_model
-from app.Bill import bill_router, bill_model
-from app.OrderEgg import order_egg_model, order_egg_router
-from app.TypeEgg import typeegg_model, typeegg_router
-from app.UserRole import userrole_model
-from app.WebVisit import webvisit_router, webvisit_model
+from app.config import Settings
+from app.db.database import Base, configure_database, dispose_engines, get_engine
+from app.db.instrumentation import install_sql_instrumentation, route_stats, start_request
+from app.db.session import close_sessions, track_request_sessions
+from app.db.slow_query_log import slow_query_log
+from app.User import user_router, user_async_router
+from app.Role import role_router
+from app.Supplier import supplier_router
+from app.Pay import pay_router, pay_async_router
+from app.Order import order_router, order_async_router
+from app.Report import report_router
+from app.Egg import egg_router, egg_async_router
+from app.Bill import bill_router, bill_async_router
+from app.OrderEgg import order_egg_router
+from app.Reservation import reservation_router
+from app.TypeEgg import typeegg_router
+from app.WebVisit import webvisit_router
 from app.Auth import auth_router
-from fastapi import FastAPI
-
-# Create all tables
-user_model.Base.metadata.create_all(bind=engine)
-role_model.Base.metadata.create_all(bind=engine)
-supplier_model.Base.metadata.create_all(bind=engine)
-pay_model.Base.metadata.create_all(bind=engine)
-order_model.Base.metadata.create_all(bind=engine)
-report_model.Base.metadata.create_all(bind=engine)
-egg_model.Base.metadata.create_all(bind=engine)
-bill_model.Base.metadata.create_all(bind=engine)
-order_egg_model.Base.metadata.create_all(bind=engine)
-typeegg_model.Base.metadata.create_all(bind=engine)
-userrole_model.Base.metadata.create_all(bind=engine)
-webvisit_model.Base.metadata.create_all(bind=engine)
-
-
-# FastAPI app initialization
-app = FastAPI(
-    title="FastAPI",
-    root_path="/api",
-    docs_url="/docs",
-    redoc_url="/redoc",
-    openapi_url="/openapi.json",
-    swagger_ui_parameters={
-        "defaultmodelsExpandDepth": -1,
-        "persistAuthorization": True,
-    },
-)
+from app.Auth.auth_service import ACCESS_TOKEN_EXPIRE_MINUTES, principal_cache, token_cache
+from app.Auth.bcrypt_calibration import load_or_calibrate
+from app.Auth.password_pool import password_pool
+from app.Auth.token_revocation import revocation_list
+from app.Monitoring import monitoring_router
+from app.Reservation.reservation_reaper import reservation_reaper
+from app.User.user_availability import availability_filter
 
-# PYTHONPATH=/app pytest
 
-# routers
-app.include_router(user_router.router, prefix="/user")
-app.include_router(role_router.router, prefix="/role")
-app.include_router(supplier_router.router, prefix="/supplier")
-app.include_router(pay_router.router, prefix="/pay")
-app.include_router(order_router.router, prefix="/order")
-app.include_router(report_router.router, prefix="/report")
-app.include_router(egg_router.router, prefix="/egg")
-app.include_router(typeegg_router.router, prefix="/typeeggs")
-app.include_router(order_egg_router.router, prefix="/orderegg")
-app.include_router(bill_router.router, prefix="/bill")
-app.include_router(webvisit_router.router, prefix="/visit")
-app.include_router(auth_router.router)
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 3)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Startup and shutdown hooks of a worker."""
+    started = time.perf_counter()
+    settings = app.state.settings
+    if settings.create_schema_on_startup:
+        await run_in_threadpool(Base.metadata.create_all, bind=get_engine())
+    rounds = settings.bcrypt_rounds or await run_in_threadpool(
+        load_or_calibrate, settings.bcrypt_rounds_file, settings.bcrypt_target_ms
+    )
+    password_pool.set_rounds(rounds)
+    app.state.timings["startup_ms"] = _elapsed_ms(started)
+    app.state.timings["ready_ms"] = _elapsed_ms(IMPORT_STARTED)
+    reservation_reaper.start()
+    yield
+    await reservation_reaper.stop()
+    password_pool.shutdown()
+    dispose_engines()
+
+
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    """
+    Build the FastAPI application.
+
+    No database connection is opened here: engines are created on first use
+    and the optional schema creation runs in the startup hook.
+
+    Args:
+        settings (Settings, optional): Configuration to use. Defaults to the
+        values read from the environment.
+
+    Returns:
+        FastAPI: The configured application.
+    """
+    created = time.perf_counter()
+    settings = settings or Settings.from_env()
+    configure_database(settings)
+
+    # FastAPI app initialization
+    app = FastAPI(
+        title="FastAPI",
+        root_path="/api",
+        docs_url="/docs",
+        redoc_url="/redoc",
+        openapi_url="/openapi.json",
+        swagger_ui_parameters={
+            "defaultmodelsExpandDepth": -1,
+            "persistAuthorization": True,
+        },
+        lifespan=lifespan,
+    )
+    app.state.settings = settings
+    app.state.timings = {"worker_pid": os.getpid(), "first_request_ms": None}
+
+    # async read routers take precedence over the sync routes sharing their paths
+    if settings.db_mode == "async":
+        app.include_router(user_async_router.router, prefix="/user")
+        app.include_router(egg_async_router.router, prefix="/egg")
+        app.include_router(order_async_router.router, prefix="/order")
+        app.include_router(bill_async_router.router, prefix="/bill")
+        app.include_router(pay_async_router.router, prefix="/pay")
+
+    # routers
+    app.include_router(user_router.router, prefix="/user")
+    app.include_router(role_router.router, prefix="/role")
+    app.include_router(supplier_router.router, prefix="/supplier")
+    app.include_router(pay_router.router, prefix="/pay")
+    app.include_router(order_router.router, prefix="/order")
+    app.include_router(report_router.router, prefix="/report")
+    app.include_router(egg_router.router, prefix="/egg")
+    app.include_router(typeegg_router.router, prefix="/typeeggs")
+    app.include_router(order_egg_router.router, prefix="/orderegg")
+    app.include_router(reservation_router.router, prefix="/reservation")
+    app.include_router(bill_router.router, prefix="/bill")
+    app.include_router(webvisit_router.router, prefix="/visit")
+    app.include_router(auth_router.router)
+    app.include_router(monitoring_router.router, prefix="/monitoring")
+
+    install_sql_instrumentation()
+    route_stats.n_plus_one_threshold = settings.sql_n_plus_one_threshold
+    principal_cache.configure(settings.principal_cache_size, settings.principal_cache_ttl)
+    token_cache.configure(settings.token_cache_size, ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+    revocation_list.configure(
+        settings.revocation_filter_capacity, settings.revocation_sync_seconds
+    )
+    availability_filter.configure(
+        settings.availability_filter_capacity,
+        settings.availability_sync_seconds,
+        settings.availability_rebuild_seconds,
+    )
+    password_pool.configure(settings.bcrypt_pool_workers, settings.bcrypt_pool_max_pending)
+    reservation_reaper.configure(
+        settings.reservation_reap_seconds, settings.reservation_reap_batch
+    )
+    slow_query_log.configure(
+        settings.slow_query_log_path,
+        settings.slow_query_ms,
+        settings.slow_query_explain,
+        settings.slow_query_log_parameters,
+    )
+
+    @app.middleware("http")
+    async def release_sessions(request: Request, call_next):
+        """Return the connections of the request to the pool once the response is built."""
+        sessions = track_request_sessions()
+        try:
+            return await call_next(request)
+        finally:
+            started = [session for session in sessions if session.started]
+            if started:
+                await run_in_threadpool(close_sessions, started)
+
+    @app.middleware("http")
+    async def track_sql(request: Request, call_next):
+        """Attribute the statements run while serving the request to its route."""
+        queries = start_request(request.method, request.scope)
+        response = await call_next(request)
+        if queries.route is not None:
+            route_stats.record(queries.route, queries)
+        return response
+
+    @app.middleware("http")
+    async def record_first_request(request: Request, call_next):
+        """Measure the latency of the first request served by this worker."""
+        if app.state.timings["first_request_ms"] is not None:
+            return await call_next(request)
+        started = time.perf_counter()
+        response = await call_next(request)
+        app.state.timings["first_request_ms"] = _elapsed_ms(started)
+        return response
+
+    app.state.timings["import_ms"] = round((created - IMPORT_STARTED) * 1000, 3)
+    app.state.timings["create_app_ms"] = _elapsed_ms(created)
+    return app
+
+
+# PYTHONPATH=/app pytest
+app = create_app()
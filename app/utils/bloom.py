@@ -0,0 +1,47 @@
+"""Bloom filter for fast, allocation-free membership checks of string keys."""
+
+import hashlib
+import math
+import threading
+
+
+class BloomFilter:
+    """
+    Probabilistic set: ``in`` never misses an added item and wrongly reports an
+    absent one with probability about ``error_rate`` while at most ``capacity``
+    items have been added. Items cannot be removed; rebuild the filter instead.
+    """
+
+    def __init__(self, capacity: int = 100_000, error_rate: float = 0.001):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        step = int.from_bytes(digest[8:], "little") | 1
+        return [(first + index * step) % self.size for index in range(self.hashes)]
+
+    def add(self, item: str):
+        """Add an item to the set."""
+        positions = self._positions(item)
+        with self._lock:
+            for position in positions:
+                self._bits[position >> 3] |= 1 << (position & 7)
+            self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    @property
+    def saturated(self) -> bool:
+        """Whether more items than planned were added, raising the error rate."""
+        return self.count > self.capacity
@@ -0,0 +1,59 @@
+"""Fixed-bucket latency histogram shared by the runtime statistics endpoints."""
+
+import threading
+from bisect import bisect_left
+
+# Upper bounds (in milliseconds) of the histogram buckets; the last bucket is open.
+DEFAULT_BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class Histogram:
+    """Thread-safe histogram of durations expressed in milliseconds."""
+
+    def __init__(self, buckets_ms=DEFAULT_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(self.buckets_ms) + 1)
+        self._count = 0
+        self._total_ms = 0.0
+        self._max_ms = 0.0
+
+    def reset(self):
+        """Discard every recorded observation."""
+        with self._lock:
+            self._counts = [0] * (len(self.buckets_ms) + 1)
+            self._count = 0
+            self._total_ms = 0.0
+            self._max_ms = 0.0
+
+    def observe(self, value_ms: float):
+        """Record a single duration."""
+        index = bisect_left(self.buckets_ms, value_ms)
+        with self._lock:
+            self._counts[index] += 1
+            self._count += 1
+            self._total_ms += value_ms
+            self._max_ms = max(self._max_ms, value_ms)
+
+    @property
+    def count(self) -> int:
+        """Number of recorded observations."""
+        return self._count
+
+    def snapshot(self) -> dict:
+        """
+        Return a consistent copy of the histogram.
+
+        Returns:
+            dict: Count, total, average and maximum in milliseconds, plus the
+            number of observations per bucket keyed by its upper bound.
+        """
+        with self._lock:
+            labels = [str(bound) for bound in self.buckets_ms] + ["+Inf"]
+            return {
+                "count": self._count,
+                "total_ms": round(self._total_ms, 3),
+                "avg_ms": round(self._total_ms / self._count, 3) if self._count else 0.0,
+                "max_ms": round(self._max_ms, 3),
+                "buckets": dict(zip(labels, self._counts)),
+            }
@@ -0,0 +1,63 @@
+"""
+Measure worker cold-start time and first-request latency.
+
+Each run starts a fresh interpreter, imports the application, builds it with
+``create_app`` against a throw-away SQLite database and sends one request.
+
+    PYTHONPATH=. python benchmarks/cold_start.py --runs 10
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+
+CHILD = """
+import json, sys, time
+started = time.perf_counter()
+from app.config import Settings
+from app.main import create_app
+from fastapi.testclient import TestClient
+url = sys.argv[1]
+app = create_app(Settings(
+    database_url="sqlite:///" + url,
+    async_database_url="sqlite+aiosqlite:///" + url,
+    create_schema_on_startup=True,
+))
+with TestClient(app) as client:
+    ready = time.perf_counter()
+    client.get("/role/")
+    first = time.perf_counter()
+print(json.dumps({
+    "cold_start_ms": (ready - started) * 1000,
+    "first_request_ms": (first - ready) * 1000,
+}))
+"""
+
+
+def main():
+    """Run the benchmark and print the median and worst timings."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    samples = []
+    for _ in range(args.runs):
+        with tempfile.NamedTemporaryFile(suffix=".db") as database:
+            output = subprocess.run(
+                [sys.executable, "-c", CHILD, database.name],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+
+    for key in ("cold_start_ms", "first_request_ms"):
+        values = [sample[key] for sample in samples]
+        print(f"{key}: median {statistics.median(values):.1f} ms, max {max(values):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Measure FEFO allocation throughput as the number of lots per egg type grows.
+
+Each run seeds one egg type with ``--lots`` lots of ``--eggs-per-lot`` eggs,
+then several threads allocate small quantities through
+``POST /orderegg/allocate`` until the stock runs out. Afterwards the eggs
+handed out are compared with the stock seeded, and the stock summary is
+reconciled against the lots, so an oversell shows up as a failure.
+
+    PYTHONPATH=. python benchmarks/fefo_allocation.py --lots 10 100 1000 --threads 8
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+from fastapi.testclient import TestClient
+
+from app.config import Settings
+from app.db.database import SessionLocal, get_engine
+from app.db.migrate import migrate
+from app.Egg.egg_model import Egg
+from app.Egg.stock_reconcile import reconcile_stock
+from app.main import create_app
+
+
+def _seed(client, lots: int, eggs_per_lot: int):
+    client.post("/role/", json={"name": "CUSTOMER"})
+    client.post(
+        "/user/",
+        json={
+            "name": "Customer",
+            "phone_number": "3000000000",
+            "email": "customer@mail.com",
+            "username": "customer",
+            "password": "customer",
+            "address": "Somewhere",
+            "enabled": True,
+            "role_ids": [1],
+        },
+    )
+    client.post("/order/", json={"totalPrice": 1, "state": "pending", "user_id": 1})
+    client.post("/supplier/", json={"name": "Supplier", "address": "Farm road"})
+    client.post("/typeeggs/", json={"name": "AA"})
+    for lot in range(lots):
+        client.post(
+            "/egg/",
+            json={
+                "avalibleQuantity": eggs_per_lot,
+                "expirationDate": (date.today() + timedelta(days=1 + lot)).isoformat(),
+                "entryDate": date.today().isoformat(),
+                "sellPrice": 100,
+                "entryPrice": 90,
+                "color": "White",
+                "type_egg_id": 1,
+                "supplier_id": 1,
+            },
+        )
+
+
+def run(lots: int, eggs_per_lot: int, threads: int, quantity: int) -> dict:
+    """Drain one egg type with concurrent allocations and check the result."""
+    with tempfile.NamedTemporaryFile(suffix=".db") as database:
+        settings = Settings(
+            database_url=f"sqlite:///{database.name}",
+            async_database_url=f"sqlite+aiosqlite:///{database.name}",
+            db_pool_size=threads + 4,
+            slow_query_ms=None,
+        )
+        app = create_app(settings)
+        migrate(get_engine())
+        with TestClient(app) as client:
+            _seed(client, lots, eggs_per_lot)
+            results = {"allocations": 0, "eggs": 0, "sold_out": 0, "errors": 0}
+            lock = threading.Lock()
+            stop = threading.Event()
+
+            def allocate():
+                body = {"order_id": 1, "type_egg_id": 1, "quantity": quantity}
+                while not stop.is_set():
+                    response = client.post("/orderegg/allocate", json=body)
+                    with lock:
+                        if response.status_code == 201:
+                            results["allocations"] += 1
+                            results["eggs"] += sum(
+                                line["quantity"] for line in response.json()
+                            )
+                        elif response.status_code == 409:
+                            results["sold_out"] += 1
+                            stop.set()
+                        else:
+                            results["errors"] += 1
+
+            workers = [threading.Thread(target=allocate) for _ in range(threads)]
+            started = time.perf_counter()
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            elapsed = time.perf_counter() - started
+
+        db = SessionLocal(bind=get_engine())
+        try:
+            negative = db.query(Egg).filter(Egg.avalibleQuantity < 0).count()
+            discrepancies = len(reconcile_stock(db)["discrepancies"])
+        finally:
+            db.close()
+    return {
+        "lots": lots,
+        "allocations_per_s": results["allocations"] / elapsed,
+        "errors": results["errors"],
+        "oversold": max(0, results["eggs"] - lots * eggs_per_lot),
+        "negative_lots": negative,
+        "discrepancies": discrepancies,
+    }
+
+
+def main():
+    """Run the drain for each lot count."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--lots", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--eggs-per-lot", type=int, default=30)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--quantity", type=int, default=12)
+    args = parser.parse_args()
+
+    for lots in args.lots:
+        result = run(lots, args.eggs_per_lot, args.threads, args.quantity)
+        print(
+            f"{result['lots']:5} lots: {result['allocations_per_s']:7.1f} allocations/s, "
+            f"{result['errors']} errors, {result['oversold']} eggs oversold, "
+            f"{result['negative_lots']} negative lots, "
+            f"{result['discrepancies']} summary discrepancies"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Measure the latency of ordinary routes while a login storm is running.
+
+Several threads post valid logins as fast as they can while a probe thread
+times ``GET /role/``. "inline" runs bcrypt on the request threads, as before
+the password pool existed; "pool" uses the bounded bcrypt process pool.
+Logins rejected with 503 by a saturated pool are counted separately.
+
+    PYTHONPATH=. python benchmarks/login_storm.py --seconds 10 --storm 32
+"""
+
+import argparse
+import statistics
+import tempfile
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from app.config import Settings
+from app.db.database import get_engine
+from app.db.migrate import migrate
+from app.main import create_app
+
+
+def _percentile(values, percent):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * percent / 100))]
+
+
+def run(mode: str, seconds: float, storm: int, workers: int, max_pending: int) -> dict:
+    """Run one storm and return login throughput and probe latencies."""
+    with tempfile.NamedTemporaryFile(suffix=".db") as database:
+        settings = Settings(
+            database_url=f"sqlite:///{database.name}",
+            async_database_url=f"sqlite+aiosqlite:///{database.name}",
+            bcrypt_pool_workers=workers if mode == "pool" else 0,
+            bcrypt_pool_max_pending=max_pending if mode == "pool" else 1_000_000,
+            db_pool_size=storm + 4,
+            slow_query_ms=None,
+        )
+        app = create_app(settings)
+        migrate(get_engine())
+        with TestClient(app) as client:
+            client.post("/role/", json={"name": "ADMIN"})
+            client.post(
+                "/user/",
+                json={
+                    "name": "Admin User",
+                    "phone_number": "3000000000",
+                    "email": "admin@mail.com",
+                    "username": "adminuser",
+                    "password": "admin123",
+                    "address": "HQ",
+                    "enabled": True,
+                    "role_ids": [1],
+                },
+            )
+            stop = threading.Event()
+            results = {"ok": 0, "rejected": 0}
+            lock = threading.Lock()
+
+            def login():
+                while not stop.is_set():
+                    status = client.post(
+                        "/login", data={"username": "adminuser", "password": "admin123"}
+                    ).status_code
+                    with lock:
+                        results["ok" if status == 200 else "rejected"] += 1
+
+            threads = [threading.Thread(target=login) for _ in range(storm)]
+            for thread in threads:
+                thread.start()
+            latencies = []
+            deadline = time.perf_counter() + seconds
+            while time.perf_counter() < deadline:
+                started = time.perf_counter()
+                client.get("/role/")
+                latencies.append((time.perf_counter() - started) * 1000)
+                time.sleep(0.01)
+            stop.set()
+            for thread in threads:
+                thread.join()
+    return {
+        "mode": mode,
+        "logins_per_s": results["ok"] / seconds,
+        "rejected": results["rejected"],
+        "probe_p50_ms": statistics.median(latencies),
+        "probe_p99_ms": _percentile(latencies, 99),
+    }
+
+
+def main():
+    """Run the storm without and with the password pool."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--storm", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--max-pending", type=int, default=16)
+    args = parser.parse_args()
+
+    for mode in ("inline", "pool"):
+        result = run(mode, args.seconds, args.storm, args.workers, args.max_pending)
+        print(
+            f"{result['mode']:6}: {result['logins_per_s']:6.1f} logins/s, "
+            f"{result['rejected']} rejected, GET /role/ p50 {result['probe_p50_ms']:.1f} ms, "
+            f"p99 {result['probe_p99_ms']:.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Compare connection pool occupancy of eager and lazy request sessions.
+
+Mixed traffic (reads, a lazy-loading list, validation failures and
+unauthenticated calls) is sent from several threads to an app built against a
+SQLite file. "eager" restores the previous dependencies, which opened a
+session for every request and closed it after the response was sent; "lazy"
+uses the current ``get_db``/``get_read_db``.
+
+    PYTHONPATH=. python benchmarks/pool_occupancy.py --requests 2000 --threads 8
+"""
+
+import argparse
+import itertools
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from fastapi.testclient import TestClient
+from sqlalchemy.pool import QueuePool
+
+from app.config import Settings
+from app.db.database import (
+    ReadSessionLocal,
+    SessionLocal,
+    get_engine,
+    get_replica_engine,
+    get_replica_health,
+)
+from app.db.migrate import migrate
+from app.db.session import get_db, get_read_db
+from app.main import create_app
+
+TRAFFIC = [
+    ("GET", "/role/", None),
+    ("GET", "/egg/", None),
+    ("GET", "/bill/", None),
+    ("POST", "/role/", {"unexpected": "body"}),
+    ("GET", "/monitoring/pool", None),
+    ("GET", "/user/", None),
+]
+
+
+def eager_get_db():
+    """The previous get_db: a session per request, closed after the response."""
+    db = SessionLocal(bind=get_engine())
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def eager_get_read_db():
+    """The previous get_read_db."""
+    db = ReadSessionLocal(
+        primary=get_engine(),
+        replica=get_replica_engine(),
+        replica_health=get_replica_health(),
+    )
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def _seed(client):
+    client.post("/typeeggs/", json={"name": "AA"})
+    for number in range(20):
+        client.post("/supplier/", json={"name": f"S{number}", "address": f"Street {number}"})
+        client.post(
+            "/egg/",
+            json={
+                "avalibleQuantity": 30,
+                "expirationDate": (date.today() + timedelta(days=30)).isoformat(),
+                "entryDate": date.today().isoformat(),
+                "sellPrice": 100,
+                "entryPrice": 90,
+                "color": "White",
+                "type_egg_id": 1,
+                "supplier_id": number + 1,
+            },
+        )
+
+
+def run(mode: str, requests: int, threads: int, pool_size: int) -> dict:
+    """Send the traffic mix and return the pool statistics of the run."""
+    with tempfile.NamedTemporaryFile(suffix=".db") as database:
+        url = f"sqlite:///{database.name}"
+        settings = Settings(
+            database_url=url,
+            async_database_url=f"sqlite+aiosqlite:///{database.name}",
+            db_pool_size=pool_size,
+            db_max_overflow=0,
+            slow_query_ms=None,
+        )
+        app = create_app(settings)
+        migrate(get_engine())
+        if mode == "eager":
+            app.dependency_overrides[get_db] = eager_get_db
+            app.dependency_overrides[get_read_db] = eager_get_read_db
+        with TestClient(app) as client:
+            _seed(client)
+            engine = get_engine()
+            assert isinstance(engine.pool, QueuePool)
+            engine.pool.stats.reset()  # measure the traffic only
+            calls = itertools.islice(itertools.cycle(TRAFFIC), requests)
+            started = time.perf_counter()
+            with ThreadPoolExecutor(threads) as executor:
+                list(
+                    executor.map(
+                        lambda call: client.request(call[0], call[1], json=call[2]), calls
+                    )
+                )
+            elapsed = time.perf_counter() - started
+            stats = engine.pool.stats.snapshot()
+    return {
+        "mode": mode,
+        "requests_per_s": requests / elapsed,
+        "checkouts": stats["held_ms"]["count"],
+        "avg_held_ms": stats["held_ms"]["avg_ms"],
+        "held_total_ms": stats["held_ms"]["total_ms"],
+        "avg_wait_ms": stats["wait_ms"]["avg_ms"],
+        "peak_checked_out": stats["peak_checked_out"],
+    }
+
+
+def main():
+    """Run both modes and print a comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=1200)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--pool-size", type=int, default=4)
+    args = parser.parse_args()
+
+    for mode in ("eager", "lazy"):
+        result = run(mode, args.requests, args.threads, args.pool_size)
+        print(
+            f"{result['mode']:5}: {result['requests_per_s']:7.1f} req/s, "
+            f"{result['checkouts']} checkouts, held avg {result['avg_held_ms']:.2f} ms "
+            f"(total {result['held_total_ms']:.0f} ms), "
+            f"wait avg {result['avg_wait_ms']:.2f} ms, peak {result['peak_checked_out']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Measure stock decrement throughput of one hot egg type by number of shards.
+
+Threads decrement the stock of a single type/color/supplier key, one egg per
+transaction, for a fixed time. With one shard every transaction updates the
+same summary row; with N shards each picks one of N rows at random. At the
+end the stock read (summary plus shards) must equal the seeded stock minus
+the decrements made.
+
+SQLite locks the whole database for each write, so rows never contend there
+and shards cannot help; point ``--database-url`` at MySQL or PostgreSQL to
+see throughput scale with the shard count:
+
+    PYTHONPATH=. python benchmarks/sharded_stock.py --database-url mysql+pymysql://.../egg_bench
+
+Every table of the app is dropped and recreated, so a URL other than SQLite
+is refused unless its database name contains "bench".
+"""
+
+import argparse
+import tempfile
+import threading
+import time
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.orm import sessionmaker
+
+# registers every model on Base.metadata
+import app.db.migrations  # pylint: disable=unused-import
+from app.db.database import Base, build_engine
+from app.db.retry import run_transaction
+from app.Egg.stock_summary_repository import (
+    apply_stock_delta,
+    read_type_stock,
+    replace_stock_summary,
+    stock_shard_counts,
+)
+from app.TypeEgg.typeegg_model import TypeEgg
+
+SEEDED = 10_000_000
+
+
+def is_scratch_database(database_url: str) -> bool:
+    """Whether the tables behind ``database_url`` may be dropped."""
+    url = make_url(database_url)
+    return url.get_backend_name() == "sqlite" or "bench" in (url.database or "")
+
+
+def run(database_url: str, shards: int, seconds: float, threads: int) -> dict:
+    """Decrement one key from ``threads`` threads and return the throughput."""
+    if not is_scratch_database(database_url):
+        raise ValueError(f"refusing to drop the tables of {database_url}")
+    engine = build_engine(database_url, pool_size=threads + 2)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    session_factory = sessionmaker(bind=engine)
+    with session_factory() as db:
+        db.add(TypeEgg(id=1, name="AA", stock_shards=shards))
+        db.commit()
+        replace_stock_summary(db, {(1, "White", 1): (SEEDED, SEEDED * 90.0)})
+    stock_shard_counts.clear()
+
+    results = {"decrements": 0, "errors": 0}
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def decrement():
+        done = errors = 0
+        with session_factory() as db:
+            while time.perf_counter() < deadline:
+                try:
+                    run_transaction(
+                        db, lambda: apply_stock_delta(db, (1, "White", 1), -1, -90.0)
+                    )
+                    done += 1
+                except Exception:  # pylint: disable=broad-except
+                    errors += 1
+        with lock:
+            results["decrements"] += done
+            results["errors"] += errors
+
+    workers = [threading.Thread(target=decrement) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    with session_factory() as db:
+        remaining = sum(row.quantity for row in read_type_stock(db, 1))
+    engine.dispose()
+    return {
+        "shards": shards,
+        "decrements_per_s": results["decrements"] / seconds,
+        "errors": results["errors"],
+        "consistent": remaining == SEEDED - results["decrements"],
+    }
+
+
+def main():
+    """Run the decrements for each shard count."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url")
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--threads", type=int, default=16)
+    args = parser.parse_args()
+    if args.database_url and not is_scratch_database(args.database_url):
+        parser.error(
+            "--database-url must be SQLite or name a scratch database containing "
+            '"bench": every table is dropped'
+        )
+
+    with tempfile.NamedTemporaryFile(suffix=".db") as database:
+        url = args.database_url or f"sqlite:///{database.name}"
+        for shards in args.shards:
+            result = run(url, shards, args.seconds, args.threads)
+            print(
+                f"{result['shards']:3} shards: {result['decrements_per_s']:8.1f} "
+                f"decrements/s, {result['errors']} errors, "
+                f"stock {'consistent' if result['consistent'] else 'INCONSISTENT'}"
+            )
+
+
+if __name__ == "__main__":
+    main()
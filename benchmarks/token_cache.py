@@ -0,0 +1,92 @@
+"""
+Measure the verified-token cache on JWT decoding and on ``/user/search/me``.
+
+The micro part times ``decode_token`` on one token with the cache disabled
+(full HMAC verification and JSON parsing each time) and enabled. The route
+part sends sequential requests with one bearer token to an app built against
+a SQLite file, with the token cache off and on (the principal cache stays on).
+
+    PYTHONPATH=. python benchmarks/token_cache.py --requests 2000
+"""
+
+import argparse
+import tempfile
+import time
+import timeit
+
+from fastapi.testclient import TestClient
+
+from app.Auth.auth_service import (
+    ACCESS_TOKEN_EXPIRE_MINUTES,
+    create_access_token,
+    decode_token,
+    token_cache,
+)
+from app.config import Settings
+from app.db.database import get_engine
+from app.db.migrate import migrate
+from app.main import create_app
+
+
+def micro(number: int):
+    """Print the cost of one decode without and with the cache."""
+    token = create_access_token({"sub": "adminuser", "ver": 0, "roles": ["ADMIN"]})
+    for label, size in (("uncached", 0), ("cached", 16)):
+        token_cache.configure(size, ACCESS_TOKEN_EXPIRE_MINUTES * 60)
+        seconds = timeit.timeit(lambda: decode_token(token), number=number)
+        print(f"decode_token {label:8}: {seconds / number * 1e6:7.2f} us")
+
+
+def route(requests: int, cache_size: int) -> float:
+    """Return requests per second on /user/search/me."""
+    with tempfile.NamedTemporaryFile(suffix=".db") as database:
+        app = create_app(
+            Settings(
+                database_url=f"sqlite:///{database.name}",
+                async_database_url=f"sqlite+aiosqlite:///{database.name}",
+                token_cache_size=cache_size,
+                bcrypt_rounds=4,
+                slow_query_ms=None,
+            )
+        )
+        migrate(get_engine())
+        with TestClient(app) as client:
+            client.post("/role/", json={"name": "ADMIN"})
+            client.post(
+                "/user/",
+                json={
+                    "name": "Admin User",
+                    "phone_number": "3000000000",
+                    "email": "admin@mail.com",
+                    "username": "adminuser",
+                    "password": "admin123",
+                    "address": "HQ",
+                    "enabled": True,
+                    "role_ids": [1],
+                },
+            )
+            token = client.post(
+                "/login", data={"username": "adminuser", "password": "admin123"}
+            ).json()["access_token"]
+            headers = {"Authorization": f"Bearer {token}"}
+            client.get("/user/search/me", headers=headers)
+            started = time.perf_counter()
+            for _ in range(requests):
+                client.get("/user/search/me", headers=headers)
+            return requests / (time.perf_counter() - started)
+
+
+def main():
+    """Run the micro and route benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--decodes", type=int, default=20000)
+    args = parser.parse_args()
+
+    micro(args.decodes)
+    for label, size in (("uncached", 0), ("cached", 4096)):
+        print(f"/user/search/me {label:8}: {route(args.requests, size):7.1f} req/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Test cases for first-expiry-first-out allocation of egg lots."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from app.Egg.egg_allocation import ALLOCATION_PAGE_SIZE
+from app.Egg.egg_model import Egg
+from app.Egg.stock_reconcile import reconcile_stock
+
+
+def _lot(quantity, expires_in, color="White", sell_price=100, type_egg_id=1):
+    return {
+        "avalibleQuantity": quantity,
+        "expirationDate": (date.today() + timedelta(days=expires_in)).isoformat(),
+        "entryDate": date.today().isoformat(),
+        "sellPrice": sell_price,
+        "entryPrice": 90,
+        "color": color,
+        "type_egg_id": type_egg_id,
+        "supplier_id": 1,
+    }
+
+
+def _allocate(client, quantity, color=None, order_id=1):
+    body = {"order_id": order_id, "type_egg_id": 1, "quantity": quantity}
+    if color is not None:
+        body["color"] = color
+    return client.post("/orderegg/allocate", json=body)
+
+
+@pytest.fixture
+def _shop(_client):
+    """A customer with a pending order, a supplier and one egg type."""
+    _client.post("/role/", json={"name": "CUSTOMER"})
+    _client.post(
+        "/user/",
+        json={
+            "name": "User",
+            "phone_number": "3133333333",
+            "email": "user@mail.com",
+            "username": "user",
+            "password": "123",
+            "address": "Somewhere",
+            "enabled": True,
+            "role_ids": [1],
+        },
+    )
+    _client.post("/order/", json={"totalPrice": 100, "state": "pending", "user_id": 1})
+    _client.post("/supplier/", json={"name": "Supplier", "address": "Lot street"})
+    _client.post("/typeeggs/", json={"name": "AA"})
+    return _client
+
+
+def test_allocation_splits_across_lots_first_expiry_first(_shop, _test_db):
+    """Test the lots that expire first are used first and split as needed."""
+    _client = _shop
+    late = _client.post("/egg/", json=_lot(50, 30, sell_price=120)).json()
+    early = _client.post("/egg/", json=_lot(10, 5)).json()
+    middle = _client.post("/egg/", json=_lot(20, 10, sell_price=110)).json()
+
+    response = _allocate(_client, 35)
+    assert response.status_code == 201
+    lines = [(line["egg_id"], line["quantity"], line["unit_price"]) for line in response.json()]
+    assert lines == [(early["id"], 10, 100), (middle["id"], 20, 110), (late["id"], 5, 120)]
+
+    assert _client.get(f"/egg/{early['id']}").json()["avalibleQuantity"] == 0
+    assert _client.get(f"/egg/{late['id']}").json()["avalibleQuantity"] == 45
+    assert _client.get("/order/1").json()["totalPrice"] == 100 + 10 * 100 + 20 * 110 + 5 * 120
+    assert _client.get("/egg/stock/1").json()["quantity"] == 45
+    assert reconcile_stock(_test_db)["discrepancies"] == []
+
+
+def test_allocation_skips_expired_lots_and_other_colors(_shop, _test_db):
+    """Test expired lots and lots of another color are never allocated."""
+    _client = _shop
+    expired = _client.post("/egg/", json=_lot(10, 1)).json()
+    # the API refuses expired lots: age this one in place
+    _test_db.query(Egg).filter(Egg.id == expired["id"]).update(
+        {"expirationDate": date.today() - timedelta(days=1)}
+    )
+    _test_db.commit()
+    _client.post("/egg/", json=_lot(10, 2, color="Brown"))
+    fresh = _client.post("/egg/", json=_lot(10, 20)).json()
+
+    response = _allocate(_client, 5, color="White")
+    assert response.status_code == 201
+    assert [line["egg_id"] for line in response.json()] == [fresh["id"]]
+
+
+def test_allocation_pages_through_many_lots(_shop):
+    """Test a quantity larger than one page of lots is still covered."""
+    _client = _shop
+    lots = ALLOCATION_PAGE_SIZE + 4
+    for day in range(1, lots + 1):
+        _client.post("/egg/", json=_lot(1, day))
+
+    response = _allocate(_client, lots)
+    assert response.status_code == 201
+    assert len(response.json()) == lots
+
+
+def test_allocation_shortage_leaves_stock_untouched(_shop, _test_db):
+    """Test a request the lots cannot cover is rejected without side effects."""
+    _client = _shop
+    _client.post("/egg/", json=_lot(10, 5))
+    _client.post("/egg/", json=_lot(10, 10))
+
+    response = _allocate(_client, 25)
+    assert response.status_code == 409
+    _test_db.expire_all()
+    assert [egg.avalibleQuantity for egg in _test_db.query(Egg).all()] == [10, 10]
+    assert _client.get("/egg/stock/1").json()["quantity"] == 20
+    assert _client.get("/orderegg/").json() == []
+    assert _client.get("/order/1").json()["totalPrice"] == 100
+
+
+def test_allocation_validates_request(_shop):
+    """Test non-positive quantities and unknown orders are rejected."""
+    _client = _shop
+    _client.post("/egg/", json=_lot(10, 5))
+    assert _allocate(_client, 0).status_code == 400
+    assert _allocate(_client, 1, order_id=99).status_code == 404
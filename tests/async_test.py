@@ -0,0 +1,159 @@
+"""Test cases for the async read routes backed by aiosqlite."""
+
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base, build_async_engine
+from app.db.session import get_async_db
+from app.Auth.auth_service import create_access_token, invalidate_principal
+from app.User import user_async_router
+from app.Egg import egg_async_router
+from app.Order import order_async_router
+from app.Bill import bill_async_router
+from app.Pay import pay_async_router
+from app.User.user_model import User
+from app.Role.role_model import Role
+from app.Supplier.supplier_model import Supplier
+from app.TypeEgg.typeegg_model import TypeEgg
+from app.Egg.egg_model import Egg
+from app.Egg.stock_summary_repository import compute_stock_from_lots, replace_stock_summary
+from app.Order.order_model import Order
+from app.Bill.bill_model import Bill
+from app.Pay.pay_model import Pay
+
+
+@pytest.fixture
+def _async_client(tmp_path):
+    """Serves the async routers from a SQLite file seeded through a sync session."""
+    db_path = tmp_path / "async.db"
+    sync_engine = create_engine(f"sqlite:///{db_path}")
+    Base.metadata.create_all(bind=sync_engine)
+    with sessionmaker(bind=sync_engine)() as db:
+        role = Role(name="CUSTOMER")
+        user = User(
+            name="User",
+            phone_number="3115070080",
+            email="user@mail.com",
+            username="user",
+            password="x",
+            address="Somewhere",
+            enabled=True,
+            roles=[role],
+        )
+        supplier = Supplier(name="Supplier", address="Somewhere")
+        type_egg = TypeEgg(name="AA")
+        egg = Egg(
+            avalibleQuantity=30,
+            entryDate=datetime.combine(date.today(), datetime.min.time()),
+            expirationDate=datetime.combine(date.today(), datetime.min.time())
+            + timedelta(days=30),
+            entryPrice=90,
+            sellPrice=100,
+            color="White",
+            type_egg=type_egg,
+            supplier=supplier,
+        )
+        order = Order(totalPrice=3000, state="paid", user=user, orderDate=datetime.now())
+        bill = Bill(totalprice=3000, paid=True, order=order, issueDate=datetime.now())
+        pay = Pay(amount_paid=3000, payment_method="cash", user=user, bill=bill)
+        db.add_all([egg, order, bill, pay])
+        db.commit()
+        # seeded behind the repositories' back: backfill like the migration
+        replace_stock_summary(db, compute_stock_from_lots(db))
+    sync_engine.dispose()
+
+    async_engine = build_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with session_factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(user_async_router.router, prefix="/user")
+    app.include_router(egg_async_router.router, prefix="/egg")
+    app.include_router(order_async_router.router, prefix="/order")
+    app.include_router(bill_async_router.router, prefix="/bill")
+    app.include_router(pay_async_router.router, prefix="/pay")
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+def _bearer(**claims) -> dict:
+    return {"Authorization": f"Bearer {create_access_token({'sub': 'user', 'ver': 0, **claims})}"}
+
+
+def test_async_read_users(_async_client):
+    """Test listing users and their roles through the async session."""
+    headers = _bearer(roles=["ADMIN"])
+    response = _async_client.get("/user/", headers=headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data[0]["username"] == "user"
+    assert data[0]["roles"][0]["name"] == "CUSTOMER"
+    byrole = _async_client.get("/user/byrole/1", headers=headers)
+    assert byrole.json()[0]["id"] == data[0]["id"]
+    assert _async_client.get("/user/99", headers=headers).status_code == 404
+
+
+def test_async_admin_routes_check_the_token(_async_client):
+    """Test the async admin dependency rejects missing and non-admin tokens."""
+    assert _async_client.get("/user/").status_code == 401
+    assert _async_client.get("/user/", headers=_bearer(roles=["CUSTOMER"])).status_code == 403
+    # without a roles claim the stored roles are loaded through the async session
+    invalidate_principal("user")
+    assert _async_client.get("/user/", headers=_bearer()).status_code == 403
+
+
+def test_async_check_availability(_async_client):
+    """Test the availability check runs on the async session."""
+    response = _async_client.get(
+        "/user/availability", params={"username": "user", "email": "free@mail.com"}
+    )
+    assert response.status_code == 200
+    assert response.json() == {"username": False, "email": True}
+
+
+def test_async_read_eggs(_async_client):
+    """Test eggs are returned with their supplier and type."""
+    response = _async_client.get("/egg/1")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["supplier"]["name"] == "Supplier"
+    assert data["type_egg"]["name"] == "AA"
+    assert _async_client.get("/egg/stock/1").json()["quantity"] == 30
+    assert _async_client.get("/egg/search/count_this_month").json() == 30
+
+
+def test_async_read_orders(_async_client):
+    """Test orders of the current month include their user."""
+    now = datetime.now()
+    response = _async_client.get(
+        "/order/search/totalOrdersMonth", params={"year": now.year, "month": now.month}
+    )
+    assert response.status_code == 200
+    assert response.json()[0]["user"]["username"] == "user"
+    assert _async_client.get("/order/1").json()["totalPrice"] == 3000
+
+
+def test_async_read_bills(_async_client):
+    """Test the bill reports run on the async session."""
+    assert _async_client.get("/bill/1").json()["totalprice"] == 3000
+    assert len(_async_client.get("/bill/customer/getAllOfCustomers").json()) == 1
+    assert _async_client.get("/bill/customer/bestCustomer").json() == "User"
+    assert _async_client.get("/bill/company/getAllOfCompany").status_code == 404
+
+
+def test_async_read_pays(_async_client):
+    """Test payments are returned with their user."""
+    response = _async_client.get("/pay/")
+    assert response.status_code == 200
+    assert response.json()[0]["user"]["username"] == "user"
+    assert _async_client.get("/pay/earnings/total_earnings").json() == 3000
@@ -0,0 +1,296 @@
+"""Test cases for authentication, token refresh and the principal cache."""
+
+import contextlib
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from jose import jwt
+
+from app.Auth.auth_service import (
+    create_access_token,
+    decode_token,
+    forget_token,
+    principal_cache,
+    token_cache,
+)
+from app.Auth.revoked_token_model import RevokedToken
+from app.Auth.token_revocation import revocation_list
+from app.db.instrumentation import route_stats
+from app.User.user_model import User
+
+
+def _create_admin(_client, username="adminuser", phone_number="3000000000"):
+    """Create an admin user and return its authorization headers."""
+    _client.post("/role/", json={"name": "ADMIN"})
+    _client.post(
+        "/user/",
+        json={
+            "name": "Admin User",
+            "phone_number": phone_number,
+            "email": f"{username}@mail.com",
+            "username": username,
+            "password": "admin123",
+            "address": f"HQ {username}",
+            "enabled": True,
+            "role_ids": [1],
+        },
+    )
+    response = _client.post(
+        "/login", data={"username": username, "password": "admin123"}
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def _login(_client, username="adminuser"):
+    """Log in and return the token response."""
+    return _client.post(
+        "/login", data={"username": username, "password": "admin123"}
+    ).json()
+
+
+def _bearer(token):
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_principal_is_cached(_client):
+    """Test repeated requests with one token are served from the cache."""
+    headers = _create_admin(_client)
+    assert _client.get("/user/search/me", headers=headers).status_code == 200
+    hits = principal_cache.hits
+    response = _client.get("/user/search/me", headers=headers)
+    assert response.status_code == 200
+    assert response.json()["username"] == "adminuser"
+    assert principal_cache.hits == hits + 1
+
+    stats = _client.get("/monitoring/caches", headers=headers).json()["principal"]
+    assert stats["size"] == 1
+    assert stats["hit_rate"] > 0
+
+
+def test_role_change_revokes_tokens(_client):
+    """Test renaming a role revokes the tokens of its members immediately."""
+    headers = _create_admin(_client)
+    assert _client.get("/user/", headers=headers).status_code == 200
+    _client.put("/role/1", json={"name": "CLERK"})
+    response = _client.get("/user/", headers=headers)
+    assert response.status_code == 401
+    assert response.json()["detail"] == "Token has been revoked"
+
+
+def test_token_carries_role_claims(_client):
+    """Test access tokens embed the role names and token version."""
+    headers = _create_admin(_client)
+    claims = jwt.get_unverified_claims(headers["Authorization"].split()[1])
+    assert claims["sub"] == "adminuser"
+    assert claims["roles"] == ["ADMIN"]
+    assert claims["ver"] == 0
+
+
+def test_admin_check_uses_role_claim(_client):
+    """Test admin routes are authorised from the token without loading the user."""
+    headers = _create_admin(_client)
+    assert _client.get("/user/", headers=headers).status_code == 200  # syncs the filter
+    principal_cache.clear()
+    route_stats.reset()
+    assert _client.get("/monitoring/pool", headers=headers).status_code == 200
+    stats = {item["route"]: item for item in route_stats.snapshot()}
+    assert stats["GET /monitoring/pool"]["queries"] == 0
+
+
+def test_demoted_admin_token_is_revoked_in_every_worker(_client):
+    """Test removing the admin role revokes the token for the claim-only check."""
+    headers = _create_admin(_client)
+    _client.post("/role/", json={"name": "CLERK"})
+    other = _create_admin(_client, "otheradmin", "3000000001")
+    payload = {
+        "name": "Admin User",
+        "phone_number": "3000000001",
+        "email": "otheradmin@mail.com",
+        "username": "otheradmin",
+        "password": "admin123",
+        "address": "HQ otheradmin",
+        "enabled": True,
+        "role_ids": [2],
+    }
+    assert _client.put("/user/2", json=payload, headers=headers).status_code == 200
+    assert _client.get("/monitoring/pool", headers=other).status_code == 401
+
+    revocation_list.reset()  # as seen by a worker that did not serve the update
+    assert _client.get("/monitoring/pool", headers=other).status_code == 401
+    assert _client.get("/monitoring/pool", headers=headers).status_code == 200
+
+
+def test_token_without_role_claims(_client):
+    """Test tokens issued without role claims are checked against stored roles."""
+    _create_admin(_client)
+    token = create_access_token({"sub": "adminuser"})
+    headers = {"Authorization": f"Bearer {token}"}
+    assert _client.get("/user/", headers=headers).status_code == 200
+
+
+def test_user_update_revokes_tokens(_client, _test_db):
+    """Test changing a user's password revokes its earlier tokens."""
+    headers = _create_admin(_client)
+    other = _create_admin(_client, "otheradmin", "3000000001")
+    payload = {
+        "name": "Admin User",
+        "phone_number": "3000000001",
+        "email": "otheradmin@mail.com",
+        "username": "otheradmin",
+        "password": "admin123",
+        "address": "HQ otheradmin",
+        "enabled": True,
+        "role_ids": [1],
+    }
+    stored = _test_db.get(User, 2).password
+    assert _client.put("/user/2", json=payload, headers=headers).status_code == 200
+    assert _client.get("/user/search/me", headers=other).status_code == 200
+    # the same password keeps its hash
+    _test_db.expire_all()
+    assert _test_db.get(User, 2).password == stored
+
+    payload["password"] = "changed123"
+    assert _client.put("/user/2", json=payload, headers=headers).status_code == 200
+    assert _client.get("/user/search/me", headers=other).status_code == 401
+    response = _client.post(
+        "/login", data={"username": "otheradmin", "password": "changed123"}
+    )
+    assert response.status_code == 200
+
+
+def test_user_delete_invalidates_principal(_client):
+    """Test a deleted user's tokens are revoked, cached principal or not."""
+    headers = _create_admin(_client)
+    other = _create_admin(_client, "otheradmin", "3000000001")
+    assert _client.get("/user/search/me", headers=other).status_code == 200
+    assert _client.delete("/user/2", headers=headers).status_code == 200
+    assert _client.get("/user/search/me", headers=other).status_code == 401
+    assert _client.get("/monitoring/pool", headers=other).status_code == 401
+
+
+def test_token_claims_are_memoised():
+    """Test a token is verified once and forgotten on revocation."""
+    token = create_access_token({"sub": "adminuser", "ver": 0})
+    misses = token_cache.misses
+    assert decode_token(token)["sub"] == "adminuser"
+    assert decode_token(token) is decode_token(token)
+    assert token_cache.misses == misses + 1
+    forget_token(token)
+    decode_token(token)
+    assert token_cache.misses == misses + 2
+
+
+def test_expired_token_is_rejected_and_not_cached():
+    """Test expired tokens fail verification and never enter the cache."""
+    token = create_access_token({"sub": "adminuser"}, timedelta(seconds=-1))
+    size = len(token_cache)
+    with pytest.raises(HTTPException) as error:
+        decode_token(token)
+    assert error.value.status_code == 401
+    assert len(token_cache) == size
+
+
+def test_cached_claims_expire_with_the_token():
+    """Test cache entries live no longer than the token they came from."""
+    token = create_access_token({"sub": "adminuser"}, timedelta(seconds=1))
+    decode_token(token)
+    expirations = token_cache.expirations
+    time.sleep(1.1)
+    with contextlib.suppress(HTTPException):  # jose compares whole seconds
+        decode_token(token)
+    assert token_cache.expirations == expirations + 1
+
+
+def test_refresh_issues_new_pair(_client):
+    """Test a refresh token is traded for new tokens and only once."""
+    _create_admin(_client)
+    tokens = _login(_client)
+    response = _client.post("/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 200
+    renewed = response.json()
+    assert renewed["refresh_token"] != tokens["refresh_token"]
+    assert _client.get("/user/", headers=_bearer(renewed["access_token"])).status_code == 200
+
+    reused = _client.post("/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert reused.status_code == 401
+    assert reused.json()["detail"] == "Token has been revoked"
+
+
+def test_refresh_replay_on_unsynced_worker_is_rejected(_client, monkeypatch):
+    """Test a used refresh token is refused by a worker whose filter is stale."""
+    _create_admin(_client)
+    tokens = _login(_client)
+    first = _client.post("/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert first.status_code == 200
+
+    revocation_list.reset()  # a worker that has not synced the first refresh
+    monkeypatch.setattr(revocation_list, "sync", lambda db, force=False: None)
+    second = _client.post("/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert second.status_code == 401
+    assert second.json()["detail"] == "Token has been revoked"
+
+
+def test_token_types_are_not_interchangeable(_client):
+    """Test refresh tokens are not access tokens and vice versa."""
+    _create_admin(_client)
+    tokens = _login(_client)
+    response = _client.get("/user/search/me", headers=_bearer(tokens["refresh_token"]))
+    assert response.status_code == 401
+    response = _client.post("/refresh", json={"refresh_token": tokens["access_token"]})
+    assert response.status_code == 401
+
+
+def test_logout_revokes_both_tokens(_client):
+    """Test logging out revokes the access token and its refresh token."""
+    _create_admin(_client)
+    tokens = _login(_client)
+    headers = _bearer(tokens["access_token"])
+    response = _client.post(
+        "/logout", json={"refresh_token": tokens["refresh_token"]}, headers=headers
+    )
+    assert response.status_code == 200
+    assert _client.get("/user/search/me", headers=headers).status_code == 401
+    response = _client.post("/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 401
+
+
+def test_revocations_reach_other_workers(_client):
+    """Test a worker that missed a revocation picks it up from the table."""
+    admin = _create_admin(_client)
+    tokens = _login(_client)
+    _client.post("/logout", headers=_bearer(tokens["access_token"]))
+    revocation_list.reset()  # as seen by a worker that did not serve the logout
+    response = _client.get("/user/search/me", headers=_bearer(tokens["access_token"]))
+    assert response.status_code == 401
+
+    stats = _client.get("/monitoring/revocations", headers=admin).json()
+    assert stats["revoked"] == 1
+    assert stats["syncs"] >= 1
+    assert stats["checks"] > stats["confirmations"]
+
+
+def test_revocation_committed_late_with_lower_id_is_synced(_client, _test_db):
+    """Test a revocation whose lower id becomes visible after a higher one is picked up."""
+    expires_at = datetime.utcnow() + timedelta(minutes=15)
+    _test_db.add(RevokedToken(id=5, jti="committed-first", expires_at=expires_at))
+    _test_db.commit()
+    revocation_list.sync(_test_db, force=True)
+    assert revocation_list.stats()["last_id"] == 5
+
+    # inserted before id 5 but committed after this worker synced past it
+    _test_db.add(RevokedToken(id=3, jti="committed-late", expires_at=expires_at))
+    _test_db.commit()
+    revocation_list.sync(_test_db, force=True)
+    assert revocation_list.is_revoked("committed-late", _test_db)
+    assert revocation_list.stats()["revoked"] == 2
+
+
+def test_role_change_revokes_refresh_tokens(_client):
+    """Test refresh tokens issued before a token version bump are rejected."""
+    admin = _create_admin(_client)
+    tokens = _login(_client)
+    _client.put("/role/1", json={"name": "CLERK"}, headers=admin)
+    response = _client.post("/refresh", json={"refresh_token": tokens["refresh_token"]})
+    assert response.status_code == 401
@@ -0,0 +1,31 @@
+"""Test cases for the Bloom filter."""
+
+from app.utils.bloom import BloomFilter
+
+
+def test_added_items_are_always_found():
+    """Test the filter never misses an item that was added."""
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    items = [f"token-{index}" for index in range(1000)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+    assert bloom.count == 1000
+    assert not bloom.saturated
+
+
+def test_false_positive_rate_is_bounded():
+    """Test absent items are rarely reported while within capacity."""
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for index in range(1000):
+        bloom.add(f"token-{index}")
+    false_positives = sum(f"other-{index}" in bloom for index in range(10000))
+    assert false_positives < 300
+
+
+def test_saturation():
+    """Test adding more items than planned is reported."""
+    bloom = BloomFilter(capacity=2)
+    for item in ("a", "b", "c"):
+        bloom.add(item)
+    assert bloom.saturated
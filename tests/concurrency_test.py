@@ -0,0 +1,203 @@
+"""Test cases for concurrent stock decrements and transaction retries."""
+
+import threading
+from datetime import date, timedelta
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+
+from app.config import Settings
+from app.db.database import SessionLocal, configure_database, get_engine
+from app.db.migrate import migrate
+from app.db.retry import run_transaction
+from app.Egg.egg_model import Egg
+from app.Egg.egg_repository import delete_egg
+from app.Egg.stock_reconcile import reconcile_stock
+from app.main import create_app
+
+
+def _lot(quantity, sell_price=100):
+    return {
+        "avalibleQuantity": quantity,
+        "expirationDate": (date.today() + timedelta(days=30)).isoformat(),
+        "entryDate": date.today().isoformat(),
+        "sellPrice": sell_price,
+        "entryPrice": 90,
+        "color": "White",
+        "type_egg_id": 1,
+        "supplier_id": 1,
+    }
+
+
+def _seed(client):
+    client.post("/role/", json={"name": "CUSTOMER"})
+    client.post(
+        "/user/",
+        json={
+            "name": "User",
+            "phone_number": "3133333333",
+            "email": "user@mail.com",
+            "username": "user",
+            "password": "123",
+            "address": "Somewhere",
+            "enabled": True,
+            "role_ids": [1],
+        },
+    )
+    client.post("/supplier/", json={"name": "Supplier", "address": "Somewhere"})
+    client.post("/typeeggs/", json={"name": "AA"})
+
+
+@pytest.fixture
+def _file_client(tmp_path):
+    """An app on a migrated SQLite file, so requests run on separate connections."""
+    settings = Settings(
+        database_url=f"sqlite:///{tmp_path / 'shop.db'}",
+        async_database_url=f"sqlite+aiosqlite:///{tmp_path / 'shop.db'}",
+        bcrypt_pool_workers=0,
+        bcrypt_rounds=4,
+        db_pool_size=20,
+        slow_query_ms=None,
+    )
+    app = create_app(settings)
+    migrate(get_engine())
+    with TestClient(app) as client:
+        _seed(client)
+        yield client
+    configure_database(Settings.from_env())
+
+
+def test_concurrent_checkouts_never_oversell(_file_client):
+    """Test many parallel checkouts of the same lots sell exactly the stock."""
+    _file_client.post("/egg/", json=_lot(50))
+    _file_client.post("/egg/", json=_lot(50, sell_price=120))
+    statuses, sold = [], []
+    lock = threading.Lock()
+
+    def checkout():
+        for _ in range(8):
+            response = _file_client.post(
+                "/order/place",
+                json={
+                    "user_id": 1,
+                    "lines": [{"egg_id": 1, "quantity": 2}, {"egg_id": 2, "quantity": 1}],
+                },
+            )
+            with lock:
+                statuses.append(response.status_code)
+                if response.status_code == 201:
+                    sold.append(response.json()["order_eggs"])
+
+    threads = [threading.Thread(target=checkout) for _ in range(16)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert set(statuses) <= {201, 409}
+    # lot 1 runs out after 25 orders of 2 eggs
+    assert statuses.count(201) == 25
+    assert sum(line["quantity"] for lines in sold for line in lines) == 25 * 3
+    db = SessionLocal(bind=get_engine())
+    try:
+        assert [egg.avalibleQuantity for egg in db.query(Egg).order_by(Egg.id)] == [0, 25]
+        assert reconcile_stock(db)["discrepancies"] == []
+    finally:
+        db.close()
+
+
+def test_concurrent_refreshes_of_one_token_issue_one_pair(_file_client):
+    """Test parallel refreshes of the same token succeed exactly once."""
+    refresh_token = _file_client.post(
+        "/login", data={"username": "user", "password": "123"}
+    ).json()["refresh_token"]
+    statuses = []
+    lock = threading.Lock()
+    barrier = threading.Barrier(6)
+
+    def refresh():
+        barrier.wait()
+        response = _file_client.post("/refresh", json={"refresh_token": refresh_token})
+        with lock:
+            statuses.append(response.status_code)
+
+    threads = [threading.Thread(target=refresh) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(statuses) == [200] + [401] * 5
+
+
+def test_update_based_on_stale_version_is_rejected(_file_client):
+    """Test an egg update cannot overwrite stock taken since it was read."""
+    egg = _file_client.post("/egg/", json=_lot(50)).json()
+    assert egg["version"] == 1
+    _file_client.post(
+        "/order/place", json={"user_id": 1, "lines": [{"egg_id": 1, "quantity": 5}]}
+    )
+
+    stale = _file_client.put("/egg/1", json={**_lot(50), "version": 1})
+    assert stale.status_code == 409
+    assert _file_client.get("/egg/1").json()["avalibleQuantity"] == 45
+
+    fresh = _file_client.put("/egg/1", json={**_lot(60), "version": 2})
+    assert fresh.status_code == 200
+    assert fresh.json()["version"] == 3
+    assert _file_client.get("/egg/stock/1").json()["quantity"] == 60
+
+
+def test_delete_of_changed_lot_is_rejected(_file_client):
+    """Test a lot changed after it was read is not deleted."""
+    _file_client.post("/egg/", json=_lot(50))
+    db = SessionLocal(bind=get_engine())
+    try:
+        # the session keeps the version it read, as a request would
+        stale = db.get(Egg, 1)
+        assert stale.version == 1
+        assert _file_client.put("/egg/1", json=_lot(45)).status_code == 200
+        with pytest.raises(HTTPException) as error:
+            delete_egg(1, db)
+        assert error.value.status_code == 409
+        assert reconcile_stock(db)["discrepancies"] == []
+    finally:
+        db.close()
+    assert _file_client.get("/egg/1").json()["avalibleQuantity"] == 45
+    assert _file_client.get("/egg/stock/1").json()["quantity"] == 45
+
+
+def _locked():
+    return OperationalError("UPDATE egg", {}, Exception("database is locked"))
+
+
+def test_run_transaction_retries_conflicts(_test_db):
+    """Test lock conflicts are retried and other errors are not."""
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) < 3:
+            raise _locked()
+        return "done"
+
+    assert run_transaction(_test_db, flaky, attempts=3, backoff=0) == "done"
+    assert len(calls) == 3
+
+    def always_locked():
+        raise _locked()
+
+    with pytest.raises(HTTPException) as error:
+        run_transaction(_test_db, always_locked, attempts=2, backoff=0)
+    assert error.value.status_code == 503
+
+    def broken():
+        calls.append(1)
+        raise OperationalError("SELECT", {}, Exception("no such table: egg"))
+
+    calls.clear()
+    with pytest.raises(OperationalError):
+        run_transaction(_test_db, broken, attempts=3, backoff=0)
+    assert len(calls) == 1
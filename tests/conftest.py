@@ -11,10 +11,19 @@ import pytest
 
 # Application
 from fastapi.testclient import TestClient
-from app.main import app
+from app.main import create_app
+from app.config import Settings
 from app.db.database import Base
-from app.db.session import get_db
-from app.Auth.auth_service import get_current_user, require_admin
+from app.db.session import get_db, get_read_db
+from app.Auth.auth_service import (
+    get_current_user,
+    principal_cache,
+    require_admin,
+    token_cache,
+)
+from app.Auth.token_revocation import revocation_list
+from app.Egg.stock_summary_repository import stock_shard_counts
+from app.User.user_availability import availability_filter
 from app.User.user_model import User
 from app.Role.role_model import Role
 
@@ -29,6 +38,21 @@ engine = create_engine(
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The schema is created per test on the SQLite engine, never on the app's database.
+# bcrypt runs inline (the process pool would be respawned for every test client)
+# at the lowest cost, skipping the startup calibration.
+app = create_app(
+    Settings.from_env().model_copy(
+        update={
+            "create_schema_on_startup": False,
+            "bcrypt_pool_workers": 0,
+            "bcrypt_rounds": 4,
+            # the reaper would run on the app's database, not the test one
+            "reservation_reap_seconds": 0,
+        }
+    )
+)
+
 
 @pytest.fixture(scope="function")
 def _test_db():
@@ -50,6 +74,37 @@ def _client(_test_db):
         yield _test_db
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    principal_cache.clear()  # users cached by a previous test's database
+    token_cache.clear()
+    revocation_list.reset()
+    availability_filter.reset()
+    stock_shard_counts.clear()
     with TestClient(app) as test_client:
         yield test_client
-    app.dependency_overrides.clear()
\ No newline at end of file
+    app.dependency_overrides.clear()
+
+
+@pytest.fixture
+def _admin_headers(_client):
+    """Creates an admin user and returns its authorization headers."""
+    role = _client.post("/role/", json={"name": "ADMIN"}).json()
+    _client.post(
+        "/user/",
+        json={
+            "name": "Admin User",
+            "phone_number": "3000000000",
+            "email": "admin@mail.com",
+            "username": "adminuser",
+            "password": "admin123",
+            "address": "HQ",
+            "enabled": True,
+            "role_ids": [role["id"]],
+        },
+    )
+    response = _client.post(
+        "/login",
+        data={"username": "adminuser", "password": "admin123"},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
@@ -224,4 +224,4 @@ def test_get_month_egg(_client):
     assert response.status_code == 200
     data = response.json()
     print(data)
-    assert data == 2
\ No newline at end of file
+    assert data == 121
\ No newline at end of file
@@ -0,0 +1,154 @@
+"""Test cases for the eager-loading policy of the response models."""
+
+from datetime import date, timedelta
+
+from app.db.instrumentation import route_stats
+
+
+def _queries(_client, _test_db, path):
+    """Return how many queries one request to ``path`` ran."""
+    _test_db.expunge_all()  # the test session is shared; force the loads
+    route_stats.reset()
+    response = _client.get(path)
+    assert response.status_code == 200
+    stats = {item["route"]: item for item in route_stats.snapshot()}
+    return response.json(), stats[f"GET {path}"]["queries"]
+
+
+def _create_egg(_client, number):
+    _client.post(
+        "/supplier/", json={"name": f"Supplier{number}", "address": f"Street {number}"}
+    )
+    _client.post(
+        "/egg/",
+        json={
+            "avalibleQuantity": 30,
+            "expirationDate": (date.today() + timedelta(days=30)).isoformat(),
+            "entryDate": date.today().isoformat(),
+            "sellPrice": 100,
+            "entryPrice": 90,
+            "color": "White",
+            "type_egg_id": 1,
+            "supplier_id": number,
+        },
+    )
+
+
+def _create_customer(_client):
+    _client.post("/role/", json={"name": "CUSTOMER"})
+    _client.post(
+        "/user/",
+        json={
+            "name": "User",
+            "phone_number": "3133333333",
+            "email": "customer@mail.com",
+            "username": "customer",
+            "password": "123",
+            "address": "Somewhere",
+            "enabled": True,
+            "role_ids": [1],
+        },
+    )
+
+
+def _create_paid_order(_client, number):
+    _client.post("/order/", json={"totalPrice": 100, "state": "pending", "user_id": 1})
+    _client.post("/bill/", json={"totalprice": 100, "paid": False, "order_id": number})
+    _client.post(
+        "/pay/",
+        json={
+            "amount_paid": 100,
+            "payment_method": "cash",
+            "user_id": 1,
+            "bill_id": number,
+        },
+    )
+
+
+def test_egg_list_query_count_is_constant(_client, _test_db):
+    """Test eggs with their supplier and type are listed in one query."""
+    _client.post("/typeeggs/", json={"name": "SupremeEgg"})
+    _create_egg(_client, 1)
+    eggs, single = _queries(_client, _test_db, "/egg/")
+    assert eggs[0]["supplier"]["name"] == "Supplier1"
+
+    for number in range(2, 6):
+        _create_egg(_client, number)
+    eggs, many = _queries(_client, _test_db, "/egg/")
+    assert len(eggs) == 5
+    assert all(egg["supplier"] and egg["type_egg"] for egg in eggs)
+    assert many == single == 1
+
+
+def test_pay_list_query_count_is_constant(_client, _test_db):
+    """Test payments with their user and roles cost the same for any row count."""
+    _create_customer(_client)
+    _create_paid_order(_client, 1)
+    pays, single = _queries(_client, _test_db, "/pay/")
+    assert pays[0]["user"]["roles"][0]["name"] == "CUSTOMER"
+
+    for number in range(2, 5):
+        _create_paid_order(_client, number)
+    pays, many = _queries(_client, _test_db, "/pay/")
+    assert len(pays) == 4
+    assert many == single == 2  # payments joined with users, then roles
+
+
+def _create_customer_order(_client, number):
+    _client.post(
+        "/user/",
+        json={
+            "name": f"User {number}",
+            "phone_number": f"31333333{number:02d}",
+            "email": f"customer{number}@mail.com",
+            "username": f"customer{number}",
+            "password": "123",
+            "address": f"Street {number}",
+            "enabled": True,
+            "role_ids": [1],
+        },
+    )
+    _client.post(
+        "/order/", json={"totalPrice": 100, "state": "pending", "user_id": number}
+    )
+
+
+def test_order_list_query_count_is_constant(_client, _test_db):
+    """Test orders with their user and roles cost the same for any row count."""
+    _client.post("/role/", json={"name": "CUSTOMER"})
+    _create_customer_order(_client, 1)
+    orders, single = _queries(_client, _test_db, "/order/")
+    assert orders[0]["user"]["roles"][0]["name"] == "CUSTOMER"
+
+    for number in range(2, 6):
+        _create_customer_order(_client, number)
+    orders, many = _queries(_client, _test_db, "/order/")
+    assert len(orders) == 5
+    assert {order["user"]["username"] for order in orders} == {
+        f"customer{number}" for number in range(1, 6)
+    }
+    assert many == single == 2  # orders joined with users, then roles
+
+
+def test_user_list_query_count_is_constant(_client, _test_db, _admin_headers):
+    """Test users with their roles cost the same for any row count."""
+    headers = _admin_headers
+    _client.get("/user/", headers=headers)  # syncs the revocation filter
+
+    def queries():
+        _test_db.expunge_all()
+        route_stats.reset()
+        response = _client.get("/user/", headers=headers)
+        assert response.status_code == 200
+        stats = {item["route"]: item for item in route_stats.snapshot()}
+        return response.json(), stats["GET /user/"]["queries"]
+
+    users, single = queries()
+    assert users[0]["roles"][0]["name"] == "ADMIN"
+
+    for number in range(2, 6):
+        _create_customer_order(_client, number)
+    users, many = queries()
+    assert len(users) == 5
+    assert all(user["roles"] for user in users)
+    assert many == single == 2  # users, then their roles
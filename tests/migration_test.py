@@ -0,0 +1,84 @@
+"""Test cases for the schema migration command."""
+
+from sqlalchemy import create_engine, inspect
+
+from app.db.database import Base
+from app.db.migrate import load_migrations, main, migrate, status
+
+
+def _engine(tmp_path):
+    return create_engine(f"sqlite:///{tmp_path / 'migrate.db'}")
+
+
+def test_migrate_creates_schema(tmp_path):
+    """Test the first run applies every migration and creates all tables."""
+    engine = _engine(tmp_path)
+    versions = [module.VERSION for module in load_migrations()]
+
+    assert migrate(engine) == versions
+    tables = set(inspect(engine).get_table_names())
+    assert set(Base.metadata.tables) <= tables
+    assert "schema_migrations" in tables
+    assert all(applied for _, _, applied in status(engine))
+
+
+def test_migrate_is_idempotent(tmp_path):
+    """Test a second run finds nothing to apply."""
+    engine = _engine(tmp_path)
+    migrate(engine)
+    assert migrate(engine) == []
+
+
+def test_migrate_adopts_existing_schema(tmp_path):
+    """Test a database created by create_all is adopted without errors."""
+    engine = _engine(tmp_path)
+    Base.metadata.create_all(engine)
+    assert migrate(engine) == [module.VERSION for module in load_migrations()]
+
+
+def test_status_command(tmp_path, monkeypatch, capsys):
+    """Test the --status flag lists the migrations without applying them."""
+    engine = _engine(tmp_path)
+    monkeypatch.setattr("app.db.migrate.get_engine", lambda: engine)
+    main(["--status"])
+    assert "pending" in capsys.readouterr().out
+    main([])
+    assert "Applied migrations: 0001" in capsys.readouterr().out
+    main(["--status"])
+    assert "pending" not in capsys.readouterr().out
+
+
+def test_migrate_adds_missing_columns(tmp_path):
+    """Test columns added to models after a table was created are migrated."""
+    engine = _engine(tmp_path)
+    with engine.begin() as connection:
+        connection.exec_driver_sql(
+            "CREATE TABLE user (id INTEGER PRIMARY KEY, name VARCHAR(50), "
+            "phone_number VARCHAR(50), email VARCHAR(50), username VARCHAR(50), "
+            "password VARCHAR(50), address VARCHAR(50), enabled BOOLEAN)"
+        )
+        connection.exec_driver_sql("INSERT INTO user (id, username) VALUES (1, 'old')")
+    migrate(engine)
+    columns = {column["name"] for column in inspect(engine).get_columns("user")}
+    assert "token_version" in columns
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("SELECT token_version FROM user").scalar() == 0
+
+
+def test_reservation_price_backfilled_from_lot(tmp_path):
+    """Test holds made before reservations had a price get their lot's price."""
+    engine = _engine(tmp_path)
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.exec_driver_sql("ALTER TABLE reservation DROP COLUMN unit_price")
+        connection.exec_driver_sql(
+            'INSERT INTO egg (id, "avalibleQuantity", "sellPrice", "entryPrice", color, '
+            "type_egg_id) VALUES (1, 10, 120, 90, 'White', 1)"
+        )
+        connection.exec_driver_sql(
+            "INSERT INTO reservation (id, egg_id, order_id, quantity, expires_at) "
+            "VALUES (1, 1, 1, 2, '2030-01-01 00:00:00')"
+        )
+    migrate(engine)
+    with engine.connect() as connection:
+        assert connection.exec_driver_sql("SELECT unit_price FROM reservation").scalar() == 120
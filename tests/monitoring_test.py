@@ -0,0 +1,254 @@
+"""Test cases for the runtime monitoring endpoints."""
+
+import asyncio
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import exc, text
+
+from app.db.database import build_async_engine, build_engine
+from app.db.instrumentation import install_sql_instrumentation, route_stats, statement_shape
+from app.db.slow_query_log import SlowQueryLog, slow_query_log
+
+
+def test_pool_stats_record_checkouts(tmp_path):
+    """Test the instrumented pool records occupancy and latencies."""
+    engine = build_engine(f"sqlite:///{tmp_path / 'pool.db'}", pool_size=2)
+    with engine.connect() as first, engine.connect() as second:
+        first.execute(text("SELECT 1"))
+        second.execute(text("SELECT 1"))
+        assert engine.pool.checkedout() == 2
+    stats = engine.pool.stats.snapshot()
+    assert stats["peak_checked_out"] == 2
+    assert stats["connects"] == 2
+    assert stats["checkout_ms"]["count"] == 2
+    assert stats["wait_ms"]["count"] == 2
+    engine.dispose()
+
+
+def test_pool_stats_count_timeouts(tmp_path):
+    """Test checkouts that exceed pool_timeout are counted."""
+    engine = build_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+    assert engine.pool.stats.timeouts == 1
+    engine.dispose()
+
+
+def test_pool_idle_pre_ping(tmp_path):
+    """Test the idle pre-ping strategy replaces connections that fail the ping."""
+    engine = build_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}", pre_ping="idle", pre_ping_idle=0
+    )
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        pooled = connection.connection.dbapi_connection
+    pooled.close()
+    with engine.connect() as connection:
+        assert connection.execute(text("SELECT 1")).scalar() == 1
+    assert engine.pool.stats.invalidations == 1
+    engine.dispose()
+
+
+def test_async_pool_idle_pre_ping(tmp_path, monkeypatch):
+    """Test the async engine only pings connections idle past the threshold."""
+    pings = []
+
+    async def checkouts(engine):
+        for _ in range(2):
+            async with engine.connect() as connection:
+                await connection.execute(text("SELECT 1"))
+        await engine.dispose()
+
+    for idle, expected in ((3600, 0), (0, 2)):
+        engine = build_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}",
+            pre_ping="idle",
+            pre_ping_idle=idle,
+        )
+        ping = engine.sync_engine.dialect.do_ping
+        monkeypatch.setattr(
+            engine.sync_engine.dialect,
+            "do_ping",
+            lambda connection, ping=ping: pings.append(1) or ping(connection),
+        )
+        pings.clear()
+        asyncio.run(checkouts(engine))
+        assert len(pings) == expected
+
+
+def test_unknown_pre_ping_strategy(tmp_path):
+    """Test an unknown pre-ping strategy is rejected."""
+    with pytest.raises(ValueError):
+        build_engine(f"sqlite:///{tmp_path / 'pool.db'}", pre_ping="sometimes")
+
+
+def test_get_pool_stats(_client, _admin_headers):
+    """Test the pool statistics endpoint."""
+    response = _client.get("/monitoring/pool", headers=_admin_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert "pool_class" in data
+    assert "worker_pid" in data
+
+
+def test_get_pool_stats_requires_auth(_client):
+    """Test the pool statistics endpoint rejects anonymous users."""
+    response = _client.get("/monitoring/pool")
+    assert response.status_code == 401
+
+
+def test_statement_shape_ignores_values():
+    """Test statements differing only in values share one shape."""
+    first = statement_shape("SELECT * FROM egg WHERE id = ? AND color = 'White'")
+    second = statement_shape("SELECT *  FROM egg\nWHERE id = ? AND color = 'Brown'")
+    assert first == second
+    assert statement_shape("SELECT 1 WHERE id IN (?, ?, ?)") == statement_shape(
+        "SELECT 2 WHERE id IN (?)"
+    )
+
+
+def test_sql_stats_detect_n_plus_one(_client, _test_db, _admin_headers, monkeypatch):
+    """Test lazy loads repeated per row are reported for the route."""
+    # without the eager loads of EggResponse every egg lazy-loads its relations
+    monkeypatch.setattr("app.Egg.egg_repository.response_options", lambda *_: ())
+    headers = _admin_headers
+    _client.post("/typeeggs/", json={"name": "SupremeEgg"})
+    expiration = (date.today() + timedelta(days=30)).isoformat()
+    for number in range(1, 7):
+        _client.post(
+            "/supplier/", json={"name": f"Supplier{number}", "address": f"Street {number}"}
+        )
+        _client.post(
+            "/egg/",
+            json={
+                "avalibleQuantity": 30,
+                "expirationDate": expiration,
+                "entryDate": date.today().isoformat(),
+                "sellPrice": 100,
+                "entryPrice": 90,
+                "color": "White",
+                "type_egg_id": 1,
+                "supplier_id": number,
+            },
+        )
+    _test_db.expunge_all()  # the test session is shared; force the lazy loads
+    route_stats.reset()
+    assert _client.get("/egg/").status_code == 200
+
+    response = _client.get("/monitoring/sql", headers=headers)
+    assert response.status_code == 200
+    stats = {item["route"]: item for item in response.json()}
+    eggs = stats["GET /egg/"]
+    assert eggs["requests"] == 1
+    assert eggs["queries"] >= 7
+    assert eggs["n_plus_one_requests"] == 1
+    assert any("supplier" in shape for shape in eggs["n_plus_one_statements"])
+    assert eggs["slowest_statement"]
+
+    assert _client.delete("/monitoring/sql", headers=headers).status_code == 204
+    assert "GET /egg/" not in {
+        item["route"] for item in _client.get("/monitoring/sql", headers=headers).json()
+    }
+
+
+@pytest.fixture
+def _slow_log(tmp_path):
+    """Log every statement to a temporary file; the settings are restored afterwards."""
+    previous = (
+        slow_query_log.path,
+        slow_query_log.threshold_ms,
+        slow_query_log.explain,
+        slow_query_log.log_parameters,
+    )
+    slow_query_log.configure(str(tmp_path / "slow.log"), 0, True)
+    yield slow_query_log
+    slow_query_log.configure(*previous)
+
+
+def test_slow_query_log_captures_explain(tmp_path, _slow_log):
+    """Test slow SELECTs are logged with redacted parameters and an EXPLAIN plan."""
+    install_sql_instrumentation()
+    engine = build_engine(f"sqlite:///{tmp_path / 'slow.db'}")
+    with engine.connect() as connection:
+        connection.execute(text("CREATE TABLE item (id INTEGER PRIMARY KEY)"))
+        connection.execute(text("SELECT id FROM item WHERE id = :id"), {"id": 7})
+    _slow_log.wait()
+    engine.dispose()
+
+    entries = _slow_log.tail(10)
+    select = next(entry for entry in entries if entry["statement"].startswith("SELECT"))
+    assert select["parameters"] == ["?"]
+    assert select["explain"] and "error" not in select["explain"][0]
+    create = next(entry for entry in entries if entry["statement"].startswith("CREATE"))
+    assert create["explain"] is None
+    assert not any("EXPLAIN" in entry["statement"] for entry in entries)
+
+
+def test_slow_query_log_parameters(tmp_path, _slow_log):
+    """Test values are only logged when opted in, and never for executemany."""
+    install_sql_instrumentation()
+    _slow_log.configure(str(tmp_path / "slow.log"), 0, False, log_parameters=True)
+    engine = build_engine(f"sqlite:///{tmp_path / 'slow.db'}")
+    with engine.connect() as connection:
+        connection.execute(text("CREATE TABLE item (id INTEGER PRIMARY KEY)"))
+        connection.execute(text("SELECT id FROM item WHERE id = :id"), {"id": 7})
+        connection.execute(text("INSERT INTO item (id) VALUES (:id)"), [{"id": 1}, {"id": 2}])
+    _slow_log.wait()
+    engine.dispose()
+
+    entries = _slow_log.tail(10)
+    select = next(entry for entry in entries if entry["statement"].startswith("SELECT"))
+    assert select["parameters"] == [7]
+    insert = next(entry for entry in entries if entry["statement"].startswith("INSERT"))
+    assert insert["parameters"] is None
+    assert insert["batch_size"] == 2
+
+
+def test_slow_query_log_drops_explain_when_saturated(tmp_path, _slow_log, monkeypatch):
+    """Test slow SELECTs are logged without a plan once too many EXPLAINs wait."""
+    install_sql_instrumentation()
+    monkeypatch.setattr("app.db.slow_query_log.MAX_PENDING_EXPLAINS", 0)
+    dropped = _slow_log.explains_dropped
+    engine = build_engine(f"sqlite:///{tmp_path / 'slow.db'}")
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    engine.dispose()
+
+    select = next(
+        entry for entry in _slow_log.tail(10) if entry["statement"].startswith("SELECT")
+    )
+    assert select["explain"] is None
+    assert _slow_log.explains_dropped == dropped + 1
+
+
+def test_slow_query_log_tail_reads_from_the_end(tmp_path, monkeypatch):
+    """Test tail returns the last entries, newest first, across read blocks."""
+    monkeypatch.setattr("app.db.slow_query_log.TAIL_BLOCK_SIZE", 16)
+    log = SlowQueryLog(str(tmp_path / "slow.log"))
+    for number in range(50):
+        log._write({"statement": f"SELECT {number}"})  # pylint: disable=protected-access
+    assert [entry["statement"] for entry in log.tail(3)] == [
+        "SELECT 49",
+        "SELECT 48",
+        "SELECT 47",
+    ]
+    assert len(log.tail(100)) == 50
+    assert log.tail(0) == []
+
+
+def test_get_slow_queries(_client, _admin_headers, _slow_log):
+    """Test the slow query endpoint returns the logged statements with their route."""
+    headers = _admin_headers
+    _client.get("/role/")
+    _slow_log.wait()
+    response = _client.get("/monitoring/slow-queries?limit=100", headers=headers)
+    assert response.status_code == 200
+    routes = {entry["route"] for entry in response.json()}
+    assert "GET /role/" in routes
@@ -1,5 +1,10 @@
 """Test cases for Order endpoints."""
 
+from datetime import date, timedelta
+
+from app.Egg.egg_model import Egg
+from app.Egg.stock_reconcile import reconcile_stock
+
 def test_create_order(_client):
     """Test creating an order."""
     _client.post("/role/", json={"name": "CUSTOMER"})
@@ -197,4 +202,93 @@ def test_get_orders_year_month(_client):
     print(response.json())
     assert response.status_code == 200
     data = response.json()
-    assert len(data) == 3
\ No newline at end of file
+    assert len(data) == 3
+
+
+def _stock_shop(_client, _test_db):
+    """A customer, a supplier, an egg type and three lots of 10 eggs, one expired."""
+    _client.post("/role/", json={"name": "CUSTOMER"})
+    _client.post(
+        "/user/",
+        json={
+            "name": "User",
+            "phone_number": "3133333333",
+            "email": "SomeEmail@Mail.com",
+            "username": "user",
+            "password": "123",
+            "address": "Somewhere",
+            "enabled": True,
+            "role_ids": [1],
+        },
+    )
+    _client.post("/supplier/", json={"name": "Supplier", "address": "Somewhere"})
+    _client.post("/typeeggs/", json={"name": "AA"})
+    for days, price in ((10, 100), (20, 120), (1, 90)):
+        _client.post(
+            "/egg/",
+            json={
+                "avalibleQuantity": 10,
+                "expirationDate": (date.today() + timedelta(days=days)).isoformat(),
+                "entryDate": date.today().isoformat(),
+                "sellPrice": price,
+                "entryPrice": 80,
+                "color": "White",
+                "type_egg_id": 1,
+                "supplier_id": 1,
+            },
+        )
+    _test_db.query(Egg).filter(Egg.id == 3).update(
+        {"expirationDate": date.today() - timedelta(days=1)}
+    )
+    _test_db.commit()
+
+
+def test_place_order(_client, _test_db):
+    """Test a basket becomes an order with server-computed totals."""
+    _stock_shop(_client, _test_db)
+    response = _client.post(
+        "/order/place",
+        json={
+            "user_id": 1,
+            "lines": [
+                {"egg_id": 1, "quantity": 4},
+                {"egg_id": 2, "quantity": 5},
+                {"egg_id": 1, "quantity": 2},
+            ],
+        },
+    )
+    assert response.status_code == 201
+    data = response.json()
+    assert data["state"] == "pending"
+    assert data["totalPrice"] == 6 * 100 + 5 * 120
+    lines = {line["egg_id"]: line for line in data["order_eggs"]}
+    assert lines[1]["quantity"] == 6 and lines[1]["sub_total"] == 600
+    assert lines[2]["unit_price"] == 120 and lines[2]["sub_total"] == 600
+
+    assert _client.get("/egg/1").json()["avalibleQuantity"] == 4
+    assert _client.get("/egg/2").json()["avalibleQuantity"] == 5
+    assert _client.get("/egg/stock/1").json()["quantity"] == 9  # lot 3 expired
+    assert reconcile_stock(_test_db)["discrepancies"] == []
+
+
+def test_place_order_is_all_or_nothing(_client, _test_db):
+    """Test a basket with one bad line places nothing and keeps the stock."""
+    _stock_shop(_client, _test_db)
+    baskets = [
+        ([{"egg_id": 1, "quantity": 5}, {"egg_id": 2, "quantity": 11}], 409),
+        ([{"egg_id": 1, "quantity": 5}, {"egg_id": 3, "quantity": 1}], 409),
+        ([{"egg_id": 1, "quantity": 5}, {"egg_id": 99, "quantity": 1}], 404),
+        ([{"egg_id": 1, "quantity": 0}], 400),
+        ([], 400),
+    ]
+    for lines, status in baskets:
+        response = _client.post("/order/place", json={"user_id": 1, "lines": lines})
+        assert response.status_code == status
+    assert _client.post(
+        "/order/place", json={"user_id": 99, "lines": [{"egg_id": 1, "quantity": 1}]}
+    ).status_code == 404
+
+    _test_db.expire_all()
+    assert [egg.avalibleQuantity for egg in _test_db.query(Egg).all()] == [10, 10, 10]
+    assert _client.get("/order/").json() == []
+    assert _client.get("/orderegg/").json() == []
@@ -1,5 +1,11 @@
 """Test cases for Order endpoints."""
 
+from datetime import date, timedelta
+
+from app.Egg.stock_reconcile import reconcile_stock
+
+EXPIRATION = (date.today() + timedelta(days=30)).isoformat()
+
 
 def test_create_orderEgg(_client):
     """Test creating an orderEgg."""
@@ -8,7 +14,7 @@ def test_create_orderEgg(_client):
     _client.post("/order/",json={"totalPrice": 40000,"state": "pending","user_id": 1})
     _client.post("/supplier/", json={"name": "Supplier2", "address": "Somewhere"})
     _client.post("/typeeggs/", json={"name": "SupremeEgg"})
-    _client.post("/egg/",json={"avalibleQuantity": 30,"expirationDate": "2026-02-01","entryDate": "2025-05-21","sellPrice": 100,"entryPrice": 90,"color": "White","type_egg_id": 1,"supplier_id": 1})
+    _client.post("/egg/",json={"avalibleQuantity": 50,"expirationDate": EXPIRATION,"entryDate": "2025-05-21","sellPrice": 100,"entryPrice": 90,"color": "White","type_egg_id": 1,"supplier_id": 1})
     response = _client.post(
         "/orderegg/",
         json={
@@ -35,7 +41,7 @@ def test_get_orderEggs(_client):
     _client.post("/order/",json={"totalPrice": 40000,"state": "pending","user_id": 1})
     _client.post("/supplier/", json={"name": "Supplier2", "address": "Somewhere"})
     _client.post("/typeeggs/", json={"name": "SupremeEgg"})
-    _client.post("/egg/",json={"avalibleQuantity": 30,"expirationDate": "2026-02-01","entryDate": "2025-05-21","sellPrice": 100,"entryPrice": 90,"color": "White","type_egg_id": 1,"supplier_id": 1})
+    _client.post("/egg/",json={"avalibleQuantity": 50,"expirationDate": EXPIRATION,"entryDate": "2025-05-21","sellPrice": 100,"entryPrice": 90,"color": "White","type_egg_id": 1,"supplier_id": 1})
     _client.post(
         "/orderegg/",
         json={
@@ -58,7 +64,7 @@ def test_get_orderEgg(_client):
     _client.post("/order/",json={"totalPrice": 40000,"state": "pending","user_id": 1})
     _client.post("/supplier/", json={"name": "Supplier2", "address": "Somewhere"})
     _client.post("/typeeggs/", json={"name": "SupremeEgg"})
-    _client.post("/egg/",json={"avalibleQuantity": 30,"expirationDate": "2026-02-01","entryDate": "2025-05-21","sellPrice": 100,"entryPrice": 90,"color": "White","type_egg_id": 1,"supplier_id": 1})
+    _client.post("/egg/",json={"avalibleQuantity": 50,"expirationDate": EXPIRATION,"entryDate": "2025-05-21","sellPrice": 100,"entryPrice": 90,"color": "White","type_egg_id": 1,"supplier_id": 1})
     response = _client.post(
         "/orderegg/",
         json={
@@ -84,7 +90,7 @@ def test_update_orderEgg(_client):
     _client.post("/order/",json={"totalPrice": 40000,"state": "pending","user_id": 1})
     _client.post("/supplier/", json={"name": "Supplier2", "address": "Somewhere"})
     _client.post("/typeeggs/", json={"name": "SupremeEgg"})
-    _client.post("/egg/",json={"avalibleQuantity": 30,"expirationDate": "2026-02-01","entryDate": "2025-05-21","sellPrice": 100,"entryPrice": 90,"color": "White","type_egg_id": 1,"supplier_id": 1})
+    _client.post("/egg/",json={"avalibleQuantity": 50,"expirationDate": EXPIRATION,"entryDate": "2025-05-21","sellPrice": 100,"entryPrice": 90,"color": "White","type_egg_id": 1,"supplier_id": 1})
     response = _client.post(
         "/orderegg/",
         json={
@@ -120,7 +126,7 @@ def test_delete_orderEgg(_client):
     _client.post("/order/",json={"totalPrice": 40000,"state": "pending","user_id": 1})
     _client.post("/supplier/", json={"name": "Supplier2", "address": "Somewhere"})
     _client.post("/typeeggs/", json={"name": "SupremeEgg"})
-    _client.post("/egg/",json={"avalibleQuantity": 30,"expirationDate": "2026-02-01","entryDate": "2025-05-21","sellPrice": 100,"entryPrice": 90,"color": "White","type_egg_id": 1,"supplier_id": 1})
+    _client.post("/egg/",json={"avalibleQuantity": 50,"expirationDate": EXPIRATION,"entryDate": "2025-05-21","sellPrice": 100,"entryPrice": 90,"color": "White","type_egg_id": 1,"supplier_id": 1})
     response = _client.post(
         "/orderegg/",
         json={
@@ -136,3 +142,40 @@ def test_delete_orderEgg(_client):
     assert response.status_code == 200
     get_response = _client.get(f"/orderegg/{created_orderEgg['id']}")
     assert get_response.status_code == 404
+
+
+def test_order_lines_move_stock(_client, _test_db):
+    """Test creating, changing and deleting lines takes and returns lot stock."""
+    _client.post("/role/", json={"name": "CUSTOMER"})
+    _client.post("/user/", json={"name": "User", "phone_number": "3133333333", "email": "SomeEmail@Mail.com", "username":"user","password": "123","address": "Somewhere","enabled": True, "role_ids": [1]})
+    _client.post("/order/",json={"totalPrice": 40000,"state": "pending","user_id": 1})
+    _client.post("/supplier/", json={"name": "Supplier2", "address": "Somewhere"})
+    _client.post("/typeeggs/", json={"name": "SupremeEgg"})
+    for _ in range(2):
+        _client.post("/egg/",json={"avalibleQuantity": 50,"expirationDate": EXPIRATION,"entryDate": "2025-05-21","sellPrice": 100,"entryPrice": 90,"color": "White","type_egg_id": 1,"supplier_id": 1})
+    line = {"quantity": 20, "unit_price": 100, "sub_total": 2000, "egg_id": 1, "order_id": 1}
+
+    first = _client.post("/orderegg/", json=line).json()
+    assert _client.get("/egg/1").json()["avalibleQuantity"] == 30
+    assert _client.post("/orderegg/", json={**line, "quantity": 31}).status_code == 409
+    assert _client.post("/orderegg/", json={**line, "egg_id": 9}).status_code == 404
+
+    # moving the line to the other lot gives the first one its eggs back
+    response = _client.put(f"/orderegg/{first['id']}", json={**line, "quantity": 60, "egg_id": 2})
+    assert response.status_code == 409
+    response = _client.put(f"/orderegg/{first['id']}", json={**line, "quantity": 25, "egg_id": 2})
+    assert response.status_code == 200
+    assert response.json()["quantity"] == 25
+    assert _client.get("/egg/1").json()["avalibleQuantity"] == 50
+    assert _client.get("/egg/2").json()["avalibleQuantity"] == 25
+
+    _client.post("/orderegg/", json=line)
+    assert _client.delete(f"/orderegg/{first['id']}").status_code == 200
+    assert _client.get("/egg/2").json()["avalibleQuantity"] == 50
+    assert _client.get("/egg/stock/1").json()["quantity"] == 80
+
+    assert _client.delete("/order/1").status_code == 200
+    assert _client.get("/orderegg/").json() == []
+    assert _client.get("/egg/1").json()["avalibleQuantity"] == 50
+    assert _client.get("/egg/stock/1").json()["quantity"] == 100
+    assert reconcile_stock(_test_db)["discrepancies"] == []
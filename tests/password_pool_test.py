@@ -0,0 +1,185 @@
+"""Test cases for the bcrypt process pool."""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.Auth import bcrypt_calibration
+from app.Auth.bcrypt_calibration import (
+    MAX_ROUNDS,
+    MIN_ROUNDS,
+    load_or_calibrate,
+    main,
+    rounds_for_target,
+    write_rounds,
+)
+from app.Auth.password_pool import PasswordPool, PasswordPoolSaturated, password_pool
+from app.User.user_model import User
+
+
+@pytest.fixture
+def _pool():
+    """A pool with one worker process, stopped afterwards."""
+    pool = PasswordPool(workers=1, max_pending=4)
+    yield pool
+    pool.shutdown()
+
+
+def test_hash_and_verify_in_processes(_pool):
+    """Test hashes made by the worker processes verify both ways."""
+    hashed = _pool.hash("secret")
+    assert hashed.startswith("$2b$")
+    assert _pool.verify("secret", hashed)
+    assert not asyncio.run(_pool.verify_async("wrong", hashed))
+    assert _pool.stats()["completed"] == 3
+    assert _pool.stats()["pending"] == 0
+
+
+def test_hash_many_keeps_order(_pool):
+    """Test bulk hashing returns one hash per password, in input order."""
+    passwords = [f"secret{number}" for number in range(5)]
+    hashes = _pool.hash_many(passwords)
+    assert len(hashes) == 5
+    assert _pool.verify("secret3", hashes[3])
+    assert _pool.stats()["pending"] == 0
+
+
+def test_saturated_pool_rejects():
+    """Test calls beyond max_pending fail fast instead of queueing."""
+    pool = PasswordPool(workers=0, max_pending=1)
+    entered, release = threading.Event(), threading.Event()
+
+    def slow(_value):
+        entered.set()
+        release.wait(5)
+        return "done"
+
+    worker = threading.Thread(target=lambda: pool._submit(slow, None))  # pylint: disable=protected-access
+    worker.start()
+    entered.wait(5)
+    with pytest.raises(PasswordPoolSaturated):
+        pool.hash("secret")
+    release.set()
+    worker.join()
+    assert pool.stats()["rejected"] == 1
+    assert pool.stats()["pending"] == 0
+
+
+def test_hash_many_waits_for_capacity():
+    """Test bulk hashing waits for a saturated pool instead of failing."""
+    pool = PasswordPool(workers=0, max_pending=1)
+    entered, release = threading.Event(), threading.Event()
+
+    def slow(_value):
+        entered.set()
+        release.wait(5)
+        return "done"
+
+    worker = threading.Thread(target=lambda: pool._submit(slow, None))  # pylint: disable=protected-access
+    worker.start()
+    entered.wait(5)
+    hashes = []
+    bulk = threading.Thread(target=lambda: hashes.extend(pool.hash_many(["secret"])))
+    bulk.start()
+    bulk.join(0.2)
+    assert bulk.is_alive()
+    release.set()
+    worker.join()
+    bulk.join(5)
+    assert len(hashes) == 1
+    assert pool.stats()["rejected"] == 0
+    assert pool.stats()["pending"] == 0
+
+
+def test_login_returns_503_when_saturated(_client, monkeypatch):
+    """Test a saturated pool answers 503 with Retry-After."""
+    _client.post("/role/", json={"name": "ADMIN"})
+    _client.post(
+        "/user/",
+        json={
+            "name": "Admin User",
+            "phone_number": "3000000000",
+            "email": "admin@mail.com",
+            "username": "adminuser",
+            "password": "admin123",
+            "address": "HQ",
+            "enabled": True,
+            "role_ids": [1],
+        },
+    )
+    monkeypatch.setattr(password_pool, "max_pending", 0)
+    response = _client.post("/login", data={"username": "adminuser", "password": "admin123"})
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_rounds_for_target():
+    """Test each doubling of the target time adds one round, within bounds."""
+    assert rounds_for_target(50, 25) == MIN_ROUNDS
+    assert rounds_for_target(50, 100) == MIN_ROUNDS + 1
+    assert rounds_for_target(50, 399) == MIN_ROUNDS + 2
+    assert rounds_for_target(1, 10**9) == MAX_ROUNDS
+
+
+def test_login_rehashes_weaker_hash(_client, _test_db):
+    """Test a hash below the current cost is replaced on a successful login."""
+    _client.post("/role/", json={"name": "ADMIN"})
+    _client.post(
+        "/user/",
+        json={
+            "name": "Admin User",
+            "phone_number": "3000000000",
+            "email": "admin@mail.com",
+            "username": "adminuser",
+            "password": "admin123",
+            "address": "HQ",
+            "enabled": True,
+            "role_ids": [1],
+        },
+    )
+    password_pool.set_rounds(5)
+    try:
+        response = _client.post(
+            "/login", data={"username": "adminuser", "password": "admin123"}
+        )
+        assert response.status_code == 200
+        stored = _test_db.query(User).filter(User.username == "adminuser").one()
+        _test_db.refresh(stored)
+        assert stored.password.startswith("$2b$05$")
+        assert not password_pool.needs_update(stored.password)
+        assert _client.post(
+            "/login", data={"username": "adminuser", "password": "admin123"}
+        ).status_code == 200
+    finally:
+        password_pool.set_rounds(4)
+
+
+def test_calibration_command(capsys):
+    """Test the calibration command reports the cost table and a recommendation."""
+    main(["--target-ms", "1", "--samples", "1"])
+    output = capsys.readouterr().out
+    assert f"BCRYPT_ROUNDS={MIN_ROUNDS}" in output
+    assert "hashes/s/core" in output
+
+
+def test_calibration_command_writes_rounds(tmp_path, capsys):
+    """Test the deploy step stores the chosen cost for the workers."""
+    path = tmp_path / "rounds"
+    main(["--target-ms", "1", "--samples", "1", "--write", str(path)])
+    capsys.readouterr()
+    assert path.read_text(encoding="ascii") == f"{MIN_ROUNDS}\n"
+
+
+def test_workers_share_the_stored_rounds(tmp_path, monkeypatch):
+    """Test workers read a stored cost and publish only the first calibration."""
+    path = str(tmp_path / "rounds")
+    write_rounds(path, 12)
+    monkeypatch.setattr(bcrypt_calibration, "calibrate_rounds", pytest.fail)
+    assert load_or_calibrate(path, 250) == 12
+
+    other = str(tmp_path / "missing")
+    monkeypatch.setattr(bcrypt_calibration, "calibrate_rounds", lambda _target: 11)
+    assert load_or_calibrate(other, 250) == 11
+    write_rounds(other, 13, replace=False)  # a worker that lost the race
+    assert load_or_calibrate(other, 250) == 11
@@ -0,0 +1,72 @@
+"""Test cases for the read-replica routing session."""
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.db.routing import ReplicaHealth, RoutingSession
+from app.Role.role_model import Role
+
+
+@pytest.fixture
+def _engines(tmp_path):
+    """Creates a primary and a replica SQLite file holding different rows."""
+    primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+    replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+    for engine, name in ((primary, "PRIMARY"), (replica, "REPLICA")):
+        Base.metadata.create_all(bind=engine)
+        with sessionmaker(bind=engine)() as db:
+            db.add(Role(name=name))
+            db.commit()
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+
+def _role_names(db):
+    return [role.name for role in db.query(Role).order_by(Role.id).all()]
+
+
+def test_reads_go_to_replica(_engines):
+    """Test plain SELECTs are served by the replica."""
+    primary, replica = _engines
+    with RoutingSession(primary=primary, replica=replica) as db:
+        assert _role_names(db) == ["REPLICA"]
+
+
+def test_session_pins_to_primary_after_write(_engines):
+    """Test a session reads its own writes once it has written."""
+    primary, replica = _engines
+    with RoutingSession(primary=primary, replica=replica) as db:
+        db.add(Role(name="NEW"))
+        db.flush()
+        assert db.pinned_to_primary
+        assert _role_names(db) == ["PRIMARY", "NEW"]
+
+
+def test_locking_reads_go_to_primary(_engines):
+    """Test SELECT ... FOR UPDATE is never sent to the replica."""
+    primary, replica = _engines
+    with RoutingSession(primary=primary, replica=replica) as db:
+        names = [role.name for role in db.query(Role).with_for_update().all()]
+        assert names == ["PRIMARY"]
+
+
+def test_falls_back_to_primary_when_replica_is_down(_engines, tmp_path):
+    """Test reads use the primary while the replica cannot be reached."""
+    primary, _replica = _engines
+    broken = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    health = ReplicaHealth(retry_interval=60)
+    with RoutingSession(primary=primary, replica=broken, replica_health=health) as db:
+        assert _role_names(db) == ["PRIMARY"]
+    assert not health.available()
+    with RoutingSession(primary=primary, replica=broken, replica_health=health) as db:
+        assert _role_names(db) == ["PRIMARY"]
+
+
+def test_without_replica_reads_use_primary(_engines):
+    """Test the routing session works when no replica is configured."""
+    primary, _replica = _engines
+    with RoutingSession(primary=primary) as db:
+        assert _role_names(db) == ["PRIMARY"]
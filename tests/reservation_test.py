@@ -0,0 +1,211 @@
+"""Test cases for timed stock reservations and their reaper."""
+
+import time
+from datetime import date, datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.config import Settings
+from app.db.database import SessionLocal, configure_database, get_engine
+from app.db.migrate import migrate
+from app.Egg.stock_reconcile import reconcile_stock
+from app.main import create_app
+from app.Reservation import reservation_service
+from app.Reservation.reservation_model import Reservation
+from app.Reservation.reservation_reaper import reservation_reaper
+from app.Reservation.reservation_service import release_expired_reservations
+
+
+def _seed(client, quantity=30):
+    """A customer with a pending order, and one lot of eggs."""
+    client.post("/role/", json={"name": "CUSTOMER"})
+    client.post(
+        "/user/",
+        json={
+            "name": "User",
+            "phone_number": "3133333333",
+            "email": "user@mail.com",
+            "username": "user",
+            "password": "123",
+            "address": "Somewhere",
+            "enabled": True,
+            "role_ids": [1],
+        },
+    )
+    client.post("/order/", json={"totalPrice": 100, "state": "pending", "user_id": 1})
+    client.post("/supplier/", json={"name": "Supplier", "address": "Somewhere"})
+    client.post("/typeeggs/", json={"name": "AA"})
+    client.post(
+        "/egg/",
+        json={
+            "avalibleQuantity": quantity,
+            "expirationDate": (date.today() + timedelta(days=30)).isoformat(),
+            "entryDate": date.today().isoformat(),
+            "sellPrice": 100,
+            "entryPrice": 90,
+            "color": "White",
+            "type_egg_id": 1,
+            "supplier_id": 1,
+        },
+    )
+
+
+def _reserve(client, quantity, egg_id=1):
+    return client.post(
+        "/reservation/", json={"order_id": 1, "egg_id": egg_id, "quantity": quantity}
+    )
+
+
+def _expire(db, *reservation_ids):
+    db.query(Reservation).filter(Reservation.id.in_(reservation_ids)).update(
+        {"expires_at": datetime.utcnow() - timedelta(seconds=1)}
+    )
+    db.commit()
+
+
+def test_reservation_holds_stock_until_confirmed(_client, _test_db):
+    """Test held eggs leave the available stock and become order lines."""
+    _seed(_client)
+    first = _reserve(_client, 10)
+    assert first.status_code == 201
+    assert first.json()["expires_at"] > datetime.utcnow().isoformat()
+    _reserve(_client, 5)
+    assert _client.get("/egg/stock/1").json()["quantity"] == 15
+    assert _reserve(_client, 16).status_code == 409
+    assert len(_client.get("/reservation/order/1").json()) == 2
+
+    response = _client.post("/reservation/order/1/confirm")
+    assert response.status_code == 201
+    assert [line["quantity"] for line in response.json()] == [10, 5]
+    assert _client.get("/order/1").json()["totalPrice"] == 100 + 15 * 100
+    assert _client.get("/reservation/order/1").json() == []
+    assert _client.get("/egg/stock/1").json()["quantity"] == 15
+    assert _client.post("/reservation/order/1/confirm").status_code == 409
+    assert reconcile_stock(_test_db)["discrepancies"] == []
+
+
+def test_released_and_lapsed_reservations_give_stock_back(_client, _test_db):
+    """Test early release and the reaper return the eggs exactly once."""
+    _seed(_client)
+    ids = [_reserve(_client, quantity).json()["id"] for quantity in (4, 5, 6)]
+    assert _client.delete(f"/reservation/{ids[0]}").status_code == 200
+    assert _client.delete(f"/reservation/{ids[0]}").status_code == 404
+    assert _client.get("/egg/stock/1").json()["quantity"] == 19
+
+    _expire(_test_db, ids[1])
+    # a lapsed hold cannot be confirmed; only the active one becomes a line
+    lines = _client.post("/reservation/order/1/confirm").json()
+    assert [line["quantity"] for line in lines] == [6]
+    assert release_expired_reservations(_test_db, batch_size=10) == 1
+    assert release_expired_reservations(_test_db, batch_size=10) == 0
+    assert _client.get("/egg/stock/1").json()["quantity"] == 24
+    assert _client.get("/egg/1").json()["avalibleQuantity"] == 24
+    assert reconcile_stock(_test_db)["discrepancies"] == []
+
+
+def test_reaper_releases_in_batches(_client, _test_db):
+    """Test a batch releases at most batch_size holds, oldest first."""
+    _seed(_client)
+    ids = [_reserve(_client, 2).json()["id"] for _ in range(5)]
+    _expire(_test_db, *ids)
+    assert release_expired_reservations(_test_db, batch_size=2) == 2
+    assert release_expired_reservations(_test_db, batch_size=2) == 2
+    assert release_expired_reservations(_test_db, batch_size=2) == 1
+    assert _client.get("/egg/stock/1").json()["quantity"] == 30
+
+
+def test_batch_partly_released_elsewhere_is_read_again(_client, _test_db, monkeypatch):
+    """Test a batch whose DELETE misses rows is retried, giving eggs back once."""
+    _seed(_client)
+    ids = [_reserve(_client, 2).json()["id"] for _ in range(3)]
+    _expire(_test_db, *ids)
+    read = reservation_service.read_expired_reservations
+    calls = []
+
+    def read_then_lose_one(db, now, limit):
+        batch = read(db, now, limit)
+        calls.append(len(batch))
+        if len(calls) == 1:
+            # as if another worker claimed the first hold after this read
+            db.query(Reservation).filter(Reservation.id == ids[0]).delete()
+        return batch
+
+    monkeypatch.setattr(reservation_service, "read_expired_reservations", read_then_lose_one)
+    assert release_expired_reservations(_test_db, batch_size=10) == 3
+    assert calls == [3, 3]
+    assert _client.get("/egg/stock/1").json()["quantity"] == 30
+    assert reconcile_stock(_test_db)["discrepancies"] == []
+
+
+def test_reservation_price_and_order_state(_client, _test_db):
+    """Test holds keep their price and only pending orders hold or confirm eggs."""
+    _seed(_client)
+    reservation = _reserve(_client, 10).json()
+    assert reservation["unit_price"] == 100
+    lot = _client.get("/egg/1").json()
+    _client.put("/egg/1", json={**lot, "sellPrice": 150})
+    lines = _client.post("/reservation/order/1/confirm").json()
+    assert [line["unit_price"] for line in lines] == [100]
+
+    _reserve(_client, 5)
+    order = {"totalPrice": 100, "state": "paid", "user_id": 1}
+    _client.put("/order/1", json=order)
+    assert _reserve(_client, 5).status_code == 409
+    assert _client.post("/reservation/order/1/confirm").status_code == 409
+
+    # deleting the order gives back both its line and its hold
+    assert _client.delete("/order/1").status_code == 200
+    assert _client.get("/egg/stock/1").json()["quantity"] == 30
+    assert _test_db.query(Reservation).count() == 0
+    assert reconcile_stock(_test_db)["discrepancies"] == []
+
+
+def test_reservation_validates_request(_client):
+    """Test bad quantities, orders and lots are rejected."""
+    _seed(_client)
+    assert _reserve(_client, 0).status_code == 400
+    assert _reserve(_client, 1, egg_id=9).status_code == 404
+    assert _client.post(
+        "/reservation/", json={"order_id": 9, "egg_id": 1, "quantity": 1}
+    ).status_code == 404
+
+
+@pytest.fixture
+def _reaping_client(tmp_path):
+    """An app on a SQLite file whose reaper runs every 50 ms."""
+    settings = Settings(
+        database_url=f"sqlite:///{tmp_path / 'shop.db'}",
+        async_database_url=f"sqlite+aiosqlite:///{tmp_path / 'shop.db'}",
+        bcrypt_pool_workers=0,
+        bcrypt_rounds=4,
+        slow_query_ms=None,
+        reservation_ttl_seconds=0.1,
+        reservation_reap_seconds=0.05,
+    )
+    app = create_app(settings)
+    migrate(get_engine())
+    with TestClient(app) as client:
+        yield client
+    configure_database(Settings.from_env())
+    reservation_reaper.configure(0, reservation_reaper.batch_size)
+
+
+def test_background_reaper_releases_lapsed_holds(_reaping_client):
+    """Test the reaper started with the app gives lapsed holds back on its own."""
+    _seed(_reaping_client)
+    assert _reserve(_reaping_client, 12).status_code == 201
+    assert _reaping_client.get("/egg/stock/1").json()["quantity"] == 18
+
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        if _reaping_client.get("/egg/stock/1").json()["quantity"] == 30:
+            break
+        time.sleep(0.05)
+    assert _reaping_client.get("/egg/stock/1").json()["quantity"] == 30
+    assert reservation_reaper.stats()["released"] >= 1
+    db = SessionLocal(bind=get_engine())
+    try:
+        assert db.query(Reservation).count() == 0
+    finally:
+        db.close()
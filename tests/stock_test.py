@@ -0,0 +1,158 @@
+"""Test cases for the stock summary and its reconciliation."""
+
+from datetime import date, timedelta
+
+import pytest
+
+from app.Egg.egg_allocation import return_to_lot
+from app.Egg.egg_model import Egg
+from app.Egg.stock_summary_model import StockShard
+from app.Egg.stock_summary_repository import roll_off_expired_lots
+from app.Egg.stock_reconcile import reconcile_stock
+from app.db.instrumentation import route_stats
+
+
+def _egg(quantity, type_egg_id=1, color="White", entry_price=90):
+    return {
+        "avalibleQuantity": quantity,
+        "expirationDate": (date.today() + timedelta(days=30)).isoformat(),
+        "entryDate": date.today().isoformat(),
+        "sellPrice": 100,
+        "entryPrice": entry_price,
+        "color": color,
+        "type_egg_id": type_egg_id,
+        "supplier_id": 1,
+    }
+
+
+@pytest.fixture
+def _catalog(_client):
+    """A supplier and two egg types."""
+    _client.post("/supplier/", json={"name": "Supplier", "address": "Stock street"})
+    _client.post("/typeeggs/", json={"name": "AA"})
+    _client.post("/typeeggs/", json={"name": "AAA"})
+    return _client
+
+
+def test_summary_follows_lot_changes(_catalog, _test_db):
+    """Test creating, updating and deleting lots keeps the summary exact."""
+    _client = _catalog
+    first = _client.post("/egg/", json=_egg(30)).json()
+    _client.post("/egg/", json=_egg(20, entry_price=80))
+    _client.post("/egg/", json=_egg(10, color="Brown"))
+    _client.post("/egg/", json=_egg(5, type_egg_id=2))
+
+    stock = _client.get("/egg/stock/1").json()
+    assert stock["quantity"] == 60
+    assert stock["value"] == pytest.approx(30 * 90 + 20 * 80 + 10 * 90)
+    assert {entry["color"]: entry["quantity"] for entry in stock["breakdown"]} == {
+        "Brown": 10,
+        "White": 50,
+    }
+    assert _client.get("/egg/search/count_this_month").json() == 65
+
+    # moving a lot to another type moves its eggs too
+    _client.put(f"/egg/{first['id']}", json=_egg(25, type_egg_id=2))
+    assert _client.get("/egg/stock/1").json()["quantity"] == 30
+    assert _client.get("/egg/stock/2").json()["quantity"] == 30
+
+    _client.delete(f"/egg/{first['id']}")
+    assert _client.get("/egg/stock/2").json()["quantity"] == 5
+    assert reconcile_stock(_test_db)["discrepancies"] == []
+
+
+def test_stock_read_does_not_scan_lots(_catalog):
+    """Test the stock of a type is one query on the summary, whatever the lots."""
+    _client = _catalog
+    for quantity in range(1, 11):
+        _client.post("/egg/", json=_egg(quantity))
+    route_stats.reset()
+    assert _client.get("/egg/stock/1").json()["quantity"] == 55
+    stats = {item["route"]: item for item in route_stats.snapshot()}
+    assert stats["GET /egg/stock/{type_egg_id}"]["queries"] == 1
+
+
+def test_expired_lots_leave_the_stock(_catalog, _test_db):
+    """Test expired lots are not counted, before and after they are rolled off."""
+    _client = _catalog
+    _client.post("/egg/", json=_egg(30))
+    expired = _client.post("/egg/", json=_egg(20)).json()
+    _test_db.query(Egg).filter(Egg.id == expired["id"]).update(
+        {"expirationDate": date.today() - timedelta(days=1)}
+    )
+    _test_db.commit()
+
+    assert _client.get("/egg/stock/1").json()["quantity"] == 30
+    assert _client.get("/egg/search/count_this_month").json() == 30
+    assert reconcile_stock(_test_db)["discrepancies"] == []
+
+    assert roll_off_expired_lots(_test_db) == 1
+    assert roll_off_expired_lots(_test_db) == 0
+    assert _client.get("/egg/stock/1").json()["quantity"] == 30
+    assert reconcile_stock(_test_db)["discrepancies"] == []
+
+    # eggs given back to a rolled off lot stay out of the stock
+    return_to_lot(_test_db, expired["id"], 5)
+    _test_db.commit()
+    assert _client.get("/egg/stock/1").json()["quantity"] == 30
+    assert reconcile_stock(_test_db)["discrepancies"] == []
+
+    # a new expiration date puts the lot back in the stock
+    _client.put(f"/egg/{expired['id']}", json=_egg(25))
+    assert _client.get("/egg/stock/1").json()["quantity"] == 55
+    assert reconcile_stock(_test_db)["discrepancies"] == []
+
+
+def test_reconciliation_detects_and_repairs_drift(_catalog, _test_db):
+    """Test changes made behind the summary's back are reported and repaired."""
+    _client = _catalog
+    egg = _client.post("/egg/", json=_egg(30)).json()
+    _test_db.query(Egg).filter(Egg.id == egg["id"]).update({"avalibleQuantity": 12})
+    _test_db.commit()
+
+    report = reconcile_stock(_test_db)
+    assert report["repaired"] is False
+    assert report["discrepancies"][0]["summary"]["quantity"] == 30
+    assert report["discrepancies"][0]["lots"]["quantity"] == 12
+
+    report = reconcile_stock(_test_db, repair=True)
+    assert report["repaired"] is True
+    assert reconcile_stock(_test_db)["discrepancies"] == []
+    assert _client.get("/egg/stock/1").json()["quantity"] == 12
+
+
+def test_sharded_type_spreads_changes_and_reads_the_sum(
+    _catalog, _test_db, _admin_headers
+):
+    """Test a sharded type writes to shard rows and reads add them up."""
+    _client = _catalog
+    assert _client.put("/egg/stock/1/shards", json={"shards": 4}).status_code == 401
+    headers = _admin_headers
+    for quantity in (10, 20, 30):
+        _client.post("/egg/", json=_egg(quantity))
+
+    response = _client.put("/egg/stock/1/shards", json={"shards": 4}, headers=headers)
+    assert response.status_code == 200
+    assert response.json() == {"type_egg_id": 1, "shards": 4}
+    for quantity in (5, 7, 9, 11):
+        _client.post("/egg/", json=_egg(quantity))
+    egg = _client.post("/egg/", json=_egg(50, color="Brown")).json()
+    _client.delete(f"/egg/{egg['id']}")
+
+    assert _test_db.query(StockShard).count() > 0
+    stock = _client.get("/egg/stock/1").json()
+    assert stock["quantity"] == 92
+    assert stock["value"] == pytest.approx(92 * 90)
+    assert _client.get("/egg/search/count_this_month").json() == 92
+    assert reconcile_stock(_test_db)["discrepancies"] == []
+
+    # back to one row: the shards are folded into the summary
+    _client.put("/egg/stock/1/shards", json={"shards": 1}, headers=headers)
+    assert _test_db.query(StockShard).count() == 0
+    assert _client.get("/egg/stock/1").json()["quantity"] == 92
+    assert reconcile_stock(_test_db)["discrepancies"] == []
+
+    bad = _client.put("/egg/stock/1/shards", json={"shards": 0}, headers=headers)
+    assert bad.status_code == 400
+    unknown = _client.put("/egg/stock/9/shards", json={"shards": 2}, headers=headers)
+    assert unknown.status_code == 404
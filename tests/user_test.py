@@ -1,5 +1,9 @@
 """Test cases for User endpoints."""
 
+import json
+
+from app.db.instrumentation import route_stats
+
 
 def test_create_user(_client):
     """Test creating a user."""
@@ -342,3 +346,257 @@ def test_get_users_by_role(_client):
     assert response.status_code == 200
     data = response.json()
     assert len(data) >= 1
+
+
+def _user_payload(**overrides):
+    payload = {
+        "name": "User",
+        "phone_number": "3115070080",
+        "email": "first@mail.com",
+        "username": "first",
+        "password": "123",
+        "address": "First street",
+        "enabled": True,
+        "role_ids": [1],
+    }
+    payload.update(overrides)
+    return payload
+
+
+def test_create_user_reports_conflicting_field(_client):
+    """Test a duplicate unique field is reported by name."""
+    _client.post("/role/", json={"name": "EMPLOYEE"})
+    assert _client.post("/user/", json=_user_payload()).status_code == 201
+
+    response = _client.post(
+        "/user/",
+        json=_user_payload(phone_number="3115070081", email="second@mail.com"),
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Username is already registered for another user"
+
+    response = _client.post(
+        "/user/", json=_user_payload(phone_number="3115070081", username="second")
+    )
+    assert response.json()["detail"] == "Email is already registered for another user"
+
+    second = _user_payload(
+        phone_number="3115070081",
+        email="second@mail.com",
+        username="second",
+        address="Second street",
+    )
+    assert _client.post("/user/", json=second).status_code == 201
+
+
+def test_update_user_reports_conflicting_field(_client):
+    """Test updates may keep their own values but not take another user's."""
+    _client.post("/role/", json={"name": "ADMIN"})
+    _client.post("/user/", json=_user_payload())
+    token = _client.post(
+        "/login", data={"username": "first", "password": "123"}
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    second = _user_payload(
+        phone_number="3115070081",
+        email="second@mail.com",
+        username="second",
+        address="Second street",
+    )
+    _client.post("/user/", json=second)
+
+    assert _client.put("/user/2", json=second, headers=headers).status_code == 200
+    response = _client.put(
+        "/user/2", json={**second, "address": "First street"}, headers=headers
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Address is already registered for another user"
+
+
+def test_list_users_is_paginated_with_constant_queries(_client, _test_db):
+    """Test users are listed in keyset pages loaded by two queries."""
+    _client.post("/role/", json={"name": "ADMIN"})
+    for number in range(5):
+        _client.post(
+            "/user/",
+            json=_user_payload(
+                phone_number=f"311507008{number}",
+                email=f"user{number}@mail.com",
+                username=f"user{number}",
+                address=f"Street {number}",
+            ),
+        )
+    token = _client.post(
+        "/login", data={"username": "user0", "password": "123"}
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    _client.get("/user/search/me", headers=headers)  # cache the principal
+
+    _test_db.expunge_all()  # the test session is shared; force the loads
+    route_stats.reset()
+    first = _client.get("/user/?limit=2", headers=headers).json()
+    assert [user["username"] for user in first] == ["user0", "user1"]
+    assert first[0]["roles"] == [{"id": 1, "name": "ADMIN"}]
+    assert "password" not in first[0]
+    stats = {item["route"]: item for item in route_stats.snapshot()}
+    assert stats["GET /user/"]["queries"] == 2  # users, then their roles
+
+    rest = _client.get(
+        f"/user/?after_id={first[-1]['id']}&limit=10", headers=headers
+    ).json()
+    assert [user["username"] for user in rest] == ["user2", "user3", "user4"]
+
+    by_role = _client.get("/user/byrole/1?after_id=3&limit=1", headers=headers).json()
+    assert [user["username"] for user in by_role] == ["user3"]
+
+
+def _admin_headers(_client):
+    _client.post("/role/", json={"name": "ADMIN"})
+    _client.post("/user/", json=_user_payload())
+    token = _client.post(
+        "/login", data={"username": "first", "password": "123"}
+    ).json()["access_token"]
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_import_users_ndjson(_client):
+    """Test valid rows are created and the others reported by row."""
+    headers = _admin_headers(_client)
+    rows = [
+        _user_payload(
+            phone_number=f"320000000{number}",
+            email=f"import{number}@mail.com",
+            username=f"import{number}",
+            address=f"Import street {number}",
+        )
+        for number in range(3)
+    ]
+    rows[1]["username"] = "first"  # taken by the admin
+    rows[2]["email"] = "import0@mail.com"  # repeats row 1
+    body = "\n".join(json.dumps(row) for row in rows) + "\n{broken\n"
+    response = _client.post(
+        "/user/import",
+        content=body,
+        headers={**headers, "Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["received"], report["created"], report["failed"]) == (4, 1, 3)
+    errors = {item["row"]: item["errors"] for item in report["errors"]}
+    assert errors[2] == ["Username is already registered for another user"]
+    assert errors[3] == ["Email duplicates row 1"]
+    assert errors[4] == ["Invalid JSON object"]
+
+    login = _client.post("/login", data={"username": "import0", "password": "123"})
+    assert login.status_code == 200
+    me = _client.get(
+        "/user/search/me",
+        headers={"Authorization": f"Bearer {login.json()['access_token']}"},
+    )
+    assert [role["name"] for role in me.json()["roles"]] == ["ADMIN"]
+
+
+def test_import_users_csv(_client):
+    """Test CSV imports with role lists and schema errors."""
+    headers = _admin_headers(_client)
+    body = (
+        "name,phone_number,email,username,password,address,enabled,role_ids\n"
+        "Ana,3200000010,ana@mail.com,ana,123,Ana street,true,1\n"
+        "Bob,123,bob@mail.com,bob,123,Bob street,true,1\n"
+        "Eve,3200000012,eve@mail.com,eve,123,Eve street,true,1;9\n"
+    )
+    response = _client.post(
+        "/user/import", content=body, headers={**headers, "Content-Type": "text/csv"}
+    )
+    report = response.json()
+    assert (report["created"], report["failed"]) == (1, 2)
+    errors = {item["row"]: item["errors"] for item in report["errors"]}
+    assert errors[2][0].startswith("phone_number")
+    assert errors[3] == ["One or more specified roles do not exist"]
+
+
+def test_import_matches_taken_values_case_insensitively(_client):
+    """Test a value taken with another case is reported before inserting."""
+    headers = _admin_headers(_client)
+    row = _user_payload(
+        phone_number="3200000020",
+        email="fresh@mail.com",
+        username="FIRST",
+        address="Fresh street",
+    )
+    response = _client.post(
+        "/user/import",
+        content=json.dumps(row),
+        headers={**headers, "Content-Type": "application/x-ndjson"},
+    )
+    report = response.json()
+    assert (report["created"], report["failed"]) == (0, 1)
+    assert report["errors"][0]["errors"] == [
+        "Username is already registered for another user"
+    ]
+
+
+def test_import_conflict_rejects_only_the_conflicting_row(_client, monkeypatch):
+    """Test a unique violation at insert fails its row, not the whole batch."""
+    headers = _admin_headers(_client)
+    # as if the admin had been created after the pre-checks ran
+    monkeypatch.setattr(
+        "app.User.user_import_service.find_taken_values", lambda db, field, values: set()
+    )
+    rows = [
+        _user_payload(
+            phone_number=f"320000003{number}",
+            email=f"batch{number}@mail.com",
+            username=f"batch{number}",
+            address=f"Batch street {number}",
+        )
+        for number in range(5)
+    ]
+    rows[3]["username"] = "first"
+    response = _client.post(
+        "/user/import",
+        content="\n".join(json.dumps(row) for row in rows),
+        headers={**headers, "Content-Type": "application/x-ndjson"},
+    )
+    report = response.json()
+    assert (report["created"], report["failed"]) == (4, 1)
+    assert report["errors"] == [
+        {"row": 4, "errors": ["Conflicts with a user created during the import"]}
+    ]
+
+
+def test_availability(_client, _test_db):
+    """Test free values are answered from the filter and taken ones confirmed."""
+    headers = _admin_headers(_client)
+    response = _client.get("/user/availability?username=first&email=new@mail.com")
+    assert response.status_code == 200
+    assert response.json() == {"username": False, "email": True}
+
+    _client.post(
+        "/user/",
+        json=_user_payload(
+            phone_number="3115070081",
+            email="new@mail.com",
+            username="second",
+            address="Second street",
+        ),
+    )
+    response = _client.get("/user/availability?email=new@mail.com")
+    assert response.json() == {"username": None, "email": False}
+
+    route_stats.reset()
+    for number in range(5):
+        assert _client.get(f"/user/availability?username=free{number}").json()[
+            "username"
+        ]
+    stats = {item["route"]: item for item in route_stats.snapshot()}
+    assert stats["GET /user/availability"]["queries"] == 0
+
+    stats = _client.get("/monitoring/availability", headers=headers).json()
+    assert stats["users"] == 2
+    assert stats["lookups"] == 2
+
+
+def test_availability_requires_a_value(_client):
+    """Test a check without username or email is rejected."""
+    assert _client.get("/user/availability").status_code == 400